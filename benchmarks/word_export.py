@@ -0,0 +1,88 @@
+"""Compare the streaming Word exporter with the python-docx one.
+
+    python -m benchmarks.word_export --videos 1000 --paragraphs 40
+"""
+
+import argparse
+import multiprocessing
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from src.exporters.word_exporter import export_word, export_word_python_docx
+from src.pipeline.models import TaskResult, Transcript, VideoItem
+
+EXPORTERS = {"streaming": export_word, "python-docx": export_word_python_docx}
+
+
+def _results(videos: int, paragraphs: int) -> list[TaskResult]:
+    text = "\n".join(f"第{idx}段：这是一段用于基准测试的口播文案，包含若干中文句子。" * 3 for idx in range(paragraphs))
+    return [
+        TaskResult(
+            item=VideoItem(
+                input_value=f"https://v.douyin.com/bench{idx}/",
+                title=f"基准视频 {idx}",
+                source_url=None,
+                video_id=str(idx),
+                local_video_path=None,
+                local_audio_path=None,
+                publish_timestamp=1700000000,
+                duration_ms=65000,
+            ),
+            transcript=Transcript(text=text, raw={}),
+            summary="一句话摘要",
+        )
+        for idx in range(videos)
+    ]
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and kilobytes on Linux.
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _export(name: str, videos: int, paragraphs: int, output_path: Path, conn) -> None:
+    results = _results(videos, paragraphs)
+    baseline = _peak_rss_mb()
+    started = time.perf_counter()
+    EXPORTERS[name](results, output_path, "benchmark")
+    conn.send((time.perf_counter() - started, baseline, _peak_rss_mb()))
+    conn.close()
+
+
+def _measure(name: str, videos: int, paragraphs: int, output_path: Path) -> float:
+    # Peak RSS never decreases within a process, so every exporter runs in a fresh one.
+    ctx = multiprocessing.get_context("spawn")
+    parent, child = ctx.Pipe(duplex=False)
+    process = ctx.Process(target=_export, args=(name, videos, paragraphs, output_path, child))
+    process.start()
+    child.close()
+    elapsed, baseline, peak = parent.recv()
+    process.join()
+    size = output_path.stat().st_size / (1024 * 1024)
+    print(
+        f"{name:<12} {elapsed:8.2f}s  peak_rss={peak:8.1f}MB  "
+        f"export_rss=+{peak - baseline:7.1f}MB  file={size:6.1f}MB"
+    )
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark Word export")
+    parser.add_argument("--videos", type=int, default=1000)
+    parser.add_argument("--paragraphs", type=int, default=40)
+    args = parser.parse_args()
+
+    print(f"videos={args.videos} paragraphs_per_video={args.paragraphs}")
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_dir = Path(tmp)
+        streaming = _measure("streaming", args.videos, args.paragraphs, tmp_dir / "streaming.docx")
+        baseline = _measure("python-docx", args.videos, args.paragraphs, tmp_dir / "python_docx.docx")
+    print(f"speedup: {baseline / streaming:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
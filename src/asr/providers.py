@@ -1,11 +1,13 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
-import json
 from http import HTTPStatus
-from urllib import request
+from functools import partial
 from tempfile import TemporaryDirectory
+from concurrent.futures import Future, ThreadPoolExecutor
+import threading
 
 import dashscope
 from dashscope import MultiModalConversation
@@ -13,8 +15,10 @@ from openai import OpenAI
 
 from ..utils.retry import with_retry
 from ..utils.text import clean_text
-from ..utils.ffmpeg import split_audio
+from ..utils.ffmpeg import split_audio, wav_duration_ms
+from ..utils.vad import AudioSegment, segment_audio
 from ..pipeline.models import Transcript
+from .scheduler import DashScopeTaskScheduler, get_scheduler
 
 
 class DashScopeASRError(RuntimeError):
@@ -23,54 +27,227 @@ class DashScopeASRError(RuntimeError):
         self.raw_response = raw_response
 
 
-class DashScopeUrlASR:
-    def __init__(self, api_key: str) -> None:
-        self.api_key = api_key
+@dataclass(frozen=True)
+class ProviderLimits:
+    max_file_bytes: int | None = None
+    max_duration_seconds: int | None = None
 
-    def transcribe(self, source_url: str, model: str) -> Transcript:
-        dashscope.api_key = self.api_key
+    def exceeded_by(self, size_bytes: int, duration_ms: int | None) -> bool:
+        if self.max_file_bytes and size_bytes > self.max_file_bytes:
+            return True
+        if self.max_duration_seconds and duration_ms and duration_ms > self.max_duration_seconds * 1000:
+            return True
+        return False
+
+
+def _transcript_from_raw(raw: dict) -> Transcript:
+    text = ""
+    if "transcripts" in raw and raw["transcripts"]:
+        text = raw["transcripts"][0].get("text", "")
+    elif "text" in raw:
+        text = raw.get("text", "")
+    return Transcript(text=clean_text(text), raw=raw)
 
-        def _call() -> Transcript:
-            task = dashscope.audio.asr.Transcription.async_call(
-                model=model,
-                file_urls=[source_url],
-                language_hints=["zh", "en"],
-            )
-            transcription = dashscope.audio.asr.Transcription.wait(task=task.output.task_id)
-            if transcription.status_code != HTTPStatus.OK:
-                raise DashScopeASRError(
-                    f"DashScope ASR failed: {transcription.output.message}",
-                    raw_response=transcription.output,
-                )
 
-            raw_output = transcription.output or {}
-            if raw_output.get("task_status") == "FAILED":
-                code = raw_output.get("code", "UNKNOWN")
-                message = raw_output.get("message", "Task failed")
-                raise DashScopeASRError(
+class DashScopeUrlASR:
+    limits = ProviderLimits(max_file_bytes=2 * 1024**3, max_duration_seconds=12 * 3600)
+
+    def __init__(
+        self,
+        api_key: str,
+        max_files_per_task: int = 50,
+        scheduler: DashScopeTaskScheduler | None = None,
+    ) -> None:
+        self.api_key = api_key
+        self.max_files_per_task = max(1, min(max_files_per_task, 100))
+        self.scheduler = scheduler or get_scheduler(api_key)
+
+    def _outcomes_from_task(self, file_urls: list[str], payload: dict) -> dict[str, Transcript | Exception]:
+        output = payload.get("output") or {}
+        raws = payload.get("raws") or {}
+        outcomes: dict[str, Transcript | Exception] = {}
+        for result in output.get("results") or []:
+            if not isinstance(result, dict) or result.get("file_url") not in file_urls:
+                continue
+            url = result["file_url"]
+            raw = raws.get(url)
+            if isinstance(raw, Exception):
+                outcomes[url] = raw
+            elif raw is None:
+                code = result.get("code", "UNKNOWN")
+                message = result.get("message", "Subtask failed")
+                outcomes[url] = DashScopeASRError(
                     f"DashScope ASR failed: {code} {message}",
-                    raw_response=raw_output,
+                    raw_response=result,
                 )
-            results = raw_output.get("results") or []
-            if results and isinstance(results, list) and results[0].get("transcription_url"):
-                result_url = results[0]["transcription_url"]
-                raw = json.loads(request.urlopen(result_url).read().decode("utf-8"))
             else:
-                raw = raw_output
-            text = ""
-            if "transcripts" in raw and raw["transcripts"]:
-                text = raw["transcripts"][0].get("text", "")
-            elif "text" in raw:
-                text = raw.get("text", "")
-            return Transcript(text=clean_text(text), raw=raw)
+                outcomes[url] = _transcript_from_raw(raw)
+        for url in file_urls:
+            if url in outcomes:
+                continue
+            code = output.get("code", "UNKNOWN")
+            message = output.get("message", "No result for file")
+            outcomes[url] = DashScopeASRError(
+                f"DashScope ASR failed: {code} {message}",
+                raw_response=output,
+            )
+        return outcomes
+
+    def transcribe(self, source_url: str, model: str) -> Transcript:
+        def _call() -> Transcript:
+            payload = self.scheduler.submit([source_url], model).result()
+            outcome = self._outcomes_from_task([source_url], payload)[source_url]
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
 
         return with_retry(_call, retries=3, base_delay=1.0)
 
+    def submit_many(self, source_urls: list[str], model: str) -> Future:
+        combined: Future = Future()
+        unique_urls = list(dict.fromkeys(source_urls))
+        if not unique_urls:
+            combined.set_result([])
+            return combined
+
+        chunks = [
+            unique_urls[start:start + self.max_files_per_task]
+            for start in range(0, len(unique_urls), self.max_files_per_task)
+        ]
+        outcomes: dict[str, Transcript | Exception] = {}
+        remaining = [len(chunks)]
+        lock = threading.Lock()
+
+        def _on_done(chunk: list[str], future: Future) -> None:
+            try:
+                chunk_outcomes = self._outcomes_from_task(chunk, future.result())
+            except Exception as exc:  # noqa: BLE001 - becomes each URL's outcome
+                chunk_outcomes = {url: exc for url in chunk}
+            with lock:
+                outcomes.update(chunk_outcomes)
+                remaining[0] -= 1
+                finished = remaining[0] == 0
+            if finished:
+                combined.set_result([outcomes[url] for url in source_urls])
+
+        for chunk in chunks:
+            self.scheduler.submit(chunk, model).add_done_callback(partial(_on_done, chunk))
+        return combined
+
+
+def _shift_sentences(raw: dict, segment: AudioSegment) -> list[dict]:
+    transcripts = raw.get("transcripts") or []
+    sentences = []
+    if transcripts and isinstance(transcripts, list) and isinstance(transcripts[0], dict):
+        sentences = transcripts[0].get("sentences") or []
+    elif isinstance(raw.get("sentences"), list):
+        sentences = raw["sentences"]
+    shifted = []
+    for sentence in sentences:
+        if not isinstance(sentence, dict):
+            continue
+        moved = dict(sentence)
+        moved["begin_time"] = segment.source_ms(int(sentence.get("begin_time", 0)))
+        moved["end_time"] = segment.source_ms(int(sentence.get("end_time", 0)))
+        shifted.append(moved)
+    return shifted
+
 
-class QwenAudioASR:
-    def __init__(self, api_key: str, segment_seconds: int = 600) -> None:
+class _SplittingASR:
+    """Split path shared by the providers that upload local audio files."""
+
+    limits: ProviderLimits
+    segment_seconds: int
+    max_parallel_parts: int
+    drop_silence: bool
+
+    def _transcribe_single(self, audio_path: Path, model: str) -> Transcript:
+        raise NotImplementedError
+
+    def _transcribe_parts(self, segments: list[AudioSegment], model: str) -> Transcript:
+        with ThreadPoolExecutor(
+            max_workers=min(self.max_parallel_parts, len(segments)),
+            thread_name_prefix="asr-part",
+        ) as pool:
+            transcripts = list(pool.map(lambda segment: self._transcribe_single(segment.path, model), segments))
+
+        texts: list[str] = []
+        raw_parts: list[dict] = []
+        sentences: list[dict] = []
+        for segment, part_transcript in zip(segments, transcripts, strict=True):
+            raw = part_transcript.raw if isinstance(part_transcript.raw, dict) else {}
+            raw_parts.append(raw)
+            if not part_transcript.text:
+                continue
+            texts.append(part_transcript.text)
+            part_sentences = _shift_sentences(raw, segment)
+            if not part_sentences:
+                part_sentences = [
+                    {
+                        "begin_time": segment.offset_ms,
+                        "end_time": segment.source_ms(segment.duration_ms),
+                        "text": part_transcript.text,
+                    }
+                ]
+            sentences.extend(part_sentences)
+
+        combined_text = clean_text("\n".join(texts))
+        return Transcript(
+            text=combined_text,
+            raw={
+                "parts": raw_parts,
+                "offsets_ms": [segment.offset_ms for segment in segments],
+                "transcripts": [{"text": combined_text, "sentences": sentences}],
+            },
+        )
+
+    def _segment_seconds(self, size_bytes: int, duration_ms: int | None) -> int:
+        seconds = float(self.segment_seconds)
+        if self.limits.max_duration_seconds:
+            seconds = min(seconds, self.limits.max_duration_seconds * 0.95)
+        if self.limits.max_file_bytes and duration_ms:
+            bytes_per_second = size_bytes / max(duration_ms / 1000, 1)
+            seconds = min(seconds, self.limits.max_file_bytes * 0.9 / max(bytes_per_second, 1))
+        return max(1, int(seconds))
+
+    def transcribe_split(self, audio_path: Path, model: str, duration_ms: int | None) -> Transcript:
+        segment_seconds = self._segment_seconds(audio_path.stat().st_size, duration_ms)
+        with TemporaryDirectory(prefix="audio_parts_") as tmp_dir:
+            try:
+                segments = segment_audio(
+                    audio_path,
+                    Path(tmp_dir),
+                    target_seconds=segment_seconds * 0.85,
+                    max_seconds=segment_seconds,
+                    drop_silence=self.drop_silence,
+                )
+            except ValueError as exc:
+                print(f"[asr] VAD segmentation unavailable ({exc}), using fixed-length split")
+                segments = []
+                position = 0
+                for part in split_audio(audio_path, Path(tmp_dir), segment_seconds=segment_seconds):
+                    duration_ms = wav_duration_ms(part)
+                    segments.append(AudioSegment(path=part, offset_ms=position, duration_ms=duration_ms))
+                    position += duration_ms
+            if not segments:
+                raise DashScopeASRError("Audio split produced no parts")
+            return self._transcribe_parts(segments, model)
+
+
+class QwenAudioASR(_SplittingASR):
+    def __init__(
+        self,
+        api_key: str,
+        segment_seconds: int = 600,
+        max_parallel_parts: int = 4,
+        limits: ProviderLimits | None = None,
+        drop_silence: bool = True,
+    ) -> None:
         self.api_key = api_key
+        self.drop_silence = drop_silence
         self.segment_seconds = segment_seconds
+        self.max_parallel_parts = max(1, max_parallel_parts)
+        self.limits = limits or ProviderLimits(max_file_bytes=10 * 1024**2, max_duration_seconds=180)
 
     def _extract_multimodal_text(self, raw: dict) -> str:
         output = raw.get("output") or {}
@@ -101,33 +278,32 @@ class QwenAudioASR:
         text = self._extract_multimodal_text({"output": raw})
         return Transcript(text=clean_text(text), raw=raw if isinstance(raw, dict) else {"output": raw})
 
-    def transcribe(self, audio_path: Path, model: str) -> Transcript:
+    def transcribe(self, audio_path: Path, model: str, duration_ms: int | None = None) -> Transcript:
         try:
             return self._transcribe_single(audio_path, model)
         except DashScopeASRError as exc:
             if "file size is too large" not in str(exc).lower():
                 raise
+        return self.transcribe_split(audio_path, model, duration_ms)
 
-        with TemporaryDirectory(prefix="audio_parts_") as tmp_dir:
-            parts = split_audio(audio_path, Path(tmp_dir), segment_seconds=self.segment_seconds)
-            if not parts:
-                raise DashScopeASRError("Audio split produced no parts")
-            texts: list[str] = []
-            raw_parts: list[dict] = []
-            for part in parts:
-                part_transcript = self._transcribe_single(part, model)
-                if part_transcript.text:
-                    texts.append(part_transcript.text)
-                raw_parts.append(part_transcript.raw if isinstance(part_transcript.raw, dict) else {})
-            combined_text = clean_text("\n".join(texts))
-            return Transcript(text=combined_text, raw={"parts": raw_parts})
-
-
-class OpenAICompatibleASR:
-    def __init__(self, api_key: str, base_url: str) -> None:
+
+class OpenAICompatibleASR(_SplittingASR):
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str,
+        segment_seconds: int = 600,
+        max_parallel_parts: int = 4,
+        limits: ProviderLimits | None = None,
+        drop_silence: bool = True,
+    ) -> None:
         self.client = OpenAI(api_key=api_key, base_url=base_url)
+        self.segment_seconds = segment_seconds
+        self.max_parallel_parts = max(1, max_parallel_parts)
+        self.limits = limits or ProviderLimits(max_file_bytes=25 * 1024**2)
+        self.drop_silence = drop_silence
 
-    def transcribe(self, audio_path: Path, model: str) -> Transcript:
+    def _transcribe_single(self, audio_path: Path, model: str) -> Transcript:
         def _call() -> Any:
             with audio_path.open("rb") as audio_file:
                 return self.client.audio.transcriptions.create(
@@ -139,3 +315,6 @@ class OpenAICompatibleASR:
         raw = response.model_dump()
         text = clean_text(raw.get("text", ""))
         return Transcript(text=text, raw=raw)
+
+    def transcribe(self, audio_path: Path, model: str) -> Transcript:
+        return self._transcribe_single(audio_path, model)
@@ -1,10 +1,11 @@
 from __future__ import annotations
 
-from pathlib import Path
+from concurrent.futures import Future
 
 from ..pipeline.models import VideoItem, Transcript
 from ..config import Settings
-from .providers import DashScopeUrlASR, QwenAudioASR, OpenAICompatibleASR
+from ..utils.ffmpeg import probe_duration_ms
+from .providers import DashScopeUrlASR, QwenAudioASR, OpenAICompatibleASR, ProviderLimits
 
 
 class ASRRouter:
@@ -38,14 +39,33 @@ class ASRRouter:
                 raise ValueError("source_url is required for dashscope-url")
             return self.dashscope_url_asr.transcribe(item.source_url, settings.asr_model)
 
+        if not item.local_audio_path:
+            raise ValueError("local_audio_path is required for " + selected_mode)
+        audio_path = item.local_audio_path
+        provider = self.qwen_audio_asr if selected_mode == "audio-asr" else self.openai_asr
+        model = settings.audio_asr_model if selected_mode == "audio-asr" else settings.asr_model
+        size_bytes = audio_path.stat().st_size
+        duration_ms = probe_duration_ms(audio_path) or item.duration_ms
+        if self.limits_for(item, settings, use_source_url).exceeded_by(size_bytes, duration_ms):
+            print(
+                "[asr] audio exceeds provider limits, splitting upfront size="
+                + str(size_bytes)
+                + " duration_ms="
+                + str(duration_ms)
+            )
+            return provider.transcribe_split(audio_path, model, duration_ms)
         if selected_mode == "audio-asr":
-            if not item.local_audio_path:
-                raise ValueError("local_audio_path is required for audio-asr")
-            return self.qwen_audio_asr.transcribe(item.local_audio_path, settings.audio_asr_model)
+            return provider.transcribe(audio_path, model, duration_ms=duration_ms)
+        return provider.transcribe(audio_path, model)
 
-        if not item.local_audio_path:
-            raise ValueError("local_audio_path is required for compatible ASR")
-        return self.openai_asr.transcribe(item.local_audio_path, settings.asr_model)
+    def submit_url_batch(self, items: list[VideoItem], settings: Settings) -> Future:
+        missing = [item for item in items if not item.source_url]
+        if missing:
+            raise ValueError("source_url is required for dashscope-url")
+        return self.dashscope_url_asr.submit_many(
+            [item.source_url for item in items],
+            settings.asr_model,
+        )
 
     def describe_route(self, item: VideoItem, settings: Settings, use_source_url: bool) -> tuple[str, str, str]:
         selected_mode = self.select_mode(item, settings, use_source_url)
@@ -54,3 +74,15 @@ class ASRRouter:
         if selected_mode == "audio-asr":
             return selected_mode, settings.audio_asr_model, "local"
         return selected_mode, settings.asr_model, "local"
+
+    def provider_limits(self) -> dict[str, ProviderLimits]:
+        return {
+            "dashscope-url": self.dashscope_url_asr.limits,
+            "audio-asr": self.qwen_audio_asr.limits,
+            "compatible": self.openai_asr.limits,
+        }
+
+    def limits_for(self, item: VideoItem, settings: Settings, use_source_url: bool) -> ProviderLimits:
+        selected_mode = self.select_mode(item, settings, use_source_url)
+        limits = self.provider_limits()
+        return limits.get(selected_mode, limits["compatible"])
@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+
+import dashscope
+import httpx
+from dashscope.common.error import DashScopeException
+
+TERMINAL_STATUSES = {"SUCCEEDED", "FAILED", "CANCELED", "UNKNOWN"}
+REQUEST_ATTEMPTS = 3
+
+
+@dataclass
+class _PendingTask:
+    task_id: str
+    file_urls: list[str]
+    future: Future
+    interval: float
+    next_poll: float
+    failures: int = 0
+    submitted_at: float = field(default_factory=time.monotonic)
+
+
+class DashScopeTaskScheduler:
+    """Submits DashScope transcription tasks and polls all pending tasks from one event loop.
+
+    Futures resolve to ``{"output": <task output>, "raws": {file_url: <result json>}}``.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        min_interval: float = 1.0,
+        max_interval: float = 15.0,
+        backoff: float = 1.5,
+        max_connections: int = 32,
+        http_timeout: float = 30.0,
+        max_poll_failures: int = 5,
+    ) -> None:
+        self.api_key = api_key
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.max_connections = max_connections
+        self.http_timeout = http_timeout
+        self.max_poll_failures = max_poll_failures
+        self._pending: dict[str, _PendingTask] = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._client: httpx.AsyncClient | None = None
+        self._wakeup: asyncio.Event | None = None
+        self._started = threading.Event()
+        self._start_lock = threading.Lock()
+
+    @property
+    def api_base(self) -> str:
+        return getattr(dashscope, "base_http_api_url", None) or "https://dashscope.aliyuncs.com/api/v1"
+
+    def _ensure_started(self) -> None:
+        with self._start_lock:
+            if self._loop is not None:
+                return
+            self._loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=self._run_loop, name="dashscope-scheduler", daemon=True)
+            thread.start()
+        self._started.wait()
+
+    def _run_loop(self) -> None:
+        asyncio.set_event_loop(self._loop)
+        self._client = httpx.AsyncClient(
+            timeout=self.http_timeout,
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections,
+            ),
+        )
+        self._wakeup = asyncio.Event()
+        self._loop.create_task(self._poll_forever())
+        self._started.set()
+        self._loop.run_forever()
+
+    def submit(self, file_urls: list[str], model: str) -> Future:
+        self._ensure_started()
+        future: Future = Future()
+        asyncio.run_coroutine_threadsafe(self._submit(list(file_urls), model, future), self._loop)
+        return future
+
+    async def _submit(self, file_urls: list[str], model: str, future: Future) -> None:
+        def _call():
+            dashscope.api_key = self.api_key
+            return dashscope.audio.asr.Transcription.async_call(
+                model=model,
+                file_urls=file_urls,
+                language_hints=["zh", "en"],
+            )
+
+        last_error: Exception | None = None
+        for attempt in range(REQUEST_ATTEMPTS):
+            try:
+                response = await asyncio.to_thread(_call)
+                task_id = (response.output or {}).get("task_id")
+                if not task_id:
+                    raise RuntimeError(f"DashScope submit failed: {getattr(response, 'message', response)}")
+                break
+            except (DashScopeException, RuntimeError, OSError, ValueError) as exc:
+                last_error = exc
+                if attempt < REQUEST_ATTEMPTS - 1:
+                    await asyncio.sleep(2 ** attempt)
+        else:
+            future.set_exception(last_error or RuntimeError("DashScope submit failed"))
+            return
+
+        print(f"[asr] dashscope task submitted task_id={task_id} files={len(file_urls)}")
+        self._pending[task_id] = _PendingTask(
+            task_id=task_id,
+            file_urls=file_urls,
+            future=future,
+            interval=self.min_interval,
+            next_poll=time.monotonic() + self.min_interval,
+        )
+        self._wakeup.set()
+
+    async def _poll_forever(self) -> None:
+        while True:
+            if not self._pending:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            now = time.monotonic()
+            due = [task for task in self._pending.values() if task.next_poll <= now]
+            if due:
+                await asyncio.gather(*(self._poll(task) for task in due))
+            if self._pending:
+                next_due = min(task.next_poll for task in self._pending.values())
+                delay = max(0.05, next_due - time.monotonic())
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def _poll(self, task: _PendingTask) -> None:
+        try:
+            response = await self._client.get(
+                f"{self.api_base}/tasks/{task.task_id}",
+                headers={"Authorization": f"Bearer {self.api_key}"},
+            )
+            response.raise_for_status()
+            payload = response.json()
+            if not isinstance(payload, dict):
+                raise ValueError("Unexpected DashScope task payload")
+            output = payload.get("output") or {}
+        except (httpx.HTTPError, ValueError) as exc:
+            task.failures += 1
+            if task.failures >= self.max_poll_failures:
+                self._pending.pop(task.task_id, None)
+                task.future.set_exception(exc)
+                return
+            task.next_poll = time.monotonic() + task.interval
+            return
+
+        task.failures = 0
+        status = output.get("task_status")
+        if status not in TERMINAL_STATUSES:
+            task.interval = min(self.max_interval, task.interval * self.backoff)
+            task.next_poll = time.monotonic() + task.interval
+            return
+
+        self._pending.pop(task.task_id, None)
+        elapsed = time.monotonic() - task.submitted_at
+        print(f"[asr] dashscope task finished task_id={task.task_id} status={status} elapsed={elapsed:.1f}s")
+        results = [r for r in (output.get("results") or []) if isinstance(r, dict)]
+        fetches = [r for r in results if r.get("transcription_url") and r.get("subtask_status") != "FAILED"]
+        raws = await asyncio.gather(
+            *(self._fetch_json(r["transcription_url"]) for r in fetches),
+            return_exceptions=True,
+        )
+        task.future.set_result(
+            {
+                "output": output,
+                "raws": {r.get("file_url"): raw for r, raw in zip(fetches, raws, strict=True)},
+            }
+        )
+
+    async def _fetch_json(self, url: str) -> dict:
+        last_error: Exception | None = None
+        for attempt in range(REQUEST_ATTEMPTS):
+            try:
+                response = await self._client.get(url)
+                response.raise_for_status()
+                return response.json()
+            except (httpx.HTTPError, ValueError) as exc:
+                last_error = exc
+                if attempt < REQUEST_ATTEMPTS - 1:
+                    await asyncio.sleep(2 ** attempt)
+        raise last_error or RuntimeError("Failed to fetch transcription result")
+
+
+_SCHEDULERS: dict[str, DashScopeTaskScheduler] = {}
+_SCHEDULERS_LOCK = threading.Lock()
+
+
+def get_scheduler(api_key: str) -> DashScopeTaskScheduler:
+    with _SCHEDULERS_LOCK:
+        scheduler = _SCHEDULERS.get(api_key)
+        if scheduler is None:
+            scheduler = DashScopeTaskScheduler(api_key)
+            _SCHEDULERS[api_key] = scheduler
+        return scheduler
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from pathlib import Path
+
+from ..pipeline.manifest import manifest_entry
+from ..pipeline.models import TaskResult, Transcript, VideoItem
+
+
+@dataclass
+class BrokerTask:
+    job_id: str
+    index: int
+    payload: dict
+    attempts: int
+
+    @property
+    def id(self) -> str:
+        return f"{self.job_id}:{self.index}"
+
+
+def failed_entry(task: BrokerTask, error: str) -> dict:
+    """Manifest-style entry for a task that never produced a result."""
+    value = task.payload.get("input", "")
+    item = VideoItem(
+        input_value=value,
+        title=value,
+        source_url=None,
+        video_id=None,
+        local_video_path=None,
+        local_audio_path=None,
+        platform=task.payload.get("platform") or "auto",
+    )
+    result = TaskResult(item=item, transcript=Transcript(text="", raw={}), summary=None, error=error)
+    return manifest_entry(task.index, value, result)
+
+
+class Broker(ABC):
+    """Per-item task queue shared by the web app and worker processes.
+
+    Workers lease tasks for ``lease_seconds`` and keep them with ``heartbeat``;
+    a lease that runs out is handed to another worker, and after
+    ``max_attempts`` deliveries the task fails instead. Finished tasks carry a
+    manifest entry that the web app reads back in completion order.
+    """
+
+    # Exceptions a backend raises when its store is unreachable or busy.
+    errors: tuple[type[Exception], ...] = (OSError,)
+
+    def __init__(self, max_attempts: int = 3) -> None:
+        self.max_attempts = max(1, max_attempts)
+
+    @abstractmethod
+    def enqueue(self, job_id: str, payloads: list[tuple[int, dict]], priority: int = 0) -> None:
+        """Adds tasks; indexes already known for the job are left untouched."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def lease(self, worker_id: str, limit: int, lease_seconds: float) -> list[BrokerTask]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def heartbeat(self, worker_id: str, lease_seconds: float) -> int:
+        raise NotImplementedError
+
+    @abstractmethod
+    def complete(self, task: BrokerTask, worker_id: str, entry: dict) -> bool:
+        """Stores the result; False when the lease was lost to another worker."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def release(self, task: BrokerTask, worker_id: str, error: str) -> None:
+        """Returns a leased task to the queue, or fails it once attempts run out."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def results(self, job_id: str, after: int = 0) -> list[tuple[int, int, dict]]:
+        """``(seq, index, entry)`` for tasks finished after ``seq``."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def counts(self, job_id: str) -> dict[str, int]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def purge(self, job_id: str) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        return None
+
+
+def open_broker(url: str, max_attempts: int = 3) -> Broker:
+    """``sqlite:///path`` (or a bare path) for one host, ``redis://`` for several."""
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        from .redis_broker import RedisBroker
+
+        return RedisBroker(url, max_attempts=max_attempts)
+    from .sqlite import SqliteBroker
+
+    path = url[len("sqlite:///"):] if url.startswith("sqlite:///") else url
+    if not path:
+        raise ValueError("Broker URL is empty")
+    return SqliteBroker(Path(path), max_attempts=max_attempts)
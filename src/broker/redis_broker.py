@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import json
+import time
+
+from .base import Broker, BrokerTask, failed_entry
+
+# KEYS: queue, leases. ARGV: now, limit, lease_until, worker, prefix, max_attempts.
+_LEASE = """
+local expired = redis.call('ZRANGEBYSCORE', KEYS[2], '-inf', ARGV[1])
+local lost = {}
+for _, id in ipairs(expired) do
+    redis.call('ZREM', KEYS[2], id)
+    local key = ARGV[5] .. ':task:' .. id
+    if tonumber(redis.call('HGET', key, 'attempts')) >= tonumber(ARGV[6]) then
+        table.insert(lost, id)
+    else
+        redis.call('ZADD', KEYS[1], redis.call('HGET', key, 'score'), id)
+        redis.call('HSET', ARGV[5] .. ':job:' .. redis.call('HGET', key, 'job_id'), redis.call('HGET', key, 'index'), 'queued')
+    end
+end
+local ids = redis.call('ZRANGE', KEYS[1], 0, tonumber(ARGV[2]) - 1)
+for _, id in ipairs(ids) do
+    local key = ARGV[5] .. ':task:' .. id
+    redis.call('ZREM', KEYS[1], id)
+    redis.call('HINCRBY', key, 'attempts', 1)
+    redis.call('HSET', key, 'worker', ARGV[4])
+    redis.call('ZADD', KEYS[2], ARGV[3], id)
+    redis.call('SADD', ARGV[5] .. ':worker:' .. ARGV[4], id)
+    redis.call('HSET', ARGV[5] .. ':job:' .. redis.call('HGET', key, 'job_id'), redis.call('HGET', key, 'index'), 'leased')
+end
+return {ids, lost}
+"""
+
+# KEYS: leases, worker set. ARGV: lease_until, worker, prefix.
+_HEARTBEAT = """
+local count = 0
+for _, id in ipairs(redis.call('SMEMBERS', KEYS[2])) do
+    if redis.call('HGET', ARGV[3] .. ':task:' .. id, 'worker') == ARGV[2]
+        and redis.call('ZSCORE', KEYS[1], id) then
+        redis.call('ZADD', KEYS[1], ARGV[1], id)
+        count = count + 1
+    else
+        redis.call('SREM', KEYS[2], id)
+    end
+end
+return count
+"""
+
+# KEYS: leases, task, job, results, worker set. ARGV: id, worker (empty = unowned), index, status, entry.
+_FINISH = """
+if ARGV[2] ~= '' then
+    if redis.call('HGET', KEYS[2], 'worker') ~= ARGV[2] or redis.call('ZREM', KEYS[1], ARGV[1]) == 0 then
+        return 0
+    end
+    redis.call('SREM', KEYS[5], ARGV[1])
+end
+redis.call('HSET', KEYS[3], ARGV[3], ARGV[4])
+redis.call('RPUSH', KEYS[4], ARGV[5])
+return 1
+"""
+
+# KEYS: leases, task, queue, worker set, job. ARGV: id, worker, index.
+_REQUEUE = """
+if redis.call('HGET', KEYS[2], 'worker') ~= ARGV[2] or redis.call('ZREM', KEYS[1], ARGV[1]) == 0 then
+    return 0
+end
+redis.call('SREM', KEYS[4], ARGV[1])
+redis.call('ZADD', KEYS[3], redis.call('HGET', KEYS[2], 'score'), ARGV[1])
+redis.call('HSET', KEYS[5], ARGV[3], 'queued')
+return 1
+"""
+
+
+class RedisBroker(Broker):
+    """Broker on a Redis server, for workers spread over several hosts.
+
+    Ready tasks sit in a sorted set scored by priority and item index; leases
+    live in a second sorted set scored by expiry. Every state change runs as a
+    Lua script, so a task is only ever held by one worker. Needs ``pip install redis``.
+    """
+
+    def __init__(self, url: str, max_attempts: int = 3, prefix: str = "vse") -> None:
+        super().__init__(max_attempts)
+        try:
+            import redis
+        except ImportError as exc:
+            raise RuntimeError("Redis broker requires the redis package: pip install redis") from exc
+        self.prefix = prefix
+        self.errors = (redis.RedisError, OSError)
+        self._redis = redis.Redis.from_url(url, decode_responses=True)
+        self._lease = self._redis.register_script(_LEASE)
+        self._heartbeat = self._redis.register_script(_HEARTBEAT)
+        self._finish_script = self._redis.register_script(_FINISH)
+        self._requeue = self._redis.register_script(_REQUEUE)
+
+    def _key(self, *parts: str) -> str:
+        return ":".join((self.prefix, *parts))
+
+    def _finish(self, task: BrokerTask, worker_id: str, entry: dict) -> bool:
+        return bool(
+            self._finish_script(
+                keys=[
+                    self._key("leases"),
+                    self._key("task", task.id),
+                    self._key("job", task.job_id),
+                    self._key("results", task.job_id),
+                    self._key("worker", worker_id),
+                ],
+                args=[
+                    task.id,
+                    worker_id,
+                    task.index,
+                    entry["status"],
+                    json.dumps({"index": task.index, "entry": entry}, ensure_ascii=False),
+                ],
+            )
+        )
+
+    def _task(self, task_id: str) -> BrokerTask:
+        data = self._redis.hgetall(self._key("task", task_id))
+        return BrokerTask(
+            job_id=data["job_id"],
+            index=int(data["index"]),
+            payload=json.loads(data["payload"]),
+            attempts=int(data.get("attempts") or 0),
+        )
+
+    def enqueue(self, job_id: str, payloads: list[tuple[int, dict]], priority: int = 0) -> None:
+        job_key = self._key("job", job_id)
+        for index, payload in payloads:
+            if not self._redis.hsetnx(job_key, index, "queued"):
+                continue
+            task_id = f"{job_id}:{index}"
+            score = priority * 1e9 + index
+            pipe = self._redis.pipeline()
+            pipe.hset(
+                self._key("task", task_id),
+                mapping={
+                    "job_id": job_id,
+                    "index": index,
+                    "payload": json.dumps(payload, ensure_ascii=False),
+                    "attempts": 0,
+                    "score": score,
+                },
+            )
+            pipe.zadd(self._key("queue"), {task_id: score})
+            pipe.execute()
+
+    def lease(self, worker_id: str, limit: int, lease_seconds: float) -> list[BrokerTask]:
+        now = time.time()
+        ids, lost = self._lease(
+            keys=[self._key("queue"), self._key("leases")],
+            args=[now, limit, now + lease_seconds, worker_id, self.prefix, self.max_attempts],
+        )
+        for task_id in lost:
+            task = self._task(task_id)
+            self._finish(task, "", failed_entry(task, f"worker lost after {task.attempts} attempts"))
+        return [self._task(task_id) for task_id in ids]
+
+    def heartbeat(self, worker_id: str, lease_seconds: float) -> int:
+        return int(
+            self._heartbeat(
+                keys=[self._key("leases"), self._key("worker", worker_id)],
+                args=[time.time() + lease_seconds, worker_id, self.prefix],
+            )
+        )
+
+    def complete(self, task: BrokerTask, worker_id: str, entry: dict) -> bool:
+        return self._finish(task, worker_id, entry)
+
+    def release(self, task: BrokerTask, worker_id: str, error: str) -> None:
+        if task.attempts >= self.max_attempts:
+            self._finish(task, worker_id, failed_entry(task, error))
+            return
+        self._requeue(
+            keys=[
+                self._key("leases"),
+                self._key("task", task.id),
+                self._key("queue"),
+                self._key("worker", worker_id),
+                self._key("job", task.job_id),
+            ],
+            args=[task.id, worker_id, task.index],
+        )
+
+    def results(self, job_id: str, after: int = 0) -> list[tuple[int, int, dict]]:
+        rows = self._redis.lrange(self._key("results", job_id), after, -1)
+        outcomes = []
+        for offset, row in enumerate(rows, start=after + 1):
+            data = json.loads(row)
+            outcomes.append((offset, data["index"], data["entry"]))
+        return outcomes
+
+    def counts(self, job_id: str) -> dict[str, int]:
+        counts: dict[str, int] = {}
+        for status in self._redis.hvals(self._key("job", job_id)):
+            counts[status] = counts.get(status, 0) + 1
+        return counts
+
+    def purge(self, job_id: str) -> None:
+        job_key = self._key("job", job_id)
+        task_ids = [f"{job_id}:{index}" for index in self._redis.hkeys(job_key)]
+        lookup = self._redis.pipeline()
+        for task_id in task_ids:
+            lookup.hget(self._key("task", task_id), "worker")
+        workers = lookup.execute()
+        pipe = self._redis.pipeline()
+        for task_id, worker_id in zip(task_ids, workers, strict=True):
+            pipe.zrem(self._key("queue"), task_id)
+            pipe.zrem(self._key("leases"), task_id)
+            pipe.delete(self._key("task", task_id))
+            if worker_id:
+                # Worker sets span jobs; drop only this job's ids (Redis deletes emptied sets).
+                pipe.srem(self._key("worker", worker_id), task_id)
+        pipe.delete(job_key, self._key("results", job_id))
+        pipe.execute()
+
+    def close(self) -> None:
+        self._redis.close()
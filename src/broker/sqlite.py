@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from ..utils.file import ensure_dir
+from .base import Broker, BrokerTask, failed_entry
+
+
+class SqliteBroker(Broker):
+    """Broker in a SQLite file shared by every process on the host.
+
+    Each lease runs in a ``BEGIN IMMEDIATE`` transaction, so concurrent workers
+    never receive the same task. Ready tasks are handed out by priority, then by
+    item index, which interleaves the items of concurrent jobs.
+    """
+
+    errors = (sqlite3.Error, OSError)
+
+    def __init__(self, path: Path, max_attempts: int = 3) -> None:
+        super().__init__(max_attempts)
+        ensure_dir(path.parent)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS tasks (
+                job_id TEXT NOT NULL,
+                idx INTEGER NOT NULL,
+                priority INTEGER NOT NULL,
+                payload TEXT NOT NULL,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                worker TEXT,
+                lease_until REAL,
+                result TEXT,
+                done_seq INTEGER,
+                created_ts REAL NOT NULL,
+                PRIMARY KEY (job_id, idx)
+            );
+            CREATE INDEX IF NOT EXISTS tasks_ready ON tasks (status, priority, idx, created_ts);
+            CREATE INDEX IF NOT EXISTS tasks_lease ON tasks (status, lease_until);
+            CREATE INDEX IF NOT EXISTS tasks_done ON tasks (job_id, done_seq);
+            """
+        )
+
+    def _transaction(self, body):
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                outcome = body(self._conn)
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+            return outcome
+
+    def _finish(self, conn: sqlite3.Connection, job_id: str, index: int, entry: dict) -> None:
+        seq = conn.execute(
+            "SELECT COALESCE(MAX(done_seq), 0) + 1 FROM tasks WHERE job_id = ?", (job_id,)
+        ).fetchone()[0]
+        conn.execute(
+            """
+            UPDATE tasks SET status = ?, result = ?, done_seq = ?, worker = NULL, lease_until = NULL
+            WHERE job_id = ? AND idx = ?
+            """,
+            (entry["status"], json.dumps(entry, ensure_ascii=False), seq, job_id, index),
+        )
+
+    def enqueue(self, job_id: str, payloads: list[tuple[int, dict]], priority: int = 0) -> None:
+        now = time.time()
+        rows = [
+            (job_id, index, priority, json.dumps(payload, ensure_ascii=False), now)
+            for index, payload in payloads
+        ]
+
+        def _body(conn: sqlite3.Connection) -> None:
+            conn.executemany(
+                """
+                INSERT OR IGNORE INTO tasks (job_id, idx, priority, payload, status, created_ts)
+                VALUES (?, ?, ?, ?, 'queued', ?)
+                """,
+                rows,
+            )
+
+        self._transaction(_body)
+
+    def lease(self, worker_id: str, limit: int, lease_seconds: float) -> list[BrokerTask]:
+        def _body(conn: sqlite3.Connection) -> list[BrokerTask]:
+            now = time.time()
+            expired = conn.execute(
+                "SELECT job_id, idx, payload, attempts FROM tasks WHERE status = 'leased' AND lease_until < ?",
+                (now,),
+            ).fetchall()
+            for job_id, index, payload, attempts in expired:
+                if attempts >= self.max_attempts:
+                    task = BrokerTask(job_id, index, json.loads(payload), attempts)
+                    self._finish(conn, job_id, index, failed_entry(task, f"worker lost after {attempts} attempts"))
+                else:
+                    conn.execute(
+                        "UPDATE tasks SET status = 'queued', worker = NULL WHERE job_id = ? AND idx = ?",
+                        (job_id, index),
+                    )
+            rows = conn.execute(
+                """
+                SELECT job_id, idx, payload, attempts FROM tasks WHERE status = 'queued'
+                ORDER BY priority, idx, created_ts LIMIT ?
+                """,
+                (limit,),
+            ).fetchall()
+            conn.executemany(
+                """
+                UPDATE tasks SET status = 'leased', worker = ?, lease_until = ?, attempts = attempts + 1
+                WHERE job_id = ? AND idx = ?
+                """,
+                [(worker_id, now + lease_seconds, job_id, index) for job_id, index, _, _ in rows],
+            )
+            return [
+                BrokerTask(job_id, index, json.loads(payload), attempts + 1)
+                for job_id, index, payload, attempts in rows
+            ]
+
+        return self._transaction(_body)
+
+    def heartbeat(self, worker_id: str, lease_seconds: float) -> int:
+        def _body(conn: sqlite3.Connection) -> int:
+            cursor = conn.execute(
+                "UPDATE tasks SET lease_until = ? WHERE status = 'leased' AND worker = ?",
+                (time.time() + lease_seconds, worker_id),
+            )
+            return cursor.rowcount
+
+        return self._transaction(_body)
+
+    def _owned(self, conn: sqlite3.Connection, task: BrokerTask, worker_id: str) -> bool:
+        row = conn.execute(
+            "SELECT status, worker FROM tasks WHERE job_id = ? AND idx = ?",
+            (task.job_id, task.index),
+        ).fetchone()
+        return row is not None and row[0] == "leased" and row[1] == worker_id
+
+    def complete(self, task: BrokerTask, worker_id: str, entry: dict) -> bool:
+        def _body(conn: sqlite3.Connection) -> bool:
+            if not self._owned(conn, task, worker_id):
+                return False
+            self._finish(conn, task.job_id, task.index, entry)
+            return True
+
+        return self._transaction(_body)
+
+    def release(self, task: BrokerTask, worker_id: str, error: str) -> None:
+        def _body(conn: sqlite3.Connection) -> None:
+            if not self._owned(conn, task, worker_id):
+                return
+            if task.attempts >= self.max_attempts:
+                self._finish(conn, task.job_id, task.index, failed_entry(task, error))
+                return
+            conn.execute(
+                "UPDATE tasks SET status = 'queued', worker = NULL, lease_until = NULL WHERE job_id = ? AND idx = ?",
+                (task.job_id, task.index),
+            )
+
+        self._transaction(_body)
+
+    def results(self, job_id: str, after: int = 0) -> list[tuple[int, int, dict]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT done_seq, idx, result FROM tasks WHERE job_id = ? AND done_seq > ? ORDER BY done_seq",
+                (job_id, after),
+            ).fetchall()
+        return [(seq, index, json.loads(result)) for seq, index, result in rows]
+
+    def counts(self, job_id: str) -> dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, COUNT(*) FROM tasks WHERE job_id = ? GROUP BY status",
+                (job_id,),
+            ).fetchall()
+        return {status: count for status, count in rows}
+
+    def purge(self, job_id: str) -> None:
+        self._transaction(lambda conn: conn.execute("DELETE FROM tasks WHERE job_id = ?", (job_id,)))
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
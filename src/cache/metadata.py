@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from ..pipeline.models import VideoItem
+from ..utils.file import ensure_dir
+
+DEFAULT_META_TTL = 7 * 24 * 3600
+DEFAULT_SOURCE_TTL = 30 * 60
+
+
+@dataclass
+class CachedMetadata:
+    platform: str
+    video_id: str
+    title: str
+    publish_timestamp: int | None
+    duration_ms: int | None
+    source_url: str | None
+    download_headers: dict | None
+    audio_only: bool
+
+    def to_item(self, input_value: str) -> VideoItem:
+        return VideoItem(
+            input_value=input_value,
+            title=self.title,
+            source_url=self.source_url,
+            video_id=self.video_id,
+            local_video_path=None,
+            local_audio_path=None,
+            publish_timestamp=self.publish_timestamp,
+            duration_ms=self.duration_ms,
+            platform=self.platform,
+            download_headers=self.download_headers,
+            audio_only=self.audio_only,
+        )
+
+
+class MetadataCache:
+    """Persistent video metadata keyed by (platform, video_id).
+
+    Title, publish time and duration live for ``meta_ttl`` seconds; play URLs
+    expire quickly, so ``source_url`` is only served for ``source_ttl`` seconds.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        meta_ttl: float = DEFAULT_META_TTL,
+        source_ttl: float = DEFAULT_SOURCE_TTL,
+    ) -> None:
+        ensure_dir(path.parent)
+        self.path = path
+        self.meta_ttl = meta_ttl
+        self.source_ttl = source_ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS videos (
+                platform TEXT NOT NULL,
+                video_id TEXT NOT NULL,
+                title TEXT NOT NULL,
+                publish_timestamp INTEGER,
+                duration_ms INTEGER,
+                meta_updated REAL NOT NULL,
+                source_url TEXT,
+                download_headers TEXT,
+                audio_only INTEGER NOT NULL DEFAULT 0,
+                source_updated REAL,
+                PRIMARY KEY (platform, video_id)
+            );
+            CREATE TABLE IF NOT EXISTS aliases (
+                alias TEXT PRIMARY KEY,
+                platform TEXT NOT NULL,
+                video_id TEXT NOT NULL,
+                updated REAL NOT NULL
+            );
+            """
+        )
+        self._conn.commit()
+
+    def lookup_alias(self, alias: str) -> tuple[str, str] | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT platform, video_id, updated FROM aliases WHERE alias = ?",
+                (alias,),
+            ).fetchone()
+        if not row or time.time() - row[2] > self.meta_ttl:
+            return None
+        return row[0], row[1]
+
+    def get(self, platform: str, video_id: str) -> CachedMetadata | None:
+        with self._lock:
+            row = self._conn.execute(
+                """
+                SELECT title, publish_timestamp, duration_ms, meta_updated,
+                       source_url, download_headers, audio_only, source_updated
+                FROM videos WHERE platform = ? AND video_id = ?
+                """,
+                (platform, video_id),
+            ).fetchone()
+        if not row:
+            return None
+        now = time.time()
+        title, publish_timestamp, duration_ms, meta_updated, source_url, headers, audio_only, source_updated = row
+        if now - meta_updated > self.meta_ttl:
+            return None
+        if not source_updated or now - source_updated > self.source_ttl:
+            source_url = None
+        return CachedMetadata(
+            platform=platform,
+            video_id=video_id,
+            title=title,
+            publish_timestamp=publish_timestamp,
+            duration_ms=duration_ms,
+            source_url=source_url,
+            download_headers=json.loads(headers) if headers else None,
+            audio_only=bool(audio_only),
+        )
+
+    def put(self, item: VideoItem, aliases: list[str] | None = None) -> None:
+        if not item.video_id:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO videos
+                    (platform, video_id, title, publish_timestamp, duration_ms, meta_updated,
+                     source_url, download_headers, audio_only, source_updated)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    item.platform,
+                    item.video_id,
+                    item.title,
+                    item.publish_timestamp,
+                    item.duration_ms,
+                    now,
+                    item.source_url,
+                    json.dumps(item.download_headers) if item.download_headers else None,
+                    int(item.audio_only),
+                    now if item.source_url else None,
+                ),
+            )
+            for alias in aliases or []:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO aliases (alias, platform, video_id, updated) VALUES (?, ?, ?, ?)",
+                    (alias, item.platform, item.video_id, now),
+                )
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
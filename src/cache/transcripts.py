@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from ..pipeline.models import Transcript
+from ..utils.file import ensure_dir
+
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+
+
+@dataclass(frozen=True)
+class CacheKey:
+    platform: str
+    subject: str
+    route: str
+    model: str
+
+    @property
+    def digest(self) -> str:
+        joined = "\x1f".join([self.platform, self.subject, self.route, self.model])
+        return hashlib.sha1(joined.encode("utf-8")).hexdigest()
+
+
+class TranscriptCache:
+    """SQLite-indexed transcript store with LRU eviction under a byte budget."""
+
+    def __init__(self, root: Path, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.root = root
+        self.max_bytes = max_bytes
+        self.objects_dir = root / "objects"
+        ensure_dir(self.objects_dir)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(root / "index.sqlite3"), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS transcripts (
+                digest TEXT PRIMARY KEY,
+                platform TEXT NOT NULL,
+                subject TEXT NOT NULL,
+                route TEXT NOT NULL,
+                model TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_transcripts_last_access ON transcripts(last_access)"
+        )
+        self._conn.commit()
+
+    def _object_path(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / f"{digest}.json"
+
+    def _sum_bytes(self) -> int:
+        row = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM transcripts").fetchone()
+        return int(row[0])
+
+    @property
+    def total_bytes(self) -> int:
+        with self._lock:
+            return self._sum_bytes()
+
+    def get(self, key: CacheKey) -> Transcript | None:
+        digest = key.digest
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT size FROM transcripts WHERE digest = ?",
+                (digest,),
+            ).fetchone()
+            if not row:
+                return None
+            path = self._object_path(digest)
+            try:
+                payload = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                self._delete(digest)
+                self._conn.commit()
+                return None
+            self._conn.execute(
+                "UPDATE transcripts SET last_access = ? WHERE digest = ?",
+                (time.time(), digest),
+            )
+            self._conn.commit()
+        return Transcript(text=payload.get("text", ""), raw=payload.get("raw") or {})
+
+    def put(self, key: CacheKey, transcript: Transcript) -> None:
+        digest = key.digest
+        data = json.dumps(
+            {"text": transcript.text, "raw": transcript.raw},
+            ensure_ascii=False,
+            separators=(",", ":"),
+        ).encode("utf-8")
+        path = self._object_path(digest)
+        ensure_dir(path.parent)
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+
+        now = time.time()
+        with self._lock:
+            # Other processes may share the directory: take the write lock before summing
+            # sizes so the budget check and the evictions see a consistent table.
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    """
+                    INSERT OR REPLACE INTO transcripts
+                        (digest, platform, subject, route, model, size, created_at, last_access)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (digest, key.platform, key.subject, key.route, key.model, len(data), now, now),
+                )
+                self._evict()
+                self._conn.commit()
+            except sqlite3.Error:
+                self._conn.rollback()
+                raise
+
+    def _delete(self, digest: str) -> None:
+        self._conn.execute("DELETE FROM transcripts WHERE digest = ?", (digest,))
+        try:
+            self._object_path(digest).unlink()
+        except FileNotFoundError:
+            pass
+
+    def _evict(self) -> None:
+        if self.max_bytes <= 0:
+            return
+        total = self._sum_bytes()
+        if total <= self.max_bytes:
+            return
+        rows = self._conn.execute(
+            "SELECT digest, size FROM transcripts ORDER BY last_access ASC"
+        )
+        victims: list[str] = []
+        for digest, size in rows:
+            if total <= self.max_bytes:
+                break
+            victims.append(digest)
+            total -= int(size)
+        for digest in victims:
+            self._delete(digest)
+        if victims:
+            print(f"[cache] evicted={len(victims)} total_bytes={total}")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -14,6 +14,37 @@ class Settings:
     llm_model: str
     asr_mode: str
     audio_asr_model: str
+    pipeline_concurrent: bool = False
+    cache_max_bytes: int = 1024 * 1024 * 1024
+    stream_media: bool = False
+    audio_asr_max_parallel: int = 4
+    audio_asr_max_file_bytes: int = 10 * 1024 * 1024
+    audio_asr_max_seconds: int = 180
+    audio_drop_silence: bool = True
+    dashscope_batch_size: int = 50
+    dashscope_batch_linger: float = 2.0
+    http_pool_size: int = 16
+    http_per_host_limit: int = 8
+    http_timeout: float = 20.0
+    item_retries: int = 2
+    item_retry_delay: float = 2.0
+    download_connections: int = 4
+    download_split_bytes: int = 8 * 1024 * 1024
+    export_processes: bool = True
+    web_job_workers: int = 3
+    web_small_job_items: int = 5
+    web_item_slots: int = 6
+    asr_max_concurrency: int = 4
+    export_srt_workers: int = 2
+    metadata_cache_path: str = "outputs/.cache/metadata.sqlite3"
+    metadata_ttl: float = 7 * 24 * 3600
+    source_url_ttl: float = 30 * 60
+    job_store_path: str = "outputs/.cache/jobs.sqlite3"
+    job_retention_days: float = 7.0
+    broker_url: str = ""
+    worker_batch_items: int = 4
+    worker_lease_seconds: float = 120.0
+    worker_max_attempts: int = 3
 
 
 def get_settings() -> Settings:
@@ -23,6 +54,38 @@ def get_settings() -> Settings:
     llm_model = os.getenv("LLM_MODEL", "qwen-plus")
     asr_mode = os.getenv("ASR_MODE", "auto")
     audio_asr_model = os.getenv("AUDIO_ASR_MODEL", "qwen-audio-asr")
+    pipeline_concurrent = os.getenv("PIPELINE_CONCURRENT", "0").strip().lower() in ("1", "true", "yes")
+    cache_max_bytes = int(os.getenv("CACHE_MAX_BYTES", str(1024 * 1024 * 1024)))
+    stream_media = os.getenv("STREAM_MEDIA", "0").strip().lower() in ("1", "true", "yes")
+    audio_asr_max_parallel = int(os.getenv("AUDIO_ASR_MAX_PARALLEL", "4"))
+    audio_asr_max_file_bytes = int(os.getenv("AUDIO_ASR_MAX_FILE_BYTES", str(10 * 1024 * 1024)))
+    audio_asr_max_seconds = int(os.getenv("AUDIO_ASR_MAX_SECONDS", "180"))
+    audio_drop_silence = os.getenv("AUDIO_DROP_SILENCE", "1").strip().lower() in ("1", "true", "yes")
+    dashscope_batch_size = int(os.getenv("DASHSCOPE_BATCH_SIZE", "50"))
+    dashscope_batch_linger = float(os.getenv("DASHSCOPE_BATCH_LINGER", "2.0"))
+    http_pool_size = int(os.getenv("HTTP_POOL_SIZE", "16"))
+    http_per_host_limit = int(os.getenv("HTTP_PER_HOST_LIMIT", "8"))
+    http_timeout = float(os.getenv("HTTP_TIMEOUT", "20"))
+    item_retries = int(os.getenv("ITEM_RETRIES", "2"))
+    item_retry_delay = float(os.getenv("ITEM_RETRY_DELAY", "2"))
+    download_connections = int(os.getenv("DOWNLOAD_CONNECTIONS", "4"))
+    download_split_bytes = int(os.getenv("DOWNLOAD_SPLIT_BYTES", str(8 * 1024 * 1024)))
+    default_export_processes = "1" if (os.cpu_count() or 1) > 1 else "0"
+    export_processes = os.getenv("EXPORT_PROCESSES", default_export_processes).strip().lower() in ("1", "true", "yes")
+    export_srt_workers = int(os.getenv("EXPORT_SRT_WORKERS", "2"))
+    web_job_workers = int(os.getenv("WEB_JOB_WORKERS", "3"))
+    web_small_job_items = int(os.getenv("WEB_SMALL_JOB_ITEMS", "5"))
+    web_item_slots = int(os.getenv("WEB_ITEM_SLOTS", "6"))
+    asr_max_concurrency = int(os.getenv("ASR_MAX_CONCURRENCY", "4"))
+    metadata_cache_path = os.getenv("METADATA_CACHE_PATH", "outputs/.cache/metadata.sqlite3").strip()
+    metadata_ttl = float(os.getenv("METADATA_TTL", str(7 * 24 * 3600)))
+    source_url_ttl = float(os.getenv("SOURCE_URL_TTL", str(30 * 60)))
+    job_store_path = os.getenv("JOB_STORE_PATH", "outputs/.cache/jobs.sqlite3").strip()
+    job_retention_days = float(os.getenv("JOB_RETENTION_DAYS", "7"))
+    broker_url = os.getenv("BROKER_URL", "").strip()
+    worker_batch_items = int(os.getenv("WORKER_BATCH_ITEMS", "4"))
+    worker_lease_seconds = float(os.getenv("WORKER_LEASE_SECONDS", "120"))
+    worker_max_attempts = int(os.getenv("WORKER_MAX_ATTEMPTS", "3"))
     if not api_key:
         raise ValueError("Missing DASHSCOPE_API_KEY in environment or .env")
     return Settings(
@@ -32,4 +95,35 @@ def get_settings() -> Settings:
         llm_model=llm_model,
         asr_mode=asr_mode,
         audio_asr_model=audio_asr_model,
+        pipeline_concurrent=pipeline_concurrent,
+        cache_max_bytes=cache_max_bytes,
+        stream_media=stream_media,
+        audio_asr_max_parallel=audio_asr_max_parallel,
+        audio_asr_max_file_bytes=audio_asr_max_file_bytes,
+        audio_asr_max_seconds=audio_asr_max_seconds,
+        audio_drop_silence=audio_drop_silence,
+        dashscope_batch_size=dashscope_batch_size,
+        dashscope_batch_linger=dashscope_batch_linger,
+        http_pool_size=http_pool_size,
+        http_per_host_limit=http_per_host_limit,
+        http_timeout=http_timeout,
+        item_retries=item_retries,
+        item_retry_delay=item_retry_delay,
+        download_connections=download_connections,
+        download_split_bytes=download_split_bytes,
+        export_processes=export_processes,
+        export_srt_workers=export_srt_workers,
+        web_job_workers=web_job_workers,
+        web_small_job_items=web_small_job_items,
+        web_item_slots=web_item_slots,
+        asr_max_concurrency=asr_max_concurrency,
+        metadata_cache_path=metadata_cache_path,
+        metadata_ttl=metadata_ttl,
+        source_url_ttl=source_url_ttl,
+        job_store_path=job_store_path,
+        job_retention_days=job_retention_days,
+        broker_url=broker_url,
+        worker_batch_items=worker_batch_items,
+        worker_lease_seconds=worker_lease_seconds,
+        worker_max_attempts=worker_max_attempts,
     )
@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import multiprocessing
+import pickle
+import queue
+import traceback
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import replace
+from pathlib import Path
+from typing import Iterable
+
+from ..pipeline.models import TaskResult, Transcript
+from ..utils.file import sanitize_filename
+from .excel_exporter import ExcelStreamWriter
+from .srt_exporter import export_srt_item
+from .word_exporter import WordStreamWriter
+
+
+def _open_writer(kind: str, output_path: Path, batch_name: str, total: int):
+    if kind == "docx":
+        return WordStreamWriter(output_path, batch_name, total)
+    return ExcelStreamWriter(output_path)
+
+
+def _writer_process(kind: str, output_path: Path, batch_name: str, total: int, inbox, status) -> None:
+    try:
+        writer = _open_writer(kind, output_path, batch_name, total)
+        while True:
+            entry = inbox.get()
+            if entry is None:
+                break
+            index, result = pickle.loads(entry)
+            writer.add(result, index)
+        writer.close()
+        status.put((kind, None))
+    except BaseException:  # noqa: BLE001 - reported to the parent, which raises it
+        status.put((kind, traceback.format_exc()))
+
+
+class _WriterProcess:
+    def __init__(self, ctx, kind: str, output_path: Path, batch_name: str, total: int, status) -> None:
+        self.kind = kind
+        self.output_path = output_path
+        self.inbox = ctx.Queue(maxsize=64)
+        self.process = ctx.Process(
+            target=_writer_process,
+            args=(kind, output_path, batch_name, total, self.inbox, status),
+            name=f"export-{kind}",
+            daemon=True,
+        )
+        self.process.start()
+
+    def add(self, payload: bytes) -> None:
+        while True:
+            try:
+                self.inbox.put(payload, timeout=1.0)
+                return
+            except queue.Full as exc:
+                if not self.process.is_alive():
+                    raise RuntimeError(f"{self.kind} exporter exited early") from exc
+
+    def close(self) -> Path:
+        if self.process.is_alive():
+            self.inbox.put(None)
+        self.process.join()
+        return self.output_path
+
+    def terminate(self) -> None:
+        # Rows still buffered for a dead reader must not keep the parent from exiting.
+        self.inbox.cancel_join_thread()
+        if self.process.is_alive():
+            self.process.terminate()
+        self.process.join(timeout=5.0)
+
+
+class DeliveryExporter:
+    """Writes delivery files while results are still arriving.
+
+    Word and Excel each run in their own process (``processes=True``) and are fed
+    rows in input order, holding back only results that arrive early; each row
+    is pickled once and shared by both. SRT files are written per video on a
+    small thread pool. Wall time is bounded by the slowest format rather than
+    their sum.
+    """
+
+    def __init__(
+        self,
+        output_dir: Path,
+        batch_name: str,
+        formats: Iterable[str],
+        total: int,
+        processes: bool = True,
+        srt_workers: int = 2,
+    ) -> None:
+        self.output_dir = output_dir
+        self.formats = set(formats)
+        self.safe_name = sanitize_filename(batch_name) or "delivery"
+        self.exports: list[str] = []
+        self.failed: list[dict] = []
+        self._held: dict[int, TaskResult] = {}
+        self._next_row = 1
+        self._srt_futures: list[tuple[int, Future]] = []
+        self._srt_paths: list[tuple[int, Path]] = []
+        self._closed = False
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        # spawn: the web worker and pipeline hold threads and sockets that must not be forked
+        ctx = multiprocessing.get_context("spawn")
+        self.processes = processes
+        self._status = ctx.Queue() if processes else None
+        self._srt_pool = None
+        if "srt" in self.formats and srt_workers > 0:
+            self._srt_pool = ThreadPoolExecutor(max_workers=srt_workers, thread_name_prefix="export-srt")
+        self._writers: list = []
+        for kind in ("docx", "xlsx"):
+            if kind not in self.formats:
+                continue
+            output_path = output_dir / f"{self.safe_name}.{kind}"
+            if processes:
+                self._writers.append(_WriterProcess(ctx, kind, output_path, batch_name, total, self._status))
+            else:
+                self._writers.append(_open_writer(kind, output_path, batch_name, total))
+
+    def add(self, index: int, result: TaskResult) -> None:
+        if result.error:
+            self.failed.append({"index": index, "input": result.item.input_value, "error": result.error})
+        if "srt" in self.formats:
+            if self._srt_pool is not None:
+                self._srt_futures.append((index, self._srt_pool.submit(export_srt_item, result, index, self.output_dir)))
+            else:
+                srt_path = export_srt_item(result, index, self.output_dir)
+                if srt_path:
+                    self._srt_paths.append((index, srt_path))
+        if not self._writers:
+            return
+        self._held[index] = replace(result, transcript=Transcript(text=result.transcript.text, raw={}))
+        while self._next_row in self._held:
+            self._write(self._next_row, self._held.pop(self._next_row))
+            self._next_row += 1
+
+    def _write(self, index: int, result: TaskResult) -> None:
+        if self.processes:
+            payload = pickle.dumps((index, result), protocol=pickle.HIGHEST_PROTOCOL)
+            for writer in self._writers:
+                writer.add(payload)
+            return
+        for writer in self._writers:
+            writer.add(result, index)
+
+    def close(self) -> list[str]:
+        try:
+            return self._close()
+        except BaseException:
+            self.abort()
+            raise
+
+    def abort(self) -> None:
+        """Stops writer processes and pending SRT writes; a no-op after a clean ``close``."""
+        if self._closed:
+            return
+        self._closed = True
+        if self.processes:
+            for writer in self._writers:
+                writer.terminate()
+        if self._srt_pool is not None:
+            self._srt_pool.shutdown(wait=False, cancel_futures=True)
+
+    def _close(self) -> list[str]:
+        for index in sorted(self._held):
+            self._write(index, self._held.pop(index))
+        names = [writer.close().name for writer in self._writers]
+        errors: list[str] = []
+        if self._status is not None:
+            for _ in self._writers:
+                try:
+                    kind, error = self._status.get(timeout=5.0)
+                except queue.Empty:
+                    errors.append("exporter process exited without reporting status")
+                    continue
+                if error:
+                    errors.append(f"{kind}: {error}")
+        if self._srt_pool is not None:
+            for index, future in self._srt_futures:
+                srt_path = future.result()
+                if srt_path:
+                    self._srt_paths.append((index, srt_path))
+            self._srt_pool.shutdown()
+        if errors:
+            raise RuntimeError("Export failed:\n" + "\n".join(errors))
+        self._closed = True
+        self.exports = names + [path.name for _, path in sorted(self._srt_paths)]
+        return self.exports
@@ -1,49 +1,71 @@
 from pathlib import Path
-from typing import Iterable
+from typing import Iterable, Optional
 
 from openpyxl import Workbook
 from datetime import datetime
 
 from ..pipeline.models import TaskResult
+from ..utils.text import format_duration
 
 
 HEADERS = ["序号", "视频标题", "链接", "发布时间", "时长", "文案", "摘要(可选)", "关键词(可选)"]
+OVERFLOW_HEADER = "文案(续)"
+CELL_LIMIT = 32767
+
+
+def _split_cell(text: str) -> list[str]:
+    if len(text) <= CELL_LIMIT:
+        return [text]
+    return [text[start:start + CELL_LIMIT] for start in range(0, len(text), CELL_LIMIT)]
+
+
+def _build_row(idx: int, result: TaskResult) -> list:
+    publish_time = ""
+    if result.item.publish_timestamp:
+        ts = result.item.publish_timestamp
+        if ts > 10**11:
+            ts = int(ts / 1000)
+        publish_time = datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M:%S")
+    text = result.transcript.text if not result.error else f"[处理失败] {result.error}"
+    text_cells = _split_cell(text)
+    return [
+        idx,
+        result.item.title,
+        result.item.input_value or "",
+        publish_time,
+        format_duration(result.item.duration_ms),
+        text_cells[0],
+        (result.summary or "")[:CELL_LIMIT],
+        "",
+        *text_cells[1:],
+    ]
+
+
+class ExcelStreamWriter:
+    """Appends rows to a write-only workbook so memory stays flat; the file is written on ``close()``.
+
+    Transcripts longer than Excel's cell limit continue in extra columns after the headers.
+    """
+
+    def __init__(self, output_path: Path) -> None:
+        self.output_path = output_path
+        self._wb = Workbook(write_only=True)
+        self._ws = self._wb.create_sheet("交付")
+        self._ws.append(HEADERS + [OVERFLOW_HEADER])
+        self._count = 0
+
+    def add(self, result: TaskResult, idx: Optional[int] = None) -> None:
+        self._count += 1
+        self._ws.append(_build_row(idx or self._count, result))
+
+    def close(self) -> Path:
+        self.output_path.parent.mkdir(parents=True, exist_ok=True)
+        self._wb.save(self.output_path)
+        return self.output_path
 
 
 def export_excel(results: Iterable[TaskResult], output_path: Path) -> Path:
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "交付"
-
-    ws.append(HEADERS)
-
-    for idx, result in enumerate(results, start=1):
-        publish_time = ""
-        if result.item.publish_timestamp:
-            ts = result.item.publish_timestamp
-            if ts > 10**11:
-                ts = int(ts / 1000)
-            publish_time = datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M:%S")
-        duration = ""
-        if result.item.duration_ms:
-            duration_value = result.item.duration_ms
-            total_seconds = int(duration_value if duration_value < 1000 else duration_value / 1000)
-            minutes = total_seconds // 60
-            seconds = total_seconds % 60
-            duration = f"{minutes:02}:{seconds:02}"
-        ws.append(
-            [
-                idx,
-                result.item.title,
-                result.item.input_value or "",
-                publish_time,
-                duration,
-                result.transcript.text,
-                result.summary or "",
-                "",
-            ]
-        )
-
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    wb.save(output_path)
-    return output_path
+    writer = ExcelStreamWriter(output_path)
+    for result in results:
+        writer.add(result)
+    return writer.close()
@@ -27,19 +27,24 @@ def _build_srt(sentences: list[dict]) -> str:
     return "\n".join(lines).strip() + "\n"
 
 
+def export_srt_item(result: TaskResult, index: int, output_dir: Path) -> Path | None:
+    raw = result.transcript.raw or {}
+    transcripts = raw.get("transcripts") or []
+    sentences = []
+    if transcripts and isinstance(transcripts, list):
+        sentences = transcripts[0].get("sentences") or []
+    if not sentences:
+        return None
+    srt_path = output_dir / f"video_{index}.srt"
+    srt_path.write_text(_build_srt(sentences), encoding="utf-8")
+    return srt_path
+
+
 def export_srt(results: Iterable[TaskResult], output_dir: Path) -> list[Path]:
     output_dir.mkdir(parents=True, exist_ok=True)
     srt_paths: list[Path] = []
     for idx, result in enumerate(results, start=1):
-        raw = result.transcript.raw or {}
-        transcripts = raw.get("transcripts") or []
-        sentences = []
-        if transcripts and isinstance(transcripts, list):
-            sentences = transcripts[0].get("sentences") or []
-        if not sentences:
-            continue
-        srt_text = _build_srt(sentences)
-        srt_path = output_dir / f"video_{idx}.srt"
-        srt_path.write_text(srt_text, encoding="utf-8")
-        srt_paths.append(srt_path)
+        srt_path = export_srt_item(result, idx, output_dir)
+        if srt_path:
+            srt_paths.append(srt_path)
     return srt_paths
@@ -1,13 +1,114 @@
 from datetime import datetime
 from pathlib import Path
-from typing import Iterable
+from typing import Iterable, Optional
+from xml.sax.saxutils import escape
+import os
+import re
+import zipfile
 
+import docx
 from docx import Document
 
 from ..pipeline.models import TaskResult
+from ..utils.text import format_duration
+
+
+TEMPLATE_PATH = Path(os.path.dirname(docx.__file__)) / "templates" / "default.docx"
+_ILLEGAL_XML = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f\ud800-\udfff\ufffe\uffff]")
+
+
+def _format_publish_time(ts: int) -> str:
+    if ts > 10**11:
+        ts = int(ts / 1000)
+    return datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _paragraph_xml(text: str, style: Optional[str] = None) -> str:
+    ppr = f'<w:pPr><w:pStyle w:val="{style}"/></w:pPr>' if style else ""
+    if not text:
+        return f"<w:p>{ppr}</w:p>"
+    parts = []
+    for idx, line in enumerate(_ILLEGAL_XML.sub("", text).split("\n")):
+        if idx:
+            parts.append("<w:br/>")
+        for jdx, chunk in enumerate(line.split("\t")):
+            if jdx:
+                parts.append("<w:tab/>")
+            if chunk:
+                parts.append(f'<w:t xml:space="preserve">{escape(chunk)}</w:t>')
+    return f"<w:p>{ppr}<w:r>{''.join(parts)}</w:r></w:p>"
+
+
+def _result_xml(idx: int, result: TaskResult) -> str:
+    parts = [_paragraph_xml(f"视频 {idx}: {result.item.title}", "Heading2")]
+    if result.item.input_value:
+        parts.append(_paragraph_xml(f"链接/来源：{result.item.input_value}"))
+    if result.error:
+        parts.append(_paragraph_xml(f"处理失败：{result.error}"))
+    if result.summary:
+        parts.append(_paragraph_xml(f"摘要：{result.summary}"))
+    if result.item.publish_timestamp:
+        parts.append(_paragraph_xml(f"发布时间：{_format_publish_time(result.item.publish_timestamp)}"))
+    if result.item.duration_ms:
+        parts.append(_paragraph_xml(f"时长：{format_duration(result.item.duration_ms)}"))
+    parts.append(_paragraph_xml("文案："))
+    parts.extend(_paragraph_xml(para) for para in result.transcript.text.split("\n"))
+    return "".join(parts)
+
+
+class WordStreamWriter:
+    """Streams ``word/document.xml`` straight into the docx zip as results are added.
+
+    Styles, settings and the section layout come from python-docx's default
+    template, so the output matches what ``Document()`` would produce.
+    """
+
+    def __init__(self, output_path: Path, batch_name: str, total: int) -> None:
+        self.output_path = output_path
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with zipfile.ZipFile(TEMPLATE_PATH) as template:
+            parts = {name: template.read(name) for name in template.namelist()}
+        document_xml = parts.pop("word/document.xml").decode("utf-8")
+        head = document_xml[: document_xml.index("<w:body>") + len("<w:body>")]
+        sect_pr = re.search(r"<w:sectPr.*?</w:sectPr>", document_xml, re.DOTALL).group(0)
+        self._tail = f"{sect_pr}</w:body></w:document>"
+        self._count = 0
+
+        self._zip = zipfile.ZipFile(output_path, "w", compression=zipfile.ZIP_DEFLATED)
+        for name, data in parts.items():
+            self._zip.writestr(name, data)
+        self._body = self._zip.open("word/document.xml", "w", force_zip64=True)
+        self._write(head)
+        self._write(
+            _paragraph_xml("交付信息", "Heading1")
+            + _paragraph_xml(f"客户/账号：{batch_name}")
+            + _paragraph_xml(f"日期：{datetime.now().strftime('%Y-%m-%d')}")
+            + _paragraph_xml(f"总条数：{total}")
+        )
+
+    def _write(self, text: str) -> None:
+        self._body.write(text.encode("utf-8"))
+
+    def add(self, result: TaskResult, idx: Optional[int] = None) -> None:
+        self._count += 1
+        self._write(_result_xml(idx or self._count, result))
+
+    def close(self) -> Path:
+        self._write(self._tail)
+        self._body.close()
+        self._zip.close()
+        return self.output_path
 
 
 def export_word(results: Iterable[TaskResult], output_path: Path, batch_name: str) -> Path:
+    results_list = list(results)
+    writer = WordStreamWriter(output_path, batch_name, total=len(results_list))
+    for result in results_list:
+        writer.add(result)
+    return writer.close()
+
+
+def export_word_python_docx(results: Iterable[TaskResult], output_path: Path, batch_name: str) -> Path:
     results_list = list(results)
     doc = Document()
     doc.add_heading("交付信息", level=1)
@@ -19,20 +120,14 @@ def export_word(results: Iterable[TaskResult], output_path: Path, batch_name: st
         doc.add_heading(f"视频 {idx}: {result.item.title}", level=2)
         if result.item.input_value:
             doc.add_paragraph(f"链接/来源：{result.item.input_value}")
+        if result.error:
+            doc.add_paragraph(f"处理失败：{result.error}")
         if result.summary:
             doc.add_paragraph(f"摘要：{result.summary}")
         if result.item.publish_timestamp:
-            ts = result.item.publish_timestamp
-            if ts > 10**11:
-                ts = int(ts / 1000)
-            publish_time = datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M:%S")
-            doc.add_paragraph(f"发布时间：{publish_time}")
+            doc.add_paragraph(f"发布时间：{_format_publish_time(result.item.publish_timestamp)}")
         if result.item.duration_ms:
-            duration_value = result.item.duration_ms
-            total_seconds = int(duration_value if duration_value < 1000 else duration_value / 1000)
-            minutes = total_seconds // 60
-            seconds = total_seconds % 60
-            doc.add_paragraph(f"时长：{minutes:02}:{seconds:02}")
+            doc.add_paragraph(f"时长：{format_duration(result.item.duration_ms)}")
         doc.add_paragraph("文案：")
         for para in result.transcript.text.split("\n"):
             doc.add_paragraph(para)
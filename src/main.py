@@ -3,17 +3,28 @@ from pathlib import Path
 
 from .config import get_settings
 from .pipeline.runner import PipelineFactory
-from .exporters.word_exporter import export_word
-from .exporters.excel_exporter import export_excel
-from .exporters.srt_exporter import export_srt
+from .exporters.delivery import DeliveryExporter
 from .collectors.douyin_profile import collect_profile_links
-from .utils.file import sanitize_filename
+from .utils.text import format_duration
 
 
 def _read_links_file(path: Path) -> list[str]:
     return [line.strip() for line in path.read_text(encoding="utf-8").splitlines() if line.strip()]
 
 
+def _print_preview(inputs: list[str], platform_hint: str) -> None:
+    resolver = PipelineFactory(get_settings()).create_resolver()
+    results = resolver.resolve_many(inputs, platform_hint)
+    for idx, result in enumerate(results, start=1):
+        if result.item is None:
+            print(f"{idx}. [失败] {result.input_value} -> {result.error}")
+            continue
+        duration = format_duration(result.item.duration_ms) or "--:--"
+        print(f"{idx}. [{result.item.platform}] {duration} {result.item.title}")
+    failed = sum(1 for result in results if not result.ok)
+    print(f"Preview: {len(results) - failed} ok, {failed} failed")
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="Douyin delivery tool")
     parser.add_argument("--name", required=True, help="Batch name, e.g. 客户A_账号xxx")
@@ -30,6 +41,16 @@ def main() -> None:
     )
     parser.add_argument("--summary", action="store_true", help="Generate summary with LLM")
     parser.add_argument("--no-cache", action="store_true", help="Disable transcript cache")
+    parser.add_argument(
+        "--concurrent",
+        action="store_true",
+        help="Run pipeline stages concurrently with per-stage worker pools",
+    )
+    parser.add_argument(
+        "--preview",
+        action="store_true",
+        help="Only resolve inputs and list titles/durations, without downloading media",
+    )
     parser.add_argument("--output-dir", default="outputs", help="Output root directory")
     parser.add_argument("--tmp-dir", default="tmp", help="Temporary working directory")
 
@@ -47,12 +68,26 @@ def main() -> None:
     if not inputs:
         raise SystemExit("No inputs provided. Use --links or --inputs.")
 
+    if args.preview:
+        _print_preview(inputs, args.platform)
+        return
+
     settings = get_settings()
     output_root = Path(args.output_dir)
     tmp_root = Path(args.tmp_dir)
 
     runner = PipelineFactory(settings).create()
-    output_dir, results = runner.run(
+    output_dir = runner.batch_dir(output_root, args.name)
+    exporter = DeliveryExporter(
+        output_dir,
+        args.name,
+        args.export,
+        total=len(inputs),
+        processes=settings.export_processes,
+        srt_workers=settings.export_srt_workers,
+    )
+    completed = 0
+    for index, result in runner.iter_run(
         inputs=inputs,
         batch_name=args.name,
         output_root=output_root,
@@ -60,17 +95,16 @@ def main() -> None:
         enable_summary=args.summary,
         use_cache=not args.no_cache,
         platform_hint=args.platform,
-    )
-
-    safe_name = sanitize_filename(args.name) or "delivery"
-    if "docx" in args.export:
-        export_word(results, output_dir / f"{safe_name}.docx", args.name)
-    if "xlsx" in args.export:
-        export_excel(results, output_dir / f"{safe_name}.xlsx")
-    if "srt" in args.export:
-        export_srt(results, output_dir)
+        concurrent=True if args.concurrent else None,
+        ordering="input",
+    ):
+        exporter.add(index, result)
+        completed += 1
+    exporter.close()
 
-    print(f"Done. Output: {output_dir}")
+    for entry in exporter.failed:
+        print(f"[失败] {entry['input']} -> {entry['error']}")
+    print(f"Done. Output: {output_dir} ({completed - len(exporter.failed)} ok, {len(exporter.failed)} failed)")
 
 
 if __name__ == "__main__":
@@ -1,42 +1,71 @@
 from __future__ import annotations
 
 from pathlib import Path
-import requests
+import ffmpeg
 
 from ..pipeline.models import VideoItem
-from ..utils.ffmpeg import extract_audio as _extract_audio
+from ..utils.download import RangedDownloader
+from ..utils.http import HttpClient, default_http_client
+from ..utils.ffmpeg import extract_audio as _extract_audio, extract_audio_stream
 from ..utils.text import clean_text, split_paragraphs
 from openai import OpenAI
 
 
 class VideoDownloader:
-    def download(self, item: VideoItem, tmp_dir: Path) -> VideoItem:
+    def __init__(
+        self,
+        http: HttpClient | None = None,
+        connections: int = 4,
+        split_bytes: int = 8 * 1024 * 1024,
+    ) -> None:
+        self.http = http or default_http_client()
+        self.ranged = RangedDownloader(self.http, connections=connections, split_bytes=split_bytes)
+
+    def download(self, item: VideoItem, tmp_dir: Path, on_progress=None) -> VideoItem:
         if item.local_video_path:
             return item
         if not item.source_url:
             raise ValueError("Missing source_url for download")
 
-        filename = f"{item.video_id or 'video'}.mp4"
+        suffix = ".m4a" if item.audio_only else ".mp4"
+        filename = f"{item.video_id or 'video'}{suffix}"
         video_path = tmp_dir / filename
         headers = item.download_headers or {}
-        response = requests.get(item.source_url, headers=headers, stream=True, timeout=30)
-        response.raise_for_status()
-
-        with open(video_path, "wb") as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                if chunk:
-                    f.write(chunk)
+        self.ranged.fetch(item.source_url, video_path, headers=headers, on_progress=on_progress)
 
         item.local_video_path = video_path
         return item
 
+    def stream_audio(self, item: VideoItem, tmp_dir: Path, on_progress=None) -> VideoItem:
+        if item.local_video_path or item.local_audio_path:
+            return item
+        if not item.source_url:
+            raise ValueError("Missing source_url for streaming")
+
+        audio_path = tmp_dir / f"{item.video_id or 'video'}.wav"
+        headers = item.download_headers or {}
+        response = self.http.get(item.source_url, headers=headers, stream=True, timeout=30)
+        response.raise_for_status()
+        try:
+            extract_audio_stream(response.iter_content(chunk_size=256 * 1024), audio_path)
+        except ffmpeg.Error as exc:
+            stderr = (exc.stderr or b"").decode("utf-8", errors="replace").strip()
+            print("[download] stream extraction failed, falling back to file download: " + stderr)
+            audio_path.unlink(missing_ok=True)
+            return self.download(item, tmp_dir, on_progress=on_progress)
+        finally:
+            response.close()
+
+        item.local_audio_path = audio_path
+        return item
+
 
 class AudioExtractor:
     def extract(self, item: VideoItem, tmp_dir: Path) -> VideoItem:
-        if not item.local_video_path:
-            raise ValueError("Missing local_video_path for audio extraction")
         if item.local_audio_path:
             return item
+        if not item.local_video_path:
+            raise ValueError("Missing local_video_path for audio extraction")
         audio_path = tmp_dir / f"{item.local_video_path.stem}.wav"
         _extract_audio(item.local_video_path, audio_path)
         item.local_audio_path = audio_path
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Iterator
+
+
+class FairGate:
+    """Counting semaphore that hands freed slots to waiting keys in round-robin order.
+
+    Keys are usually job ids: a job with hundreds of queued items gets one slot per
+    turn, the same as a job with three, so their work interleaves.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = max(1, capacity)
+        self._available = self.capacity
+        self._waiters: dict[str, deque[threading.Event]] = {}
+        self._turns: deque[str] = deque()
+        self._waited: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, key: str) -> None:
+        with self._lock:
+            if self._available > 0 and not self._turns:
+                self._available -= 1
+                return
+            event = threading.Event()
+            self._waiters.setdefault(key, deque()).append(event)
+            if key not in self._turns:
+                self._turns.append(key)
+        started = time.monotonic()
+        event.wait()
+        with self._lock:
+            self._waited[key] = self._waited.get(key, 0.0) + time.monotonic() - started
+
+    def release(self) -> None:
+        with self._lock:
+            if not self._turns:
+                self._available = min(self.capacity, self._available + 1)
+                return
+            key = self._turns.popleft()
+            waiters = self._waiters[key]
+            event = waiters.popleft()
+            if waiters:
+                self._turns.append(key)
+            else:
+                del self._waiters[key]
+        event.set()
+
+    @contextmanager
+    def slot(self, key: str) -> Iterator[None]:
+        self.acquire(key)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def waited_seconds(self, key: str) -> float:
+        with self._lock:
+            return self._waited.get(key, 0.0)
+
+    def forget(self, key: str) -> None:
+        with self._lock:
+            self._waited.pop(key, None)
+
+
+@dataclass
+class RunGates:
+    """Gates shared between concurrent runs; ``key`` identifies this run."""
+
+    key: str
+    items: FairGate | None = None
+    asr: FairGate | None = None
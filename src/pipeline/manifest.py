@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import json
+import threading
+from dataclasses import asdict
+from pathlib import Path
+
+from .models import TaskResult, Transcript, VideoItem
+
+MANIFEST_NAME = "manifest.jsonl"
+
+
+def _item_to_dict(item: VideoItem) -> dict:
+    data = asdict(item)
+    for key in ("local_video_path", "local_audio_path"):
+        if data[key] is not None:
+            data[key] = str(data[key])
+    return data
+
+
+def _item_from_dict(data: dict) -> VideoItem:
+    data = dict(data)
+    for key in ("local_video_path", "local_audio_path"):
+        if data.get(key):
+            data[key] = Path(data[key])
+    return VideoItem(**data)
+
+
+def manifest_entry(index: int, input_value: str, result: TaskResult) -> dict:
+    return {
+        "index": index,
+        "input": input_value,
+        "status": "failed" if result.error else "done",
+        "error": result.error,
+        "item": _item_to_dict(result.item),
+        "text": result.transcript.text,
+        "summary": result.summary,
+    }
+
+
+class BatchManifest:
+    """Append-only record of finished items in a batch output directory.
+
+    One JSON line per finished or failed item; the last line for an index wins.
+    Raw ASR output stays in ``raw_{idx}.json`` next to it.
+    """
+
+    def __init__(self, output_dir: Path) -> None:
+        self.output_dir = output_dir
+        self.path = output_dir / MANIFEST_NAME
+        self._lock = threading.Lock()
+
+    def load(self) -> dict[int, dict]:
+        entries: dict[int, dict] = {}
+        if not self.path.exists():
+            return entries
+        with self.path.open("r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                entries[int(entry["index"])] = entry
+        return entries
+
+    def record(self, index: int, input_value: str, result: TaskResult) -> None:
+        line = json.dumps(manifest_entry(index, input_value, result), ensure_ascii=False) + "\n"
+        with self._lock:
+            with self.path.open("a", encoding="utf-8") as f:
+                f.write(line)
+
+    def restore(self, entry: dict) -> TaskResult | None:
+        if entry.get("status") != "done":
+            return None
+        raw_path = self.output_dir / f"raw_{entry['index']}.json"
+        if not raw_path.exists():
+            return None
+        raw = json.loads(raw_path.read_text(encoding="utf-8"))
+        return TaskResult(
+            item=_item_from_dict(entry["item"]),
+            transcript=Transcript(text=entry.get("text") or "", raw=raw),
+            summary=entry.get("summary"),
+        )
+
+    def load_result(self, entry: dict) -> TaskResult:
+        """Rebuilds a result recorded by another process; failed items keep their error
+        and a missing ``raw_{idx}.json`` only loses the subtitle timings."""
+        result = self.restore(entry)
+        if result is not None:
+            return result
+        return TaskResult(
+            item=_item_from_dict(entry["item"]),
+            transcript=Transcript(text=entry.get("text") or "", raw={}),
+            summary=entry.get("summary"),
+            error=entry.get("error") if entry.get("status") == "failed" else None,
+        )
@@ -15,6 +15,8 @@ class VideoItem:
     duration_ms: Optional[int] = None
     platform: str = "auto"
     download_headers: Optional[dict] = None
+    audio_only: bool = False
+    content_hash: Optional[str] = None
 
 
 @dataclass
@@ -28,3 +30,4 @@ class TaskResult:
     item: VideoItem
     transcript: Transcript
     summary: Optional[str]
+    error: Optional[str] = None
@@ -16,6 +16,7 @@ def run_pipeline(
     cache_dir: Path | None = None,
     on_progress=None,
     platform: str | None = None,
+    concurrent: bool | None = None,
 ) -> tuple[Path, list]:
     runner = PipelineFactory(settings).create()
     return runner.run(
@@ -28,4 +29,5 @@ def run_pipeline(
         cache_dir=cache_dir,
         on_progress=on_progress,
         platform_hint=platform,
+        concurrent=concurrent,
     )
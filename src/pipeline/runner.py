@@ -1,17 +1,82 @@
 from __future__ import annotations
 
 import json
+import shutil
+import threading
 from datetime import datetime
+from concurrent.futures import Future
+from contextlib import ExitStack
+from dataclasses import dataclass, replace
 from pathlib import Path
-from typing import Iterable
+from typing import Callable, Iterable, Iterator, Optional
 
 from ..config import Settings
 from ..platforms.resolver import PlatformResolver
 from ..asr.router import ASRRouter
-from ..asr.providers import DashScopeUrlASR, QwenAudioASR, OpenAICompatibleASR
+from ..asr.providers import DashScopeUrlASR, QwenAudioASR, OpenAICompatibleASR, ProviderLimits
 from .components import VideoDownloader, AudioExtractor, TextPostProcessor, Summarizer
-from .models import TaskResult, Transcript
+from .gate import RunGates
+from .manifest import BatchManifest
+from .models import TaskResult, Transcript, VideoItem
+from .stages import Stage, StagePipeline
+from ..cache.metadata import MetadataCache
+from ..cache.transcripts import CacheKey, TranscriptCache
 from ..utils.file import ensure_dir, hash_file
+from ..utils.http import HttpClient
+from ..utils.retry import RetryPolicy
+
+
+DEFAULT_STAGE_WORKERS = {
+    "parse": 4,
+    "download": 3,
+    "audio": 2,
+    "asr": 4,
+    "asr_url": 1,
+    "asr_url_pending": 16,
+    "summary": 2,
+}
+
+
+@dataclass
+class _ItemState:
+    index: int
+    value: str
+    platform_hint: Optional[str]
+    output_dir: Path
+    tmp_root: Path
+    cache: TranscriptCache
+    use_cache: bool
+    enable_summary: bool
+    item: Optional[VideoItem] = None
+    use_source_url: bool = False
+    cache_key: Optional[CacheKey] = None
+    raw: Optional[dict] = None
+    text: str = ""
+    result: Optional[TaskResult] = None
+    manifest: Optional[BatchManifest] = None
+    gates: Optional[RunGates] = None
+    claims: Optional["_CanonicalIndex"] = None
+    on_download: Optional[Callable[[int, int, float], None]] = None
+    duplicate_of: Optional["_ItemState"] = None
+    error: Optional[str] = None
+
+
+class _CanonicalIndex:
+    def __init__(self) -> None:
+        self._leaders: dict[tuple[str, str], _ItemState] = {}
+        self._lock = threading.Lock()
+
+    def claim(self, key: tuple[str, str], state: _ItemState) -> _ItemState:
+        with self._lock:
+            return self._leaders.setdefault(key, state)
+
+
+def _is_active(state: _ItemState) -> bool:
+    return state.duplicate_of is None and state.error is None
+
+
+def _needs_media(state: _ItemState) -> bool:
+    return _is_active(state) and not state.use_source_url and state.raw is None
 
 
 class PipelineRunner:
@@ -24,6 +89,8 @@ class PipelineRunner:
         audio_extractor: AudioExtractor,
         post_processor: TextPostProcessor,
         summarizer: Summarizer,
+        stage_workers: dict[str, int] | None = None,
+        retry_policy: RetryPolicy | None = None,
     ) -> None:
         self.settings = settings
         self.platform_resolver = platform_resolver
@@ -32,15 +99,363 @@ class PipelineRunner:
         self.audio_extractor = audio_extractor
         self.post_processor = post_processor
         self.summarizer = summarizer
+        self.stage_workers = dict(stage_workers or DEFAULT_STAGE_WORKERS)
+        self.retry_policy = retry_policy or RetryPolicy(
+            attempts=settings.item_retries + 1,
+            base_delay=settings.item_retry_delay,
+        )
 
-    def _cache_key(self, item) -> str:
+    def _cache_key(self, item: VideoItem, use_source_url: bool) -> CacheKey:
         if item.video_id:
-            return f"video_{item.video_id}"
-        if item.local_audio_path and item.local_audio_path.exists():
-            return f"audio_{hash_file(item.local_audio_path)}"
-        if item.local_video_path and item.local_video_path.exists():
-            return f"video_{hash_file(item.local_video_path)}"
-        return f"input_{abs(hash(item.input_value))}"
+            subject = f"video:{item.video_id}"
+        elif item.content_hash:
+            subject = f"sha256:{item.content_hash}"
+        elif item.local_video_path and item.local_video_path.exists():
+            subject = f"sha256:{hash_file(item.local_video_path)}"
+        elif item.local_audio_path and item.local_audio_path.exists():
+            subject = f"audio-sha256:{hash_file(item.local_audio_path)}"
+        else:
+            subject = f"input:{item.input_value}"
+        mode, model, route = self.asr_router.describe_route(item, self.settings, use_source_url)
+        return CacheKey(platform=item.platform, subject=subject, route=f"{mode}/{route}", model=model)
+
+    def _plan(self, state: _ItemState) -> None:
+        state.cache_key = self._cache_key(state.item, state.use_source_url)
+        if not state.use_cache:
+            return
+        cached = state.cache.get(state.cache_key)
+        if cached is not None:
+            state.raw = cached.raw
+            state.text = cached.text
+            print("[pipeline] item " + str(state.index) + " cache_hit=" + state.cache_key.digest)
+
+    def _log_item(self, state: _ItemState) -> None:
+        item = state.item
+        print(
+            "[pipeline] item "
+            + str(state.index)
+            + " platform="
+            + item.platform
+            + " use_source_url="
+            + str(state.use_source_url)
+            + " source_url="
+            + ("yes" if item.source_url else "no")
+        )
+
+    def _stage_parse(self, state: _ItemState) -> None:
+        item = self.platform_resolver.resolve(state.value, state.platform_hint)
+        state.item = item
+        if item.video_id and state.claims is not None:
+            leader = state.claims.claim((item.platform, item.video_id), state)
+            if leader is not state:
+                state.duplicate_of = leader
+                print("[pipeline] item " + str(state.index) + " duplicate_of=" + str(leader.index))
+                return
+        state.use_source_url = bool(
+            self.settings.asr_mode in ("dashscope-url", "auto")
+            and (item.source_url or item.video_id)
+            and item.platform == "douyin"
+            and not self.asr_router.limits_for(item, self.settings, True).exceeded_by(0, item.duration_ms)
+        )
+        self._log_item(state)
+        self._plan(state)
+
+    def _ensure_source(self, state: _ItemState) -> None:
+        item = state.item
+        if item.source_url or item.local_video_path or item.local_audio_path:
+            return
+        print("[pipeline] item " + str(state.index) + " refreshing expired source_url")
+        state.item = self.platform_resolver.refresh_source(item)
+
+    def _stage_download(self, state: _ItemState) -> None:
+        self._ensure_source(state)
+        item = state.item
+        if self.settings.stream_media and item.source_url and not item.local_video_path:
+            state.item = self.downloader.stream_audio(item, state.tmp_root, on_progress=state.on_download)
+            return
+        state.item = self.downloader.download(item, state.tmp_root, on_progress=state.on_download)
+
+    def _stage_audio(self, state: _ItemState) -> None:
+        state.item = self.audio_extractor.extract(state.item, state.tmp_root)
+
+    def _stage_asr(self, state: _ItemState) -> None:
+        item = state.item
+        mode, model, route = self.asr_router.describe_route(item, self.settings, state.use_source_url)
+        print(
+            "[pipeline] asr_mode_selected="
+            + mode
+            + " model="
+            + model
+            + " route="
+            + route
+        )
+        transcript = self.asr_router.transcribe(item, self.settings, state.use_source_url)
+        state.raw = transcript.raw
+        state.text = transcript.text
+        state.cache.put(state.cache_key, transcript)
+
+    def _stage_asr_url_batch(self, states: list[_ItemState]) -> Future:
+        print(
+            "[pipeline] asr_mode_selected=dashscope-url model="
+            + self.settings.asr_model
+            + " route=url batch="
+            + str(len(states))
+        )
+        applied: Future = Future()
+        self._submit_url_batch(states, 0, applied)
+        return applied
+
+    def _submit_url_batch(self, states: list[_ItemState], attempt: int, applied: Future) -> None:
+        ready: list[_ItemState] = []
+        for state in states:
+            try:
+                self._ensure_source(state)
+                ready.append(state)
+            except Exception as exc:  # noqa: BLE001 - fails only this item
+                self._fail(state, "asr_url", exc)
+        if not ready:
+            applied.set_result(None)
+            return
+        asr_gate = ready[0].gates.asr if ready[0].gates else None
+        if asr_gate is not None:
+            asr_gate.acquire(ready[0].gates.key)
+
+        def _apply(submitted: Future) -> None:
+            if asr_gate is not None:
+                asr_gate.release()
+            try:
+                outcomes = submitted.result()
+            except Exception as exc:  # noqa: BLE001 - fails every item in the batch
+                outcomes = [exc] * len(ready)
+            failed: list[tuple[_ItemState, Exception]] = []
+            for state, outcome in zip(ready, outcomes, strict=True):
+                if isinstance(outcome, Exception):
+                    failed.append((state, outcome))
+                    continue
+                state.raw = outcome.raw
+                state.text = outcome.text
+                state.cache.put(state.cache_key, outcome)
+            if failed and attempt + 1 < self.retry_policy.attempts:
+                print(
+                    "[pipeline] asr_url retry attempt="
+                    + str(attempt + 1)
+                    + " items="
+                    + str(len(failed))
+                    + " error="
+                    + str(failed[0][1])
+                )
+                timer = threading.Timer(
+                    self.retry_policy.delay(attempt),
+                    self._submit_url_batch,
+                    args=([state for state, _ in failed], attempt + 1, applied),
+                )
+                timer.daemon = True
+                timer.start()
+                return
+            for state, exc in failed:
+                self._fail(state, "asr_url", exc)
+            applied.set_result(None)
+
+        try:
+            submitted = self.asr_router.submit_url_batch([state.item for state in ready], self.settings)
+        except Exception as exc:  # noqa: BLE001 - delivered to _apply like a failed batch
+            submitted = Future()
+            submitted.set_exception(exc)
+        submitted.add_done_callback(_apply)
+
+    def _stage_summary(self, state: _ItemState) -> None:
+        paragraphs = self.post_processor.process(state.text)
+        summary = None
+        if state.enable_summary and state.text:
+            summary = self.summarizer.summarize(
+                text=state.text,
+                api_key=self.settings.api_key,
+                base_url=self.settings.base_url,
+                model=self.settings.llm_model,
+            )
+
+        raw_out_path = state.output_dir / f"raw_{state.index}.json"
+        raw_out_path.write_text(json.dumps(state.raw, ensure_ascii=False, indent=2), encoding="utf-8")
+        state.result = TaskResult(
+            item=state.item,
+            transcript=Transcript(text="\n".join(paragraphs), raw=state.raw),
+            summary=summary,
+        )
+        state.manifest.record(state.index, state.value, state.result)
+
+    def _fail(self, state: _ItemState, stage: str, exc: Exception) -> None:
+        state.error = f"{stage}: {exc}"
+        print("[pipeline] item " + str(state.index) + " failed stage=" + stage + " error=" + str(exc))
+        item = state.item or VideoItem(
+            input_value=state.value,
+            title=state.value,
+            source_url=None,
+            video_id=None,
+            local_video_path=None,
+            local_audio_path=None,
+            platform=state.platform_hint or "auto",
+        )
+        state.result = TaskResult(
+            item=item,
+            transcript=Transcript(text="", raw={}),
+            summary=None,
+            error=state.error,
+        )
+        state.manifest.record(state.index, state.value, state.result)
+
+    def _isolated(self, stage: str, handler):
+        def _run(state: _ItemState) -> None:
+            def _on_retry(attempt: int, exc: Exception) -> None:
+                print(
+                    "[pipeline] item "
+                    + str(state.index)
+                    + " retry stage="
+                    + stage
+                    + " attempt="
+                    + str(attempt)
+                    + " error="
+                    + str(exc)
+                )
+
+            try:
+                self.retry_policy.call(lambda: self._gated(state, stage, handler), on_retry=_on_retry)
+            except Exception as exc:  # noqa: BLE001 - fails only this item
+                self._fail(state, stage, exc)
+
+        return _run
+
+    def _gated(self, state: _ItemState, stage: str, handler) -> None:
+        gates = state.gates
+        if gates is None:
+            handler(state)
+            return
+        with ExitStack() as stack:
+            if gates.items is not None:
+                stack.enter_context(gates.items.slot(gates.key))
+            if stage == "asr" and gates.asr is not None:
+                stack.enter_context(gates.asr.slot(gates.key))
+            handler(state)
+
+    def _download_reporter(self, state: _ItemState, total: int, on_progress):
+        def _report(done: int, size: int, bytes_per_second: float) -> None:
+            percent = f"{done * 100 // size}%" if size else f"{done // (1024 * 1024)}MB"
+            on_progress(
+                step="download",
+                current=state.index,
+                total=total,
+                message=f"下载视频 #{state.index} {percent} {bytes_per_second / (1024 * 1024):.1f}MB/s",
+                download={
+                    "index": state.index,
+                    "bytes": done,
+                    "total_bytes": size,
+                    "bytes_per_second": round(bytes_per_second),
+                },
+            )
+
+        return _report
+
+    def _resume(self, states: list[_ItemState], manifest: BatchManifest) -> int:
+        entries = manifest.load()
+        resumed = 0
+        for state in states:
+            entry = entries.get(state.index)
+            if not entry or entry.get("input") != state.value:
+                continue
+            result = manifest.restore(entry)
+            if result is not None:
+                state.item = result.item
+                state.result = result
+                resumed += 1
+        return resumed
+
+    def _dedup(self, states: list[_ItemState]) -> list[_ItemState]:
+        claims = _CanonicalIndex()
+        unique: list[_ItemState] = []
+        for state in states:
+            state.claims = claims
+            key = self.platform_resolver.canonical_key(state.value, state.platform_hint)
+            leader = claims.claim(key, state) if key else state
+            if leader is state:
+                unique.append(state)
+            else:
+                state.duplicate_of = leader
+                print("[pipeline] item " + str(state.index) + " duplicate_of=" + str(leader.index))
+        return unique
+
+    def _fan_out(self, state: _ItemState) -> None:
+        leader = state.duplicate_of
+        while leader.duplicate_of is not None:
+            leader = leader.duplicate_of
+        source = leader.result
+        state.item = replace(source.item, input_value=state.value)
+        state.error = source.error
+        transcript = source.transcript
+        if not source.error:
+            raw_out_path = state.output_dir / f"raw_{state.index}.json"
+            if transcript.raw is None:
+                shutil.copyfile(leader.output_dir / f"raw_{leader.index}.json", raw_out_path)
+                raw = json.loads(raw_out_path.read_text(encoding="utf-8"))
+                transcript = Transcript(text=transcript.text, raw=raw)
+            else:
+                raw_out_path.write_text(json.dumps(transcript.raw, ensure_ascii=False, indent=2), encoding="utf-8")
+        state.result = TaskResult(
+            item=state.item,
+            transcript=transcript,
+            summary=source.summary,
+            error=source.error,
+        )
+        state.manifest.record(state.index, state.value, state.result)
+
+    def _build_stages(self, stage_workers: dict[str, int]) -> list[Stage]:
+        def _workers(name: str) -> int:
+            return max(1, int(stage_workers.get(name, 1)))
+
+        return [
+            Stage("parse", self._isolated("parse", self._stage_parse), _workers("parse"), "解析输入"),
+            Stage(
+                "download",
+                self._isolated("download", self._stage_download),
+                _workers("download"),
+                "下载视频",
+                applies=_needs_media,
+            ),
+            Stage(
+                "audio",
+                self._isolated("audio", self._stage_audio),
+                _workers("audio"),
+                "抽取音频",
+                applies=lambda state: _needs_media(state) and not state.item.local_audio_path,
+            ),
+            Stage(
+                "asr",
+                self._isolated("asr", self._stage_asr),
+                _workers("asr"),
+                "语音识别",
+                applies=lambda state: _is_active(state) and state.raw is None and not state.use_source_url,
+            ),
+            Stage(
+                "asr_url",
+                self._stage_asr_url_batch,
+                _workers("asr_url"),
+                "语音识别",
+                applies=lambda state: _is_active(state) and state.raw is None and state.use_source_url,
+                batch_size=max(1, self.settings.dashscope_batch_size),
+                linger=self.settings.dashscope_batch_linger,
+                max_pending=_workers("asr_url_pending"),
+            ),
+            Stage(
+                "summary",
+                self._isolated("summary", self._stage_summary),
+                _workers("summary"),
+                "文本后处理",
+                applies=_is_active,
+            ),
+        ]
+
+    @staticmethod
+    def batch_dir(output_root: Path, batch_name: str) -> Path:
+        date_prefix = datetime.now().strftime("%Y-%m-%d")
+        return output_root / f"{date_prefix}_{batch_name}"
 
     def run(
         self,
@@ -53,23 +468,99 @@ class PipelineRunner:
         cache_dir: Path | None = None,
         on_progress=None,
         platform_hint: str | None = None,
+        concurrent: bool | None = None,
+        stage_workers: dict[str, int] | None = None,
     ) -> tuple[Path, list[TaskResult]]:
-        date_prefix = datetime.now().strftime("%Y-%m-%d")
-        output_dir = output_root / f"{date_prefix}_{batch_name}"
+        results = [
+            result
+            for _, result in self.iter_run(
+                inputs,
+                batch_name,
+                output_root,
+                tmp_root,
+                enable_summary=enable_summary,
+                use_cache=use_cache,
+                cache_dir=cache_dir,
+                on_progress=on_progress,
+                platform_hint=platform_hint,
+                concurrent=concurrent,
+                stage_workers=stage_workers,
+                ordering="input",
+            )
+        ]
+        return self.batch_dir(output_root, batch_name), results
+
+    def iter_run(
+        self,
+        inputs: Iterable[str],
+        batch_name: str,
+        output_root: Path,
+        tmp_root: Path,
+        enable_summary: bool = False,
+        use_cache: bool = True,
+        cache_dir: Path | None = None,
+        on_progress=None,
+        platform_hint: str | None = None,
+        concurrent: bool | None = None,
+        stage_workers: dict[str, int] | None = None,
+        ordering: str = "completion",
+        gates: RunGates | None = None,
+    ) -> Iterator[tuple[int, TaskResult]]:
+        """Yields ``(index, result)`` as items finish; ``ordering="input"`` holds
+        results back until every earlier input has been yielded. ``gates`` shares
+        item and ASR slots fairly with other runs in the same process."""
+        return self.iter_items(
+            list(enumerate(inputs, start=1)),
+            self.batch_dir(output_root, batch_name),
+            tmp_root,
+            cache_dir or (output_root / ".cache"),
+            enable_summary=enable_summary,
+            use_cache=use_cache,
+            on_progress=on_progress,
+            platform_hint=platform_hint,
+            concurrent=concurrent,
+            stage_workers=stage_workers,
+            ordering=ordering,
+            gates=gates,
+        )
+
+    def iter_items(
+        self,
+        entries: list[tuple[int, str]],
+        output_dir: Path,
+        tmp_root: Path,
+        cache_dir: Path,
+        enable_summary: bool = False,
+        use_cache: bool = True,
+        on_progress=None,
+        platform_hint: str | None = None,
+        concurrent: bool | None = None,
+        stage_workers: dict[str, int] | None = None,
+        ordering: str = "completion",
+        gates: RunGates | None = None,
+    ) -> Iterator[tuple[int, TaskResult]]:
+        """Runs ``(index, input)`` entries of the batch in ``output_dir``; workers use it
+        to process a slice of a batch whose other items run elsewhere."""
+        if ordering not in ("completion", "input"):
+            raise ValueError(f"Unsupported ordering: {ordering}")
         ensure_dir(output_dir)
         ensure_dir(tmp_root)
-
-        cache_dir = cache_dir or (output_root / ".cache")
         ensure_dir(cache_dir)
+        cache = TranscriptCache(cache_dir, max_bytes=self.settings.cache_max_bytes)
+        manifest = BatchManifest(output_dir)
 
-        results: list[TaskResult] = []
-        inputs_list = list(inputs)
-        total = len(inputs_list)
+        if concurrent is None:
+            concurrent = self.settings.pipeline_concurrent
+        workers = dict(self.stage_workers)
+        if stage_workers:
+            workers.update(stage_workers)
+
+        total = len(entries)
         print(
             "[pipeline] inputs="
             + str(total)
             + " batch="
-            + batch_name
+            + output_dir.name
             + " platform="
             + str(platform_hint)
             + " asr_mode="
@@ -78,102 +569,155 @@ class PipelineRunner:
             + self.settings.asr_model
             + " audio_asr_model="
             + self.settings.audio_asr_model
+            + " concurrent="
+            + str(concurrent)
+            + " ordering="
+            + ordering
         )
 
-        for idx, value in enumerate(inputs_list, start=1):
-            if on_progress:
-                on_progress(step="parse", current=idx, total=total, message="解析输入")
-            item = self.platform_resolver.resolve(value, platform_hint)
-            use_source_url = (
-                self.settings.asr_mode in ("dashscope-url", "auto")
-                and item.source_url
-                and item.platform == "douyin"
+        states = [
+            _ItemState(
+                index=idx,
+                value=value,
+                platform_hint=platform_hint,
+                output_dir=output_dir,
+                tmp_root=tmp_root,
+                cache=cache,
+                use_cache=use_cache,
+                enable_summary=enable_summary,
+                manifest=manifest,
+                gates=gates,
             )
+            for idx, value in entries
+        ]
+        if on_progress:
+            for state in states:
+                state.on_download = self._download_reporter(state, total, on_progress)
+        resumed = self._resume(states, manifest)
+        if resumed:
+            print("[pipeline] resumed=" + str(resumed) + " from " + manifest.path.name)
+        unique = self._dedup([state for state in states if state.result is None])
+        duplicates = sum(1 for state in states if state.duplicate_of is not None)
+        if duplicates:
             print(
-                "[pipeline] item "
-                + str(idx)
-                + " platform="
-                + item.platform
-                + " use_source_url="
-                + str(use_source_url)
-                + " source_url="
-                + ("yes" if item.source_url else "no")
+                "[pipeline] unique_inputs="
+                + str(len(unique))
+                + " duplicates="
+                + str(duplicates)
+                + " resumed="
+                + str(resumed)
             )
+        stages = self._build_stages(workers)
 
-            if not use_source_url:
-                if on_progress:
-                    on_progress(step="download", current=idx, total=total, message="下载视频")
-                item = self.downloader.download(item, tmp_root)
-                if on_progress:
-                    on_progress(step="audio", current=idx, total=total, message="抽取音频")
-                item = self.audio_extractor.extract(item, tmp_root)
-
-            cache_key = self._cache_key(item)
-            cache_path = cache_dir / f"{cache_key}.json"
-            if use_cache and cache_path.exists():
-                raw = json.loads(cache_path.read_text(encoding="utf-8"))
-                text = raw.get("text", "")
-            else:
-                if on_progress:
-                    on_progress(step="asr", current=idx, total=total, message="语音识别")
-                mode, model, route = self.asr_router.describe_route(item, self.settings, use_source_url)
-                print(
-                    "[pipeline] asr_mode_selected="
-                    + mode
-                    + " model="
-                    + model
-                    + " route="
-                    + route
-                )
-                transcript = self.asr_router.transcribe(item, self.settings, use_source_url)
-                raw = transcript.raw
-                text = transcript.text
-                cache_path.write_text(json.dumps(raw, ensure_ascii=False, indent=2), encoding="utf-8")
-
+        def _before_stage(stage: Stage, batch: list[_ItemState]) -> None:
             if on_progress:
-                on_progress(step="postprocess", current=idx, total=total, message="文本后处理")
-            paragraphs = self.post_processor.process(text)
-            summary = None
-            if enable_summary and text:
-                if on_progress:
-                    on_progress(step="summary", current=idx, total=total, message="生成摘要")
-                summary = self.summarizer.summarize(
-                    text=text,
-                    api_key=self.settings.api_key,
-                    base_url=self.settings.base_url,
-                    model=self.settings.llm_model,
-                )
+                on_progress(step=stage.name, current=batch[-1].index, total=total, message=stage.message)
 
-            raw_out_path = output_dir / f"raw_{idx}.json"
-            raw_out_path.write_text(json.dumps(raw, ensure_ascii=False, indent=2), encoding="utf-8")
+        waiting: dict[int, list[_ItemState]] = {}
+        for state in states:
+            if state.duplicate_of is not None:
+                waiting.setdefault(state.duplicate_of.index, []).append(state)
+        held: dict[int, _ItemState] = {}
+        order = sorted(state.index for state in states)
+        next_pos = 0
 
-            results.append(
-                TaskResult(
-                    item=item,
-                    transcript=Transcript(text="\n".join(paragraphs), raw=raw),
-                    summary=summary,
-                )
-            )
+        def _complete(state: _ItemState) -> Iterator[_ItemState]:
+            if state.duplicate_of is not None and state.duplicate_of.result is None:
+                waiting.setdefault(state.duplicate_of.index, []).append(state)
+                return
+            if state.duplicate_of is not None:
+                self._fan_out(state)
+            yield state
+            for duplicate in waiting.pop(state.index, []):
+                self._fan_out(duplicate)
+                yield duplicate
 
-        return output_dir, results
+        def _release(state: _ItemState) -> Iterator[tuple[int, TaskResult]]:
+            nonlocal next_pos
+            if ordering == "completion":
+                yield state.index, state.result
+                self._drop_payload(state)
+                return
+            held[state.index] = state
+            while next_pos < len(order) and order[next_pos] in held:
+                ready = held.pop(order[next_pos])
+                yield ready.index, ready.result
+                self._drop_payload(ready)
+                next_pos += 1
+
+        pipeline = StagePipeline(stages, on_progress=on_progress)
+        finished = pipeline.iter(unique) if concurrent else pipeline.iter_serial(unique, before_stage=_before_stage)
+        try:
+            for state in states:
+                if state.result is not None and state.duplicate_of is None:
+                    yield from _release(state)
+            for state in finished:
+                for done in _complete(state):
+                    yield from _release(done)
+        finally:
+            finished.close()
+            cache.close()
+
+    def _drop_payload(self, state: _ItemState) -> None:
+        # Late duplicates re-read raw from raw_{idx}.json, so only the light fields stay in memory.
+        state.raw = None
+        state.text = ""
+        if state.result is not None:
+            state.result = replace(state.result, transcript=Transcript(state.result.transcript.text, raw=None))
 
 
 class PipelineFactory:
-    def __init__(self, settings: Settings) -> None:
+    def __init__(self, settings: Settings, http: HttpClient | None = None) -> None:
         self.settings = settings
+        self.http = http
+
+    def _http_client(self) -> HttpClient:
+        if self.http is None:
+            self.http = HttpClient(
+                pool_connections=self.settings.http_pool_size,
+                per_host_limit=self.settings.http_per_host_limit,
+                timeout=self.settings.http_timeout,
+            )
+        return self.http
+
+    def create_resolver(self) -> PlatformResolver:
+        metadata_cache = None
+        if self.settings.metadata_cache_path:
+            metadata_cache = MetadataCache(
+                Path(self.settings.metadata_cache_path),
+                meta_ttl=self.settings.metadata_ttl,
+                source_ttl=self.settings.source_url_ttl,
+            )
+        return PlatformResolver(http=self._http_client(), metadata_cache=metadata_cache)
 
     def create(self) -> PipelineRunner:
-        platform_resolver = PlatformResolver()
+        http = self._http_client()
+        platform_resolver = self.create_resolver()
         asr_router = ASRRouter(
-            dashscope_url_asr=DashScopeUrlASR(self.settings.api_key),
-            qwen_audio_asr=QwenAudioASR(self.settings.api_key),
+            dashscope_url_asr=DashScopeUrlASR(
+                self.settings.api_key,
+                max_files_per_task=self.settings.dashscope_batch_size,
+            ),
+            qwen_audio_asr=QwenAudioASR(
+                self.settings.api_key,
+                max_parallel_parts=self.settings.audio_asr_max_parallel,
+                limits=ProviderLimits(
+                    max_file_bytes=self.settings.audio_asr_max_file_bytes,
+                    max_duration_seconds=self.settings.audio_asr_max_seconds,
+                ),
+                drop_silence=self.settings.audio_drop_silence,
+            ),
             openai_asr=OpenAICompatibleASR(self.settings.api_key, self.settings.base_url),
         )
         return PipelineRunner(
             settings=self.settings,
             platform_resolver=platform_resolver,
             asr_router=asr_router,
-            downloader=VideoDownloader(),
+            downloader=VideoDownloader(
+                http=http,
+                connections=self.settings.download_connections,
+                split_bytes=self.settings.download_split_bytes,
+            ),
             audio_extractor=AudioExtractor(),
             post_processor=TextPostProcessor(),
             summarizer=Summarizer(),
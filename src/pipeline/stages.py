@@ -0,0 +1,295 @@
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Iterator
+
+_SENTINEL = object()
+
+
+@dataclass
+class Stage:
+    name: str
+    handler: Callable[[Any], None]
+    workers: int = 1
+    message: str = ""
+    applies: Callable[[Any], bool] | None = None
+    batch_size: int = 1
+    linger: float = 0.0
+    max_pending: int = 0
+
+    def should_run(self, payload: Any) -> bool:
+        return self.applies is None or self.applies(payload)
+
+    @property
+    def batched(self) -> bool:
+        return self.batch_size > 1
+
+
+class StagePipeline:
+    """Runs payloads through stages, each with its own bounded queue and worker pool.
+
+    Batched stages receive a list of payloads instead of a single payload. A handler
+    may return a Future; the worker then moves on and the payloads are forwarded
+    when the future completes, with at most ``max_pending`` futures outstanding.
+    """
+
+    def __init__(
+        self,
+        stages: list[Stage],
+        on_progress=None,
+        queue_size: int | None = None,
+    ) -> None:
+        if not stages:
+            raise ValueError("StagePipeline requires at least one stage")
+        self.stages = stages
+        self.on_progress = on_progress
+        self.queue_size = queue_size
+        self._lock = threading.Lock()
+        self._abort = threading.Event()
+        self._errors: list[BaseException] = []
+
+    def _emit(self, stage: Stage, counts: dict[str, int], total: int) -> None:
+        if not self.on_progress:
+            return
+        self.on_progress(
+            step=stage.name,
+            current=counts[self.stages[-1].name],
+            total=total,
+            message=stage.message,
+            stage_counts=counts,
+        )
+
+    def iter_serial(self, payloads: Iterable[Any], before_stage=None) -> Iterator[Any]:
+        """Runs payloads one after another in the calling thread, yielding each as it finishes.
+
+        Payloads that reach a batched stage are parked until the batch is full or
+        no more payloads can arrive, then continue through the remaining stages.
+        """
+        items = list(payloads)
+        parked: dict[int, list[Any]] = {}
+        finished: list[Any] = []
+
+        def _wait(outcome: Any) -> None:
+            if isinstance(outcome, Future):
+                outcome.result()
+
+        def _advance(payload: Any, position: int) -> None:
+            for pos in range(position, len(self.stages)):
+                stage = self.stages[pos]
+                if not stage.should_run(payload):
+                    continue
+                if stage.batched:
+                    bucket = parked.setdefault(pos, [])
+                    bucket.append(payload)
+                    if len(bucket) >= stage.batch_size:
+                        _flush(pos)
+                    return
+                if before_stage:
+                    before_stage(stage, [payload])
+                _wait(stage.handler(payload))
+            finished.append(payload)
+
+        def _flush(position: int) -> None:
+            bucket = parked.pop(position, [])
+            if not bucket:
+                return
+            stage = self.stages[position]
+            if before_stage:
+                before_stage(stage, bucket)
+            _wait(stage.handler(bucket))
+            for payload in bucket:
+                _advance(payload, position + 1)
+
+        for payload in items:
+            _advance(payload, 0)
+            while finished:
+                yield finished.pop(0)
+        while parked:
+            _flush(min(parked))
+            while finished:
+                yield finished.pop(0)
+
+    def _collect(self, inbox: queue.Queue, first: Any, stage: Stage) -> tuple[list[Any], bool]:
+        batch = [first]
+        deadline = time.monotonic() + stage.linger
+        while len(batch) < stage.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                payload = inbox.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if payload is _SENTINEL:
+                return batch, True
+            batch.append(payload)
+        return batch, False
+
+    def iter(self, payloads: Iterable[Any]) -> Iterator[Any]:
+        """Runs payloads concurrently, yielding each one as it leaves the last stage."""
+        items = list(payloads)
+        total = len(items)
+        if not items:
+            return
+        finished: queue.Queue = queue.Queue()
+        driver = threading.Thread(
+            target=self._drive,
+            args=(items, total, finished),
+            name="stage-driver",
+            daemon=True,
+        )
+        driver.start()
+        try:
+            while True:
+                payload = finished.get()
+                if payload is _SENTINEL:
+                    break
+                yield payload
+        finally:
+            if driver.is_alive():
+                self._abort.set()
+        driver.join()
+        if self._errors:
+            raise self._errors[0]
+
+    def _drive(self, items: list[Any], total: int, finished: queue.Queue) -> None:
+        try:
+            self._run_threads(items, total, finished)
+        except BaseException as exc:  # noqa: BLE001 - re-raised by iter() on the consumer thread
+            with self._lock:
+                self._errors.append(exc)
+        finally:
+            finished.put(_SENTINEL)
+
+    def _run_threads(self, items: list[Any], total: int, finished: queue.Queue) -> None:
+
+        queues = [
+            queue.Queue(maxsize=self.queue_size or max(2, stage.workers * 2, stage.batch_size))
+            for stage in self.stages
+        ]
+        alive = [max(1, stage.workers) for stage in self.stages]
+        counts = {stage.name: 0 for stage in self.stages}
+        pending = [0 for _ in self.stages]
+        pending_cond = threading.Condition(self._lock)
+        slots = [
+            threading.BoundedSemaphore(stage.max_pending) if stage.max_pending > 0 else None
+            for stage in self.stages
+        ]
+        completions: queue.Queue = queue.Queue()
+
+        def _forward(position: int, payloads_out: list[Any]) -> None:
+            stage = self.stages[position]
+            outbox = queues[position + 1] if position + 1 < len(queues) else None
+            with self._lock:
+                counts[stage.name] += len(payloads_out)
+                snapshot = dict(counts)
+            # Outside the lock: the callback may block on I/O and must not stall pending_cond waiters.
+            self._emit(stage, snapshot, total)
+            for payload in payloads_out:
+                (outbox or finished).put(payload)
+
+        def _fail(exc: BaseException) -> None:
+            with self._lock:
+                self._errors.append(exc)
+            self._abort.set()
+
+        def _forwarder() -> None:
+            while True:
+                entry = completions.get()
+                if entry is _SENTINEL:
+                    return
+                position, batch, future = entry
+                exc = future.exception()
+                if exc is not None:
+                    _fail(exc)
+                elif not self._abort.is_set():
+                    _forward(position, batch)
+                if slots[position] is not None:
+                    slots[position].release()
+                with pending_cond:
+                    pending[position] -= 1
+                    pending_cond.notify_all()
+
+        def _worker(position: int) -> None:
+            stage = self.stages[position]
+            inbox = queues[position]
+            outbox = queues[position + 1] if position + 1 < len(queues) else None
+            finished = False
+            while not finished:
+                payload = inbox.get()
+                if payload is _SENTINEL:
+                    break
+                if self._abort.is_set():
+                    continue
+                if not stage.should_run(payload):
+                    _forward(position, [payload])
+                    continue
+                batch = [payload]
+                if stage.batched:
+                    batch, finished = self._collect(inbox, payload, stage)
+                    skipped = [p for p in batch if not stage.should_run(p)]
+                    batch = [p for p in batch if stage.should_run(p)]
+                    if skipped:
+                        _forward(position, skipped)
+                if not batch:
+                    continue
+                if slots[position] is not None:
+                    slots[position].acquire()
+                try:
+                    outcome = stage.handler(batch if stage.batched else batch[0])
+                except BaseException as exc:  # noqa: BLE001 - aborts the run; iter() re-raises it
+                    if slots[position] is not None:
+                        slots[position].release()
+                    _fail(exc)
+                    continue
+                if isinstance(outcome, Future):
+                    with pending_cond:
+                        pending[position] += 1
+                    outcome.add_done_callback(
+                        lambda future, batch=batch: completions.put((position, batch, future))
+                    )
+                    continue
+                if slots[position] is not None:
+                    slots[position].release()
+                _forward(position, batch)
+
+            with pending_cond:
+                alive[position] -= 1
+                last = alive[position] == 0
+                if last:
+                    while pending[position] > 0:
+                        pending_cond.wait()
+            if last and outbox is not None:
+                for _ in range(max(1, self.stages[position + 1].workers)):
+                    outbox.put(_SENTINEL)
+
+        forwarder = threading.Thread(target=_forwarder, name="stage-forwarder", daemon=True)
+        forwarder.start()
+
+        threads: list[threading.Thread] = []
+        for position, stage in enumerate(self.stages):
+            for worker_idx in range(alive[position]):
+                thread = threading.Thread(
+                    target=_worker,
+                    args=(position,),
+                    name=f"stage-{stage.name}-{worker_idx}",
+                    daemon=True,
+                )
+                thread.start()
+                threads.append(thread)
+
+        for payload in items:
+            if self._abort.is_set():
+                break
+            queues[0].put(payload)
+        for _ in range(alive[0]):
+            queues[0].put(_SENTINEL)
+
+        for thread in threads:
+            thread.join()
+        completions.put(_SENTINEL)
+        forwarder.join()
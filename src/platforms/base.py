@@ -15,3 +15,9 @@ class BasePlatform(ABC):
     @abstractmethod
     def parse(self, value: str) -> VideoItem:
         raise NotImplementedError
+
+    def canonical_id(self, value: str) -> str | None:
+        return None
+
+    def alias_key(self, value: str) -> str:
+        return value.strip()
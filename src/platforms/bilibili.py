@@ -5,6 +5,7 @@ import requests
 
 from .base import BasePlatform
 from ..pipeline.models import VideoItem
+from ..utils.http import HttpClient, default_http_client
 
 
 BILIBILI_HEADERS = {
@@ -15,33 +16,84 @@ BILIBILI_HEADERS = {
     ),
     "Referer": "https://www.bilibili.com/",
 }
+DASH_FNVAL = 16
 
 
-def _resolve_bilibili_url(value: str) -> str:
+def _resolve_bilibili_url(http: HttpClient, value: str) -> str:
     if value.startswith("http://") or value.startswith("https://"):
-        resp = requests.get(value, headers=BILIBILI_HEADERS, timeout=20, allow_redirects=True)
+        resp = http.get(value, headers=BILIBILI_HEADERS, timeout=20, allow_redirects=True)
         resp.raise_for_status()
         return resp.url
     return value
 
 
+def _request_playurl(http: HttpClient, bvid: str, cid: int, fnval: int) -> dict:
+    play_api = (
+        "https://api.bilibili.com/x/player/playurl"
+        f"?bvid={bvid}&cid={cid}&qn=64&fnval={fnval}"
+    )
+    play_resp = http.get(play_api, headers=BILIBILI_HEADERS, timeout=20)
+    play_resp.raise_for_status()
+    play_json = play_resp.json()
+    if play_json.get("code") != 0:
+        raise ValueError(f"Bilibili play API error: {play_json.get('message')}")
+    return play_json.get("data") or {}
+
+
+def _select_dash_audio(data: dict) -> str | None:
+    dash = data.get("dash") or {}
+    streams = [s for s in (dash.get("audio") or []) if isinstance(s, dict)]
+    streams = [s for s in streams if s.get("baseUrl") or s.get("base_url")]
+    if not streams:
+        return None
+    # ASR resamples to 16 kHz mono, so the smallest audio-only stream is enough.
+    stream = min(streams, key=lambda s: s.get("bandwidth") or 0)
+    return stream.get("baseUrl") or stream.get("base_url")
+
+
+def _fetch_media_url(http: HttpClient, bvid: str, cid: int) -> tuple[str, bool]:
+    try:
+        audio_url = _select_dash_audio(_request_playurl(http, bvid, cid, fnval=DASH_FNVAL))
+    except (ValueError, requests.RequestException) as exc:
+        print(f"[bilibili] DASH manifest unavailable for {bvid}: {exc}")
+        audio_url = None
+    if audio_url:
+        return audio_url, True
+
+    durl = _request_playurl(http, bvid, cid, fnval=1).get("durl") or []
+    if not durl:
+        raise ValueError("No playable URL from Bilibili API")
+
+    video_url = durl[0].get("url")
+    if not video_url:
+        raise ValueError("Missing video URL in Bilibili response")
+    return video_url, False
+
+
 class BilibiliPlatform(BasePlatform):
     name = "bilibili"
 
+    def __init__(self, http: HttpClient | None = None) -> None:
+        self.http = http or default_http_client()
+
     def matches(self, value: str, platform_hint: str | None = None) -> bool:
         if platform_hint and platform_hint.lower() == "bilibili":
             return True
         return "bilibili.com" in value or "b23.tv" in value
 
+    def canonical_id(self, value: str) -> str | None:
+        match = re.search(r"BV[0-9A-Za-z]{10}", value)
+        return match.group(0) if match else None
+
     def parse(self, value: str) -> VideoItem:
-        url = _resolve_bilibili_url(value)
+        url = _resolve_bilibili_url(self.http, value)
         match = re.search(r"BV[0-9A-Za-z]+", url)
         if not match:
             raise ValueError("Failed to parse Bilibili BV id from input")
         bvid = match.group(0)
 
         view_api = f"https://api.bilibili.com/x/web-interface/view?bvid={bvid}"
-        view_resp = requests.get(view_api, headers=BILIBILI_HEADERS, timeout=20)
+        view_resp = self.http.get(view_api, headers=BILIBILI_HEADERS, timeout=20)
         view_resp.raise_for_status()
         view_json = view_resp.json()
         if view_json.get("code") != 0:
@@ -55,28 +107,12 @@ class BilibiliPlatform(BasePlatform):
         if not cid:
             raise ValueError("Missing cid in Bilibili view data")
 
-        play_api = (
-            "https://api.bilibili.com/x/player/playurl"
-            f"?bvid={bvid}&cid={cid}&qn=64&fnval=1"
-        )
-        play_resp = requests.get(play_api, headers=BILIBILI_HEADERS, timeout=20)
-        play_resp.raise_for_status()
-        play_json = play_resp.json()
-        if play_json.get("code") != 0:
-            raise ValueError(f"Bilibili play API error: {play_json.get('message')}")
-
-        durl = (play_json.get("data") or {}).get("durl") or []
-        if not durl:
-            raise ValueError("No playable URL from Bilibili API")
-
-        video_url = durl[0].get("url")
-        if not video_url:
-            raise ValueError("Missing video URL in Bilibili response")
+        media_url, audio_only = _fetch_media_url(self.http, bvid, cid)
 
         return VideoItem(
             input_value=value,
             title=title,
-            source_url=video_url,
+            source_url=media_url,
             video_id=bvid,
             local_video_path=None,
             local_audio_path=None,
@@ -84,4 +120,5 @@ class BilibiliPlatform(BasePlatform):
             duration_ms=duration * 1000 if isinstance(duration, int) else None,
             platform="bilibili",
             download_headers=BILIBILI_HEADERS,
+            audio_only=audio_only,
         )
@@ -4,10 +4,9 @@ import json
 import re
 from typing import Optional
 
-import requests
-
 from .base import BasePlatform
 from ..pipeline.models import VideoItem
+from ..utils.http import HttpClient, default_http_client
 
 
 HEADERS = {
@@ -19,6 +18,11 @@ HEADERS = {
 }
 
 
+_CANONICAL_ID_PATTERN = re.compile(
+    r"(?:douyin\.com/(?:video|note)/|iesdouyin\.com/share/(?:video|note)/|modal_id=)(\d+)"
+)
+
+
 def _extract_first_url(text: str) -> Optional[str]:
     urls = re.findall(
         r"http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\(\),]|"
@@ -31,22 +35,34 @@ def _extract_first_url(text: str) -> Optional[str]:
 class DouyinPlatform(BasePlatform):
     name = "douyin"
 
+    def __init__(self, http: HttpClient | None = None) -> None:
+        self.http = http or default_http_client()
+
     def matches(self, value: str, platform_hint: str | None = None) -> bool:
         if platform_hint and platform_hint.lower() == "douyin":
             return True
         return "douyin.com" in value or "v.douyin.com" in value
 
+    def canonical_id(self, value: str) -> str | None:
+        match = _CANONICAL_ID_PATTERN.search(value)
+        return match.group(1) if match else None
+
+    def alias_key(self, value: str) -> str:
+        return _extract_first_url(value) or value.strip()
+
     def parse(self, value: str) -> VideoItem:
         share_url = _extract_first_url(value)
         if not share_url:
             raise ValueError("No valid share link found in input")
 
-        share_response = requests.get(share_url, headers=HEADERS, timeout=20)
-        share_response.raise_for_status()
-        video_id = share_response.url.split("?")[0].strip("/").split("/")[-1]
+        video_id = self.canonical_id(value)
+        if not video_id:
+            share_response = self.http.get(share_url, headers=HEADERS, timeout=20)
+            share_response.raise_for_status()
+            video_id = share_response.url.split("?")[0].strip("/").split("/")[-1]
         share_url = f"https://www.iesdouyin.com/share/video/{video_id}"
 
-        response = requests.get(share_url, headers=HEADERS, timeout=20)
+        response = self.http.get(share_url, headers=HEADERS, timeout=20)
         response.raise_for_status()
 
         pattern = re.compile(r"window\._ROUTER_DATA\s*=\s*(.*?)</script>", re.DOTALL)
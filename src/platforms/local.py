@@ -4,6 +4,7 @@ from pathlib import Path
 
 from .base import BasePlatform
 from ..pipeline.models import VideoItem
+from ..utils.file import read_hash_sidecar
 
 
 class LocalPlatform(BasePlatform):
@@ -25,4 +26,5 @@ class LocalPlatform(BasePlatform):
             publish_timestamp=None,
             duration_ms=None,
             platform="local",
+            content_hash=read_hash_sidecar(path),
         )
@@ -1,24 +1,136 @@
 from __future__ import annotations
 
-from typing import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Iterable, Optional
+import threading
 
 from .base import BasePlatform
 from .douyin import DouyinPlatform
 from .bilibili import BilibiliPlatform
 from .local import LocalPlatform
 from ..pipeline.models import VideoItem
+from ..utils.http import HttpClient
+from ..cache.metadata import MetadataCache
+
+
+DEFAULT_PLATFORM_LIMITS = {
+    "local": 8,
+    "bilibili": 4,
+    "douyin": 4,
+}
+
+
+@dataclass
+class ResolveResult:
+    input_value: str
+    item: Optional[VideoItem] = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.item is not None
 
 
 class PlatformResolver:
-    def __init__(self, platforms: Iterable[BasePlatform] | None = None) -> None:
+    def __init__(
+        self,
+        platforms: Iterable[BasePlatform] | None = None,
+        http: HttpClient | None = None,
+        platform_limits: dict[str, int] | None = None,
+        metadata_cache: MetadataCache | None = None,
+    ) -> None:
+        self.metadata_cache = metadata_cache
         self.platforms = list(platforms) if platforms else [
             LocalPlatform(),
-            BilibiliPlatform(),
-            DouyinPlatform(),
+            BilibiliPlatform(http=http),
+            DouyinPlatform(http=http),
         ]
 
-    def resolve(self, value: str, platform_hint: str | None = None) -> VideoItem:
+        limits = dict(DEFAULT_PLATFORM_LIMITS)
+        limits.update(platform_limits or {})
+        self.platform_limits = {
+            platform.name: max(1, limits.get(platform.name, 4)) for platform in self.platforms
+        }
+        self._semaphores = {
+            name: threading.BoundedSemaphore(limit) for name, limit in self.platform_limits.items()
+        }
+
+    def _match(self, value: str, platform_hint: str | None = None) -> BasePlatform:
         for platform in self.platforms:
             if platform.matches(value, platform_hint):
-                return platform.parse(value)
+                return platform
         raise ValueError("Unsupported input for platform resolution")
+
+    def _platform_named(self, name: str) -> BasePlatform:
+        for platform in self.platforms:
+            if platform.name == name:
+                return platform
+        raise ValueError(f"Unknown platform: {name}")
+
+    def _known_id(self, platform: BasePlatform, value: str) -> str | None:
+        video_id = platform.canonical_id(value)
+        if video_id is None and self.metadata_cache is not None:
+            found = self.metadata_cache.lookup_alias(platform.alias_key(value))
+            if found and found[0] == platform.name:
+                video_id = found[1]
+        return video_id
+
+    def canonical_key(self, value: str, platform_hint: str | None = None) -> tuple[str, str] | None:
+        """(platform, video_id) derived without network access, or None if a redirect is needed."""
+        try:
+            platform = self._match(value, platform_hint)
+        except ValueError:
+            return None
+        video_id = self._known_id(platform, value)
+        return (platform.name, video_id) if video_id else None
+
+    def _parse(self, platform: BasePlatform, value: str) -> VideoItem:
+        if self.metadata_cache is None or platform.name == "local":
+            return platform.parse(value)
+        alias = platform.alias_key(value)
+        video_id = self._known_id(platform, value)
+        if video_id:
+            cached = self.metadata_cache.get(platform.name, video_id)
+            if cached is not None:
+                return cached.to_item(value)
+        item = platform.parse(value)
+        self.metadata_cache.put(item, aliases=[alias])
+        return item
+
+    def resolve(self, value: str, platform_hint: str | None = None) -> VideoItem:
+        return self._parse(self._match(value, platform_hint), value)
+
+    def refresh_source(self, item: VideoItem) -> VideoItem:
+        platform = self._platform_named(item.platform)
+        fresh = platform.parse(item.input_value)
+        if self.metadata_cache is not None:
+            self.metadata_cache.put(fresh, aliases=[platform.alias_key(item.input_value)])
+        item.source_url = fresh.source_url
+        item.download_headers = fresh.download_headers
+        item.audio_only = fresh.audio_only
+        return item
+
+    def _resolve_limited(self, value: str, platform_hint: str | None) -> ResolveResult:
+        try:
+            platform = self._match(value, platform_hint)
+            with self._semaphores[platform.name]:
+                return ResolveResult(input_value=value, item=self._parse(platform, value))
+        except Exception as exc:  # noqa: BLE001 - reported per input in ResolveResult
+            return ResolveResult(input_value=value, error=exc)
+
+    def resolve_many(
+        self,
+        values: Iterable[str],
+        platform_hint: str | None = None,
+        max_workers: int | None = None,
+    ) -> list[ResolveResult]:
+        values_list = list(values)
+        if not values_list:
+            return []
+        workers = max_workers or sum(self.platform_limits.values())
+        with ThreadPoolExecutor(
+            max_workers=max(1, min(workers, len(values_list))),
+            thread_name_prefix="resolve",
+        ) as pool:
+            return list(pool.map(lambda value: self._resolve_limited(value, platform_hint), values_list))
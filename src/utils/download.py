@@ -0,0 +1,298 @@
+from __future__ import annotations
+
+import json
+import queue
+import re
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+import requests
+
+from .http import HttpClient
+
+MIN_CHUNK_BYTES = 64 * 1024
+MAX_CHUNK_BYTES = 4 * 1024 * 1024
+MIN_PART_BYTES = 2 * 1024 * 1024
+CHUNK_WINDOW_SECONDS = 0.25
+
+ProgressCallback = Callable[[int, int, float], None]
+
+
+@dataclass
+class RemoteFile:
+    url: str
+    size: int | None
+    accept_ranges: bool
+    validator: str | None
+
+
+def _adapt_chunk(bytes_per_second: float) -> int:
+    target = int(bytes_per_second * CHUNK_WINDOW_SECONDS)
+    target = max(MIN_CHUNK_BYTES, min(MAX_CHUNK_BYTES, target))
+    return 1 << (target.bit_length() - 1)
+
+
+class _Progress:
+    def __init__(self, total: int, done: int, callback: ProgressCallback | None, interval: float) -> None:
+        self.total = total
+        self.done = done
+        self.callback = callback
+        self.interval = interval
+        self._resumed = done
+        self._started = time.monotonic()
+        self._last = 0.0
+        self._lock = threading.Lock()
+
+    def add(self, count: int, force: bool = False) -> None:
+        with self._lock:
+            self.done += count
+            now = time.monotonic()
+            if not self.callback or (not force and now - self._last < self.interval):
+                return
+            self._last = now
+            done = self.done
+            rate = (done - self._resumed) / max(now - self._started, 1e-6)
+        self.callback(done, self.total, rate)
+
+
+class RangedDownloader:
+    """Downloads a URL into ``path`` using parallel HTTP Range requests.
+
+    Bytes go to a preallocated ``<name>.part`` file; a ``<name>.part.json``
+    sidecar records how much of each part is on disk so an interrupted download
+    resumes where it stopped, in this process or the next one.
+    """
+
+    def __init__(
+        self,
+        http: HttpClient,
+        connections: int = 4,
+        split_bytes: int = 8 * 1024 * 1024,
+        max_retries: int = 3,
+        progress_interval: float = 0.5,
+    ) -> None:
+        self.http = http
+        self.connections = max(1, connections)
+        self.split_bytes = split_bytes
+        self.max_retries = max_retries
+        self.progress_interval = progress_interval
+
+    def probe(self, url: str, headers: dict) -> RemoteFile:
+        size: int | None = None
+        accept_ranges = False
+        validator: str | None = None
+        try:
+            response = self.http.head(url, headers=headers, allow_redirects=True)
+            if response.ok:
+                url = response.url
+                size = int(response.headers.get("Content-Length") or 0) or None
+                accept_ranges = response.headers.get("Accept-Ranges", "").lower() == "bytes"
+                validator = response.headers.get("ETag") or response.headers.get("Last-Modified")
+        except requests.RequestException:
+            pass
+        if size is not None and accept_ranges:
+            return RemoteFile(url, size, accept_ranges, validator)
+
+        # Some CDNs reject HEAD or omit Accept-Ranges there; ask for a single byte instead.
+        with self.http.get(url, headers={**headers, "Range": "bytes=0-0"}, stream=True) as response:
+            response.raise_for_status()
+            url = response.url
+            validator = validator or response.headers.get("ETag") or response.headers.get("Last-Modified")
+            match = re.search(r"/(\d+)$", response.headers.get("Content-Range", ""))
+            if response.status_code == 206 and match:
+                return RemoteFile(url, int(match.group(1)), True, validator)
+            length = int(response.headers.get("Content-Length") or 0) or None
+            return RemoteFile(url, length, False, validator)
+
+    def fetch(
+        self,
+        url: str,
+        path: Path,
+        headers: dict | None = None,
+        on_progress: ProgressCallback | None = None,
+    ) -> Path:
+        headers = dict(headers or {})
+        remote = self.probe(url, headers)
+        if remote.size and path.exists() and path.stat().st_size == remote.size:
+            return path
+
+        part_path = path.with_name(path.name + ".part")
+        state_path = path.with_name(path.name + ".part.json")
+        if remote.size and remote.accept_ranges and remote.size >= self.split_bytes and self.connections > 1:
+            self._fetch_ranges(remote, part_path, state_path, headers, on_progress)
+        else:
+            self._fetch_single(remote, part_path, state_path, headers, on_progress)
+        part_path.replace(path)
+        state_path.unlink(missing_ok=True)
+        return path
+
+    def _load_state(self, state_path: Path, part_path: Path, remote: RemoteFile) -> dict | None:
+        if not state_path.exists() or not part_path.exists():
+            return None
+        try:
+            state = json.loads(state_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if state.get("size") != remote.size or state.get("validator") != remote.validator:
+            return None
+        return state
+
+    def _save_state(self, state_path: Path, state: dict) -> None:
+        tmp_path = state_path.with_name(state_path.name + ".tmp")
+        tmp_path.write_text(json.dumps(state), encoding="utf-8")
+        tmp_path.replace(state_path)
+
+    def _fetch_single(
+        self,
+        remote: RemoteFile,
+        part_path: Path,
+        state_path: Path,
+        headers: dict,
+        on_progress: ProgressCallback | None,
+    ) -> None:
+        state = self._load_state(state_path, part_path, remote) if remote.accept_ranges else None
+        if state is None:
+            part_path.write_bytes(b"")
+            self._save_state(state_path, {"size": remote.size, "validator": remote.validator})
+        progress = _Progress(remote.size or 0, part_path.stat().st_size, on_progress, self.progress_interval)
+        chunk_size = MIN_CHUNK_BYTES
+
+        for attempt in range(self.max_retries + 1):
+            offset = part_path.stat().st_size
+            request_headers = dict(headers)
+            if offset and remote.accept_ranges:
+                request_headers["Range"] = f"bytes={offset}-"
+            elif offset:
+                part_path.write_bytes(b"")
+                progress.add(-offset)
+                offset = 0
+            started, received = time.monotonic(), 0
+            try:
+                with self.http.get(remote.url, headers=request_headers, stream=True) as response:
+                    response.raise_for_status()
+                    if offset and response.status_code != 206:
+                        raise RuntimeError("Server ignored Range request while resuming")
+                    with open(part_path, "ab") as f:
+                        for chunk in response.iter_content(chunk_size=chunk_size):
+                            if chunk:
+                                f.write(chunk)
+                                received += len(chunk)
+                                progress.add(len(chunk))
+                progress.add(0, force=True)
+                return
+            except (requests.RequestException, RuntimeError):
+                if attempt >= self.max_retries:
+                    raise
+                chunk_size = _adapt_chunk(received / max(time.monotonic() - started, 1e-6))
+                time.sleep(2 ** attempt)
+
+    def _fetch_ranges(
+        self,
+        remote: RemoteFile,
+        part_path: Path,
+        state_path: Path,
+        headers: dict,
+        on_progress: ProgressCallback | None,
+    ) -> None:
+        size = remote.size
+        state = self._load_state(state_path, part_path, remote)
+        if state is None or part_path.stat().st_size != size:
+            part_bytes = max(MIN_PART_BYTES, -(-size // (self.connections * 4)))
+            state = {
+                "size": size,
+                "validator": remote.validator,
+                "part_bytes": part_bytes,
+                "parts": {str(start): 0 for start in range(0, size, part_bytes)},
+            }
+            with open(part_path, "wb") as f:
+                f.truncate(size)
+            self._save_state(state_path, state)
+        part_bytes = state["part_bytes"]
+        written: dict[int, int] = {int(start): count for start, count in state["parts"].items()}
+        # Only bytes that left the file buffer are checkpointed; a killed process resumes from these.
+        flushed = dict(written)
+
+        todo: queue.Queue = queue.Queue()
+        for start, count in sorted(written.items()):
+            if count < min(part_bytes, size - start):
+                todo.put(start)
+        progress = _Progress(size, sum(written.values()), on_progress, self.progress_interval)
+        lock = threading.Lock()
+        abort = threading.Event()
+        errors: list[BaseException] = []
+
+        def _checkpoint() -> None:
+            with lock:
+                state["parts"] = {str(start): count for start, count in flushed.items()}
+                self._save_state(state_path, state)
+
+        def _fetch_part(f, start: int, chunk_size: int) -> int:
+            end = min(size, start + part_bytes)
+            for attempt in range(self.max_retries + 1):
+                offset = start + written[start]
+                if offset >= end:
+                    return chunk_size
+                started, received = time.monotonic(), 0
+                try:
+                    request_headers = {**headers, "Range": f"bytes={offset}-{end - 1}"}
+                    with self.http.get(remote.url, headers=request_headers, stream=True) as response:
+                        response.raise_for_status()
+                        if response.status_code != 206:
+                            raise RuntimeError("Server ignored Range request")
+                        f.seek(offset)
+                        for chunk in response.iter_content(chunk_size=chunk_size):
+                            if abort.is_set():
+                                return chunk_size
+                            chunk = chunk[: end - offset]
+                            if not chunk:
+                                continue
+                            f.write(chunk)
+                            offset += len(chunk)
+                            received += len(chunk)
+                            written[start] += len(chunk)
+                            progress.add(len(chunk))
+                    f.flush()
+                    flushed[start] = written[start]
+                    chunk_size = _adapt_chunk(received / max(time.monotonic() - started, 1e-6))
+                    if offset < end:
+                        raise RuntimeError("Range response ended early")
+                    return chunk_size
+                except (requests.RequestException, RuntimeError):
+                    f.flush()
+                    flushed[start] = written[start]
+                    _checkpoint()
+                    if attempt >= self.max_retries:
+                        raise
+                    time.sleep(2 ** attempt)
+            return chunk_size
+
+        def _worker() -> None:
+            chunk_size = MIN_CHUNK_BYTES
+            with open(part_path, "r+b") as f:
+                while not abort.is_set():
+                    try:
+                        start = todo.get_nowait()
+                    except queue.Empty:
+                        return
+                    try:
+                        chunk_size = _fetch_part(f, start, chunk_size)
+                    except BaseException as exc:  # noqa: BLE001 - re-raised after the join
+                        errors.append(exc)
+                        abort.set()
+                        return
+                    _checkpoint()
+
+        threads = [
+            threading.Thread(target=_worker, name=f"download-{idx}", daemon=True)
+            for idx in range(min(self.connections, todo.qsize()))
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        if errors:
+            raise errors[0]
+        progress.add(0, force=True)
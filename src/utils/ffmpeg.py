@@ -1,5 +1,8 @@
 from pathlib import Path
+from typing import Iterable
 import shutil
+import threading
+import wave
 import ffmpeg
 
 
@@ -26,6 +29,44 @@ def extract_audio(video_path: Path, audio_path: Path) -> Path:
     return audio_path
 
 
+def extract_audio_stream(chunks: Iterable[bytes], audio_path: Path) -> Path:
+    _ensure_ffmpeg()
+    process = (
+        ffmpeg
+        .input("pipe:0")
+        .output(
+            str(audio_path),
+            ac=1,
+            ar=16000,
+            acodec="pcm_s16le",
+        )
+        .global_args("-loglevel", "error")
+        .run_async(pipe_stdin=True, pipe_stderr=True, overwrite_output=True)
+    )
+    stderr_parts: list[bytes] = []
+    drain = threading.Thread(target=lambda: stderr_parts.append(process.stderr.read()), daemon=True)
+    drain.start()
+    try:
+        for chunk in chunks:
+            if chunk:
+                process.stdin.write(chunk)
+    except BrokenPipeError:
+        pass
+    except BaseException:
+        process.kill()
+        raise
+    finally:
+        try:
+            process.stdin.close()
+        except BrokenPipeError:
+            pass
+        process.wait()
+        drain.join()
+    if process.returncode != 0:
+        raise ffmpeg.Error("ffmpeg", None, b"".join(stderr_parts))
+    return audio_path
+
+
 def split_audio(audio_path: Path, output_dir: Path, segment_seconds: int = 600) -> list[Path]:
     _ensure_ffmpeg()
     output_dir.mkdir(parents=True, exist_ok=True)
@@ -43,3 +84,24 @@ def split_audio(audio_path: Path, output_dir: Path, segment_seconds: int = 600)
         .run(capture_stdout=True, capture_stderr=True, overwrite_output=True)
     )
     return sorted(output_dir.glob(f"{audio_path.stem}_part_*.wav"))
+
+
+def wav_duration_ms(audio_path: Path) -> int:
+    with wave.open(str(audio_path), "rb") as wav:
+        frames = wav.getnframes()
+        rate = wav.getframerate() or 1
+    return int(frames * 1000 / rate)
+
+
+def probe_duration_ms(audio_path: Path) -> int | None:
+    try:
+        return wav_duration_ms(audio_path)
+    except (wave.Error, EOFError):
+        pass
+    _ensure_ffmpeg()
+    try:
+        info = ffmpeg.probe(str(audio_path))
+    except ffmpeg.Error:
+        return None
+    duration = (info.get("format") or {}).get("duration")
+    return int(float(duration) * 1000) if duration else None
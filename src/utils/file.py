@@ -1,7 +1,12 @@
+from __future__ import annotations
+
 import hashlib
 from pathlib import Path
 
 
+HASH_SIDECAR_SUFFIX = ".sha256"
+
+
 def ensure_dir(path: Path) -> None:
     path.mkdir(parents=True, exist_ok=True)
 
@@ -14,5 +19,25 @@ def hash_file(path: Path) -> str:
     return hasher.hexdigest()
 
 
+def hash_sidecar(path: Path) -> Path:
+    return path.with_name(path.name + HASH_SIDECAR_SUFFIX)
+
+
+def write_hash_sidecar(path: Path, digest: str) -> None:
+    hash_sidecar(path).write_text(digest, encoding="utf-8")
+
+
+def read_hash_sidecar(path: Path) -> str | None:
+    """SHA-256 recorded next to ``path``; ignored once the file is newer than the record."""
+    sidecar = hash_sidecar(path)
+    try:
+        if sidecar.stat().st_mtime < path.stat().st_mtime:
+            return None
+        digest = sidecar.read_text(encoding="utf-8").strip()
+    except OSError:
+        return None
+    return digest or None
+
+
 def sanitize_filename(name: str) -> str:
     return "".join(ch if ch not in '\\/:*?"<>|' else "_" for ch in name).strip()
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import threading
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class HttpClient:
+    """Keep-alive ``requests`` sessions shared per host.
+
+    Each host gets its own session whose connection pool blocks at
+    ``per_host_limit`` connections, so concurrent callers queue for a socket
+    instead of opening new TCP/TLS connections.
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = 16,
+        per_host_limit: int = 8,
+        timeout: float = 20.0,
+        host_limits: dict[str, int] | None = None,
+        host_timeouts: dict[str, float] | None = None,
+    ) -> None:
+        self.pool_connections = pool_connections
+        self.per_host_limit = per_host_limit
+        self.timeout = timeout
+        self.host_limits = dict(host_limits or {})
+        self.host_timeouts = dict(host_timeouts or {})
+        self._sessions: dict[str, requests.Session] = {}
+        self._lock = threading.Lock()
+
+    def _session(self, host: str) -> requests.Session:
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                adapter = HTTPAdapter(
+                    pool_connections=self.pool_connections,
+                    pool_maxsize=self.host_limits.get(host, self.per_host_limit),
+                    pool_block=True,
+                )
+                session = requests.Session()
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._sessions[host] = session
+            return session
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        host = urlsplit(url).netloc.lower()
+        kwargs.setdefault("timeout", self.host_timeouts.get(host, self.timeout))
+        return self._session(host).request(method, url, **kwargs)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def head(self, url: str, **kwargs) -> requests.Response:
+        return self.request("HEAD", url, **kwargs)
+
+    def close(self) -> None:
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
+
+
+_DEFAULT_CLIENT: HttpClient | None = None
+_DEFAULT_LOCK = threading.Lock()
+
+
+def default_http_client() -> HttpClient:
+    global _DEFAULT_CLIENT
+    with _DEFAULT_LOCK:
+        if _DEFAULT_CLIENT is None:
+            _DEFAULT_CLIENT = HttpClient()
+        return _DEFAULT_CLIENT
@@ -1,3 +1,4 @@
+from dataclasses import dataclass
 import time
 from typing import Callable, TypeVar
 
@@ -16,3 +17,26 @@ def with_retry(func: Callable[[], T], retries: int = 3, base_delay: float = 1.0)
     if last_error:
         raise last_error
     raise RuntimeError("Retry failed without exception")
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    attempts: int = 3
+    base_delay: float = 2.0
+    max_delay: float = 30.0
+
+    def delay(self, attempt: int) -> float:
+        return min(self.max_delay, self.base_delay * (2 ** attempt))
+
+    def call(self, func: Callable[[], T], on_retry: Callable[[int, Exception], None] | None = None) -> T:
+        attempts = max(1, self.attempts)
+        for attempt in range(attempts):
+            try:
+                return func()
+            except Exception as exc:
+                if attempt + 1 >= attempts:
+                    raise
+                if on_retry:
+                    on_retry(attempt + 1, exc)
+                time.sleep(self.delay(attempt))
+        raise RuntimeError("Retry failed without exception")
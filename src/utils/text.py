@@ -11,3 +11,12 @@ def split_paragraphs(text: str) -> list[str]:
         return []
     parts = re.split(r"(?<=[。！？.!?])\s*", text)
     return [p.strip() for p in parts if p.strip()]
+
+
+def format_duration(duration_ms: int | None) -> str:
+    if not duration_ms:
+        return ""
+    total_seconds = int(duration_ms if duration_ms < 1000 else duration_ms / 1000)
+    minutes = total_seconds // 60
+    seconds = total_seconds % 60
+    return f"{minutes:02}:{seconds:02}"
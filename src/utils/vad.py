@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import struct
+import wave
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+
+FRAME_MS = 30
+BLOCK_FRAMES = 65536
+
+
+@dataclass
+class AudioSegment:
+    path: Path
+    offset_ms: int
+    duration_ms: int
+    # (position in this file, milliseconds of source audio cut out there), in file order.
+    gaps: list[tuple[int, int]] = field(default_factory=list)
+
+    def source_ms(self, position_ms: int) -> int:
+        """Maps a time inside the segment file back to the source audio."""
+        shifted = self.offset_ms + position_ms
+        for at_ms, removed_ms in self.gaps:
+            if at_ms >= position_ms:
+                break
+            shifted += removed_ms
+        return shifted
+
+
+def _pcm16_layout(audio_path: Path) -> tuple[int, int, int]:
+    with audio_path.open("rb") as f:
+        riff = f.read(12)
+        if len(riff) < 12 or riff[:4] != b"RIFF" or riff[8:12] != b"WAVE":
+            raise ValueError(f"Not a RIFF/WAVE file: {audio_path}")
+        channels = rate = bits = None
+        while True:
+            header = f.read(8)
+            if len(header) < 8:
+                raise ValueError(f"Missing data chunk in {audio_path}")
+            chunk_id, size = struct.unpack("<4sI", header)
+            if chunk_id == b"fmt ":
+                fmt = f.read(size)
+                audio_format, channels, rate = struct.unpack("<HHI", fmt[:8])
+                bits = struct.unpack("<H", fmt[14:16])[0]
+                if audio_format != 1:
+                    raise ValueError("Only PCM WAV input is supported")
+                if size % 2:
+                    f.seek(1, 1)
+                continue
+            if chunk_id == b"data":
+                if channels != 1 or bits != 16 or not rate:
+                    raise ValueError("Expected 16-bit mono PCM WAV")
+                return f.tell(), size // 2, rate
+            f.seek(size + (size % 2), 1)
+
+
+def _frame_levels_db(samples: np.ndarray, frame_len: int) -> np.ndarray:
+    n_frames = len(samples) // frame_len
+    levels = np.empty(n_frames, dtype=np.float32)
+    for start in range(0, n_frames, BLOCK_FRAMES):
+        stop = min(n_frames, start + BLOCK_FRAMES)
+        block = samples[start * frame_len:stop * frame_len].astype(np.float32)
+        block = block.reshape(stop - start, frame_len)
+        rms = np.sqrt(np.mean(block * block, axis=1)) / 32768.0
+        levels[start:stop] = 20.0 * np.log10(np.maximum(rms, 1e-6))
+    return levels
+
+
+def _silent_runs(silent: np.ndarray) -> np.ndarray:
+    padded = np.concatenate(([False], silent, [False])).astype(np.int8)
+    edges = np.flatnonzero(np.diff(padded))
+    return edges.reshape(-1, 2)
+
+
+def _write_wav(path: Path, pieces: list[np.ndarray], rate: int) -> None:
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        for samples in pieces:
+            wav.writeframes(np.ascontiguousarray(samples, dtype="<i2").tobytes())
+
+
+def segment_audio(
+    audio_path: Path,
+    output_dir: Path,
+    target_seconds: float,
+    max_seconds: float,
+    min_silence_ms: int = 300,
+    drop_silence: bool = True,
+    margin_db: float = 8.0,
+    dynamic_range_db: float = 25.0,
+    ceiling_db: float = -30.0,
+) -> list[AudioSegment]:
+    data_offset, n_samples, rate = _pcm16_layout(audio_path)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    if n_samples == 0:
+        return []
+    samples = np.memmap(audio_path, dtype="<i2", mode="r", offset=data_offset, shape=(n_samples,))
+
+    frame_len = max(1, rate * FRAME_MS // 1000)
+    levels = _frame_levels_db(samples, frame_len)
+    n_frames = len(levels)
+    if n_frames == 0:
+        return []
+    floor, peak = np.percentile(levels, [10, 90])
+    threshold = min(ceiling_db, max(float(floor) + margin_db, float(peak) - dynamic_range_db))
+    silent = levels < threshold
+
+    runs = _silent_runs(silent)
+    min_run = max(1, min_silence_ms // FRAME_MS)
+    runs = runs[(runs[:, 1] - runs[:, 0]) >= min_run]
+    pad = max(1, 150 // FRAME_MS)
+    # Interior pauses longer than this are cut out of the segment, keeping ``pad`` frames on each side.
+    excise = runs[(runs[:, 1] - runs[:, 0]) > max(min_run, 2 * pad)] if drop_silence else runs[:0]
+
+    max_frames = max(1, int(max_seconds * 1000 // FRAME_MS))
+    target_frames = min(max_frames, max(1, int(target_seconds * 1000 // FRAME_MS)))
+    min_frames = max(1, target_frames // 2)
+
+    voiced = np.flatnonzero(~silent)
+    if drop_silence:
+        if len(voiced) == 0:
+            return []
+        start = max(0, int(voiced[0]) - pad)
+        last = min(n_frames, int(voiced[-1]) + 1 + pad)
+    else:
+        start, last = 0, n_frames
+
+    bounds: list[tuple[int, int]] = []
+    while last - start > max_frames:
+        lo, hi = start + min_frames, start + max_frames
+        candidates = runs[(runs[:, 1] > lo) & (runs[:, 0] < hi)]
+        if len(candidates):
+            centers = (np.clip(candidates[:, 0], lo, hi) + np.clip(candidates[:, 1], lo, hi)) // 2
+            best = int(np.argmin(np.abs(centers - (start + target_frames))))
+            run_start, run_end = (int(v) for v in candidates[best])
+            if drop_silence and run_end - run_start > 2 * pad:
+                cut_end = max(start + 1, min(hi, run_start + pad))
+                next_start = max(cut_end, run_end - pad)
+            else:
+                cut_end = next_start = int(centers[best])
+        else:
+            cut_end = next_start = hi
+        bounds.append((start, cut_end))
+        start = next_start
+    if last > start:
+        bounds.append((start, last))
+
+    segments: list[AudioSegment] = []
+    for idx, (begin, end) in enumerate(bounds):
+        begin_sample = begin * frame_len
+        end_sample = n_samples if end >= n_frames else end * frame_len
+        if end_sample <= begin_sample:
+            continue
+        inner = excise[(excise[:, 0] + pad > begin) & (excise[:, 1] - pad < end)]
+        pieces: list[np.ndarray] = []
+        gaps: list[tuple[int, int]] = []
+        kept = 0
+        position = begin_sample
+        for run_start, run_end in inner:
+            cut_start = (int(run_start) + pad) * frame_len
+            cut_end = (int(run_end) - pad) * frame_len
+            pieces.append(samples[position:cut_start])
+            kept += cut_start - position
+            gaps.append((kept * 1000 // rate, (cut_end - cut_start) * 1000 // rate))
+            position = cut_end
+        pieces.append(samples[position:end_sample])
+        kept += end_sample - position
+        path = output_dir / f"{audio_path.stem}_part_{idx:03d}.wav"
+        _write_wav(path, pieces, rate)
+        segments.append(
+            AudioSegment(
+                path=path,
+                offset_ms=begin_sample * 1000 // rate,
+                duration_ms=kept * 1000 // rate,
+                gaps=gaps,
+            )
+        )
+    del samples
+    return segments
@@ -1,25 +1,34 @@
 from __future__ import annotations
 
-from datetime import datetime
 from pathlib import Path
 from typing import List
-import queue
+import hashlib
+import json
 import threading
+import time
 import uuid
 import traceback
 
 from fastapi import FastAPI, File, Form, HTTPException, Request, UploadFile
-from fastapi.responses import HTMLResponse, FileResponse, JSONResponse
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import HTMLResponse, FileResponse, JSONResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 
-from ..config import get_settings
-from ..pipeline.runner import PipelineFactory
-from ..exporters.word_exporter import export_word
-from ..exporters.excel_exporter import export_excel
-from ..exporters.srt_exporter import export_srt
-from ..utils.file import sanitize_filename
+from ..broker.base import Broker, open_broker
+from ..config import Settings, get_settings
+from ..pipeline.gate import FairGate, RunGates
+from ..pipeline.manifest import BatchManifest
+from ..pipeline.models import TaskResult
+from ..pipeline.runner import PipelineFactory, PipelineRunner
+from ..exporters.delivery import DeliveryExporter
+from ..utils.http import HttpClient
+from ..utils.text import format_duration
 from ..collectors.douyin_profile import collect_profile_links_async
+from .events import JobEvents
+from .jobs import JobStore
+from .uploads import UploadStore
+from .scheduler import PRIORITY_LANE, JobScheduler
 
 
 BASE_DIR = Path(__file__).resolve().parent
@@ -27,108 +36,323 @@ TEMPLATES = Jinja2Templates(directory=str(BASE_DIR / "templates"))
 STATIC_DIR = BASE_DIR / "static"
 OUTPUT_ROOT = Path("outputs")
 TMP_ROOT = Path("tmp")
+AGGREGATE_POLL_SECONDS = 1.0
+SSE_KEEPALIVE_SECONDS = 15.0
+ITEM_EXCERPT_CHARS = 120
+# Download byte counts go to SSE on every tick but reach the job store at most this often.
+DOWNLOAD_PERSIST_SECONDS = 1.0
 
 
 app = FastAPI(title="Douyin Delivery Tool")
 app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
 
-JOB_QUEUE: "queue.Queue[str]" = queue.Queue()
-JOBS: dict[str, dict] = {}
-JOBS_LOCK = threading.Lock()
+SCHEDULER = JobScheduler()
+STORE: JobStore | None = None
+BROKER: Broker | None = None
+EVENTS = JobEvents()
+UPLOADS = UploadStore(TMP_ROOT / "uploads")
+HTTP_CLIENT: HttpClient | None = None
+GATES_LOCK = threading.Lock()
+ITEM_GATE: FairGate | None = None
+ASR_GATE: FairGate | None = None
+
+
+def _http_client(settings) -> HttpClient:
+    global HTTP_CLIENT
+    with GATES_LOCK:
+        if HTTP_CLIENT is None:
+            HTTP_CLIENT = HttpClient(
+                pool_connections=settings.http_pool_size,
+                per_host_limit=settings.http_per_host_limit,
+                timeout=settings.http_timeout,
+            )
+        return HTTP_CLIENT
+
 
+def _run_gates(settings, job_id: str) -> RunGates:
+    global ITEM_GATE, ASR_GATE
+    with GATES_LOCK:
+        if ITEM_GATE is None:
+            ITEM_GATE = FairGate(settings.web_item_slots)
+            ASR_GATE = FairGate(settings.asr_max_concurrency)
+    return RunGates(key=job_id, items=ITEM_GATE, asr=ASR_GATE)
 
-def _update_job(job_id: str, **updates) -> None:
-    with JOBS_LOCK:
-        job = JOBS.get(job_id, {})
-        job.update(updates)
-        JOBS[job_id] = job
 
+def _wait_stats(job_id: str, job: dict) -> dict:
+    stats: dict = {}
+    if job.get("queued_ts"):
+        started = job.get("started_ts") or time.time()
+        stats["queue_wait_seconds"] = round(started - job["queued_ts"], 1)
+    if job.get("status") == "queued":
+        stats["queue_position"] = SCHEDULER.position(job_id)
+    if ITEM_GATE is not None:
+        stats["item_wait_seconds"] = round(ITEM_GATE.waited_seconds(job_id), 1)
+        stats["asr_wait_seconds"] = round(ASR_GATE.waited_seconds(job_id), 1)
+    return stats
 
-def _worker() -> None:
+
+def _worker(priority_only: bool = False) -> None:
     while True:
-        job_id = JOB_QUEUE.get()
-        job = JOBS.get(job_id)
-        if not job:
-            JOB_QUEUE.task_done()
-            continue
-        _update_job(job_id, status="running")
-        try:
-            settings = get_settings()
-
-            def _progress(step: str, current: int, total: int, message: str) -> None:
-                _update_job(
-                    job_id,
-                    progress={
-                        "step": step,
-                        "current": current,
-                        "total": total,
-                        "message": message,
-                    },
-                )
+        _run_job(SCHEDULER.get(priority_only=priority_only))
 
-            runner = PipelineFactory(settings).create()
-            output_dir, results = runner.run(
-                inputs=job["inputs"],
-                batch_name=job["name"],
-                output_root=OUTPUT_ROOT,
-                tmp_root=TMP_ROOT,
-                enable_summary=job["summary"],
-                use_cache=True,
-                on_progress=_progress,
-                platform_hint=job.get("platform"),
-            )
 
-            exports: list[str] = []
-            if not job["export_docx"] and not job["export_xlsx"] and not job["export_srt"]:
-                job["export_docx"] = True
-            safe_name = sanitize_filename(job["name"]) or "delivery"
-            if job["export_docx"]:
-                filename = f"{safe_name}.docx"
-                export_word(results, output_dir / filename, job["name"])
-                exports.append(filename)
-            if job["export_xlsx"]:
-                filename = f"{safe_name}.xlsx"
-                export_excel(results, output_dir / filename)
-                exports.append(filename)
-            if job["export_srt"]:
-                srt_paths = export_srt(results, output_dir)
-                exports.extend([p.name for p in srt_paths])
-
-            _update_job(
-                job_id,
-                status="done",
-                output_dir=output_dir.name,
-                exports=exports,
-                progress={
-                    "step": "done",
-                    "current": len(job["inputs"]),
-                    "total": len(job["inputs"]),
-                    "message": "任务完成",
+def _set_progress(job_id: str, progress: dict) -> None:
+    STORE.set_progress(job_id, progress)
+    EVENTS.progress(job_id, progress)
+
+
+def _merge_progress(job_id: str, **updates) -> None:
+    STORE.merge_progress(job_id, **updates)
+    EVENTS.progress(job_id, updates, merge=True)
+
+
+def _start_job(job_id: str) -> None:
+    STORE.update(job_id, status="running", started_ts=time.time())
+    EVENTS.publish(job_id, "status", {"status": "running"})
+
+
+def _publish_item(job_id: str, index: int, result: TaskResult) -> None:
+    EVENTS.item(
+        job_id,
+        {
+            "index": index,
+            "input": result.item.input_value,
+            "title": result.item.title,
+            "duration": format_duration(result.item.duration_ms),
+            "error": result.error,
+            "excerpt": result.transcript.text[:ITEM_EXCERPT_CHARS],
+        },
+    )
+
+
+def _open_exporter(settings, job: dict, output_dir: Path) -> DeliveryExporter:
+    spec = job["spec"]
+    if not spec["export_docx"] and not spec["export_xlsx"] and not spec["export_srt"]:
+        spec["export_docx"] = True
+    formats = [name for name in ("docx", "xlsx", "srt") if spec[f"export_{name}"]]
+    return DeliveryExporter(
+        output_dir,
+        job["name"],
+        formats,
+        total=len(spec["inputs"]),
+        processes=settings.export_processes,
+        srt_workers=settings.export_srt_workers,
+    )
+
+
+def _finish_job(job_id: str, job: dict, output_dir: Path, exporter: DeliveryExporter) -> None:
+    total = len(job["spec"]["inputs"])
+    exports = exporter.close()
+    failed = exporter.failed
+    _set_progress(
+        job_id,
+        {
+            "step": "done",
+            "current": total,
+            "total": total,
+            "message": f"任务完成（{len(failed)} 条失败）" if failed else "任务完成",
+        },
+    )
+    STORE.update(
+        job_id,
+        status="done",
+        result={"output_dir": output_dir.name, "exports": exports, "failed": failed},
+        finished_ts=time.time(),
+    )
+    EVENTS.finish(job_id, "done", STORE.status(job_id))
+
+
+def _fail_job(job_id: str, job: dict, exc: Exception) -> None:
+    _set_progress(
+        job_id,
+        {
+            "step": "error",
+            "current": 0,
+            "total": len(job["spec"]["inputs"]),
+            "message": "任务失败",
+        },
+    )
+    STORE.update(
+        job_id,
+        status="error",
+        error=str(exc),
+        error_detail=traceback.format_exc(),
+        error_raw=getattr(exc, "raw_response", None),
+        finished_ts=time.time(),
+    )
+    EVENTS.finish(job_id, "failed", STORE.status(job_id))
+
+
+def _enqueue_job(job_id: str, job: dict) -> None:
+    """Hands the items to worker processes and follows their results in a thread."""
+    spec = job["spec"]
+    BROKER.enqueue(
+        job_id,
+        [
+            (
+                index,
+                {
+                    "input": value,
+                    "output_dir": spec["output_dir"],
+                    "platform": spec["platform"],
+                    "summary": spec["summary"],
                 },
-                finished_at=datetime.now().isoformat(),
             )
-        except Exception as exc:
-            _update_job(
+            for index, value in enumerate(spec["inputs"], start=1)
+        ],
+        priority=0 if job["lane"] == PRIORITY_LANE else 1,
+    )
+    threading.Thread(target=_aggregate_job, args=(job_id,), name=f"job-aggregate-{job_id[:8]}", daemon=True).start()
+
+
+def _aggregate_job(job_id: str) -> None:
+    job = STORE.get(job_id)
+    if not job:
+        return
+    total = len(job["spec"]["inputs"])
+    _start_job(job_id)
+    exporter = None
+    try:
+        settings = get_settings()
+        output_dir = Path(job["spec"]["output_dir"])
+        exporter = _open_exporter(settings, job, output_dir)
+        manifest = BatchManifest(output_dir)
+        held = {}
+        next_index = 1
+        last_seq = 0
+        while next_index <= total:
+            outcomes = BROKER.results(job_id, after=last_seq)
+            if not outcomes:
+                time.sleep(AGGREGATE_POLL_SECONDS)
+                continue
+            for _seq, index, entry in outcomes:
+                held[index] = manifest.load_result(entry)
+                _publish_item(job_id, index, held[index])
+            last_seq = outcomes[-1][0]
+            while next_index in held:
+                exporter.add(next_index, held.pop(next_index))
+                next_index += 1
+            _set_progress(
                 job_id,
-                status="error",
-                error=str(exc),
-                error_detail=traceback.format_exc(),
-                error_raw=getattr(exc, "raw_response", None),
-                progress={
-                    "step": "error",
-                    "current": 0,
-                    "total": len(job["inputs"]),
-                    "message": "任务失败",
+                {
+                    "step": "worker",
+                    "current": last_seq,
+                    "total": total,
+                    "message": "工作进程处理中",
+                    "stages": BROKER.counts(job_id),
+                    "completed": next_index - 1,
                 },
             )
-        finally:
-            JOB_QUEUE.task_done()
+        _finish_job(job_id, job, output_dir, exporter)
+        BROKER.purge(job_id)
+    except Exception as exc:  # noqa: BLE001 - recorded as the job failure
+        _fail_job(job_id, job, exc)
+    finally:
+        if exporter is not None:
+            exporter.abort()
+        STORE.evict()
+
+
+def _run_job(job_id: str) -> None:
+    job = STORE.get(job_id)
+    if not job:
+        return
+    spec = job["spec"]
+    _start_job(job_id)
+    exporter = None
+    try:
+        settings = get_settings()
+        download_saved = [0.0]
+
+        def _progress(step: str, current: int, total: int, message: str, **extra) -> None:
+            if extra.get("download"):
+                updates = {"step": step, "message": message, "download": extra["download"]}
+                EVENTS.progress(job_id, updates, merge=True)
+                now = time.monotonic()
+                if now - download_saved[0] >= DOWNLOAD_PERSIST_SECONDS:
+                    download_saved[0] = now
+                    STORE.merge_progress(job_id, **updates)
+                return
+            progress = {
+                "step": step,
+                "current": current,
+                "total": total,
+                "message": message,
+            }
+            if extra.get("stage_counts"):
+                progress["stages"] = extra["stage_counts"]
+            _set_progress(job_id, progress)
+
+        runner = PipelineFactory(settings, http=_http_client(settings)).create()
+        output_dir = runner.batch_dir(OUTPUT_ROOT, job["name"])
+        exporter = _open_exporter(settings, job, output_dir)
+        for index, result in runner.iter_run(
+            inputs=spec["inputs"],
+            batch_name=job["name"],
+            output_root=OUTPUT_ROOT,
+            tmp_root=TMP_ROOT,
+            enable_summary=spec["summary"],
+            use_cache=True,
+            on_progress=_progress,
+            platform_hint=spec.get("platform"),
+            ordering="input",
+            gates=_run_gates(settings, job_id),
+        ):
+            exporter.add(index, result)
+            _publish_item(job_id, index, result)
+            _merge_progress(job_id, completed=index)
+        _finish_job(job_id, job, output_dir, exporter)
+    except Exception as exc:  # noqa: BLE001 - recorded as the job failure
+        _fail_job(job_id, job, exc)
+    finally:
+        if exporter is not None:
+            exporter.abort()
+        if ITEM_GATE is not None:
+            STORE.update(job_id, wait_stats=_wait_stats(job_id, STORE.status(job_id) or {}))
+            ITEM_GATE.forget(job_id)
+            ASR_GATE.forget(job_id)
+        STORE.evict()
+
+
+def _recover_jobs() -> None:
+    for job in STORE.unfinished():
+        if BROKER is not None:
+            if not job["spec"].get("output_dir"):
+                # Queued before the broker was configured; give it a batch directory now.
+                job["spec"]["output_dir"] = str(PipelineRunner.batch_dir(OUTPUT_ROOT, job["name"]))
+                STORE.update(job["id"], spec=job["spec"])
+            # Enqueueing is idempotent: known items stay in the broker and only the aggregation thread restarts.
+            _enqueue_job(job["id"], job)
+            continue
+        # Interrupted runs start over; the batch manifest skips items already finished.
+        STORE.update(job["id"], status="queued", started_ts=None)
+        SCHEDULER.put(job["id"], len(job["spec"]["inputs"]))
+    if STORE.evict():
+        print("[web] Evicted expired jobs")
 
 
 @app.on_event("startup")
 def _start_worker() -> None:
-    thread = threading.Thread(target=_worker, daemon=True)
-    thread.start()
+    global STORE, BROKER
+    try:
+        settings = get_settings()
+    except ValueError:
+        settings = None
+    workers = settings.web_job_workers if settings else Settings.web_job_workers
+    SCHEDULER.small_job_items = settings.web_small_job_items if settings else Settings.web_small_job_items
+    STORE = JobStore(
+        Path(settings.job_store_path if settings else Settings.job_store_path),
+        retention_seconds=(settings.job_retention_days if settings else Settings.job_retention_days) * 24 * 3600,
+    )
+    if settings and settings.broker_url:
+        BROKER = open_broker(settings.broker_url, max_attempts=settings.worker_max_attempts)
+    _recover_jobs()
+    if BROKER is not None:
+        # Items run in `python -m src.worker` processes; this app only enqueues and aggregates.
+        return
+    for idx in range(max(1, workers)):
+        threading.Thread(target=_worker, name=f"job-worker-{idx}", daemon=True).start()
+    threading.Thread(target=_worker, args=(True,), name="job-worker-priority", daemon=True).start()
 
 
 @app.get("/", response_class=HTMLResponse)
@@ -188,16 +412,9 @@ async def run_delivery(
         for upload in files:
             if not upload.filename:
                 continue
-            suffix = Path(upload.filename).suffix
-            safe_name = upload.filename.replace("/", "_").replace("\\", "_")
-            tmp_name = f"upload_{datetime.now().timestamp():.0f}_{safe_name}"
-            if suffix:
-                tmp_name = f"{Path(tmp_name).stem}{suffix}"
-            tmp_path = TMP_ROOT / tmp_name
-            TMP_ROOT.mkdir(parents=True, exist_ok=True)
-            with tmp_path.open("wb") as f:
-                f.write(await upload.read())
-            inputs.append(str(tmp_path))
+            # Starlette has already spooled the body; copy it in chunks off the event loop.
+            path = await run_in_threadpool(UPLOADS.save, upload.file, upload.filename)
+            inputs.append(str(path))
 
     if not inputs:
         return TEMPLATES.TemplateResponse(
@@ -206,20 +423,25 @@ async def run_delivery(
         )
 
     job_id = str(uuid.uuid4())
-    _update_job(
+    STORE.create(
         job_id,
-        status="queued",
         name=name,
-        inputs=inputs,
-        platform=platform,
-        export_docx=export_docx,
-        export_xlsx=export_xlsx,
-        export_srt=export_srt,
-        summary=summary,
-        created_at=datetime.now().isoformat(),
+        spec={
+            "output_dir": str(PipelineRunner.batch_dir(OUTPUT_ROOT, name)) if BROKER is not None else None,
+            "inputs": inputs,
+            "platform": platform,
+            "export_docx": export_docx,
+            "export_xlsx": export_xlsx,
+            "export_srt": export_srt,
+            "summary": summary,
+        },
+        lane=SCHEDULER.lane_for(len(inputs)),
         progress={"step": "queued", "current": 0, "total": len(inputs), "message": "排队中"},
     )
-    JOB_QUEUE.put(job_id)
+    if BROKER is not None:
+        _enqueue_job(job_id, STORE.get(job_id))
+    else:
+        SCHEDULER.put(job_id, len(inputs))
 
     return TEMPLATES.TemplateResponse(
         "progress.html",
@@ -228,11 +450,89 @@ async def run_delivery(
 
 
 @app.get("/api/jobs/{job_id}", response_class=JSONResponse)
-def job_status(job_id: str) -> JSONResponse:
-    job = JOBS.get(job_id)
+def job_status(job_id: str, request: Request) -> Response:
+    job = STORE.status(job_id)
+    if not job:
+        return JSONResponse({"status": "not_found"}, status_code=404)
+    # Only stored fields go into the ETag; the live wait timings change on every request.
+    stored = json.dumps(job, ensure_ascii=False, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    etag = '"' + hashlib.sha1(stored).hexdigest()[:20] + '"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    if job["status"] in ("queued", "running"):
+        job.update(_wait_stats(job_id, job))
+    body = json.dumps(job, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return Response(body, media_type="application/json", headers=headers)
+
+
+def _job_view(job_id: str) -> dict | None:
+    job = STORE.status(job_id)
+    if job and job.get("status") in ("queued", "running"):
+        job.update(_wait_stats(job_id, job))
+    return job
+
+
+def _sse(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@app.get("/api/jobs/{job_id}/events")
+async def job_events(job_id: str) -> Response:
+    """SSE stream: a snapshot, then progress deltas, item results and the final status."""
+    subscription = EVENTS.subscribe(job_id)
+    job = await run_in_threadpool(_job_view, job_id)
     if not job:
+        subscription.close()
         return JSONResponse({"status": "not_found"}, status_code=404)
-    return JSONResponse(job)
+    job["items"] = EVENTS.items(job_id)
+
+    async def _stream():
+        try:
+            yield _sse("snapshot", job)
+            if job["status"] in ("done", "error"):
+                return
+            while True:
+                message = await subscription.next(SSE_KEEPALIVE_SECONDS)
+                if message is None:
+                    yield ": keepalive\n\n"
+                    continue
+                event, data = message
+                yield _sse(event, data)
+                if event in ("done", "failed"):
+                    return
+        finally:
+            subscription.close()
+
+    return StreamingResponse(
+        _stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.post("/api/preview", response_class=JSONResponse)
+def preview(links: str = Form(""), platform: str = Form("auto")) -> JSONResponse:
+    inputs = [line.strip() for line in links.splitlines() if line.strip()]
+    if not inputs:
+        return JSONResponse({"items": []})
+    settings = get_settings()
+    resolver = PipelineFactory(settings, http=_http_client(settings)).create_resolver()
+    items = []
+    for result in resolver.resolve_many(inputs, platform):
+        if result.item is None:
+            items.append({"input": result.input_value, "ok": False, "error": str(result.error)})
+            continue
+        items.append(
+            {
+                "input": result.input_value,
+                "ok": True,
+                "platform": result.item.platform,
+                "title": result.item.title,
+                "duration": format_duration(result.item.duration_ms),
+            }
+        )
+    return JSONResponse({"items": items})
 
 
 @app.get("/download/{batch}/{filename}")
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import Any
+
+
+class _Channel:
+    def __init__(self) -> None:
+        self.progress: dict = {}
+        self.items: list[dict] = []
+        self.subscribers: set[tuple[asyncio.AbstractEventLoop, asyncio.Queue]] = set()
+
+
+class JobEvents:
+    """Fan-out of job events from worker threads to SSE subscribers.
+
+    Progress is published as a delta against the last value sent for the job;
+    item summaries are kept for the life of the job so a page that connects
+    late can show partial results from its snapshot. Publishing never blocks:
+    each subscriber gets its own queue on its own event loop.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._channels: dict[str, _Channel] = {}
+
+    def _channel(self, job_id: str) -> _Channel:
+        channel = self._channels.get(job_id)
+        if channel is None:
+            channel = self._channels[job_id] = _Channel()
+        return channel
+
+    def _send(self, channel: _Channel, event: str, data: Any) -> None:
+        for loop, inbox in list(channel.subscribers):
+            try:
+                loop.call_soon_threadsafe(inbox.put_nowait, (event, data))
+            except RuntimeError:
+                # The subscriber's loop is gone; it unsubscribes on its way out.
+                pass
+
+    def progress(self, job_id: str, values: dict, merge: bool = False) -> None:
+        with self._lock:
+            channel = self._channel(job_id)
+            updated = {**channel.progress, **values} if merge else dict(values)
+            delta = {key: value for key, value in updated.items() if channel.progress.get(key) != value}
+            delta.update({key: None for key in channel.progress if key not in updated})
+            channel.progress = updated
+            if delta:
+                self._send(channel, "progress", delta)
+
+    def item(self, job_id: str, summary: dict) -> None:
+        with self._lock:
+            channel = self._channel(job_id)
+            channel.items.append(summary)
+            self._send(channel, "item", summary)
+
+    def publish(self, job_id: str, event: str, data: Any) -> None:
+        with self._lock:
+            self._send(self._channel(job_id), event, data)
+
+    def finish(self, job_id: str, event: str, data: Any) -> None:
+        """Sends the final event and drops the job; connected streams end after it."""
+        with self._lock:
+            channel = self._channels.pop(job_id, None)
+            if channel is None:
+                return
+            self._send(channel, event, data)
+
+    def items(self, job_id: str) -> list[dict]:
+        with self._lock:
+            channel = self._channels.get(job_id)
+            return list(channel.items) if channel else []
+
+    def subscribe(self, job_id: str) -> "Subscription":
+        """Registers a subscriber on the running event loop; call before reading a snapshot."""
+        subscription = Subscription(self, job_id)
+        with self._lock:
+            subscription.channel = self._channel(job_id)
+            subscription.channel.subscribers.add(subscription.key)
+        return subscription
+
+    def _unsubscribe(self, subscription: "Subscription") -> None:
+        with self._lock:
+            channel = subscription.channel
+            channel.subscribers.discard(subscription.key)
+            idle = not channel.subscribers and not channel.items and not channel.progress
+            if idle and self._channels.get(subscription.job_id) is channel:
+                del self._channels[subscription.job_id]
+
+
+class Subscription:
+    def __init__(self, events: JobEvents, job_id: str) -> None:
+        self.events = events
+        self.job_id = job_id
+        self.inbox: asyncio.Queue = asyncio.Queue()
+        self.key = (asyncio.get_running_loop(), self.inbox)
+        self.channel: _Channel | None = None
+
+    async def next(self, timeout: float) -> tuple[str, Any] | None:
+        """The next ``(event, data)``, or ``None`` after ``timeout`` idle seconds."""
+        try:
+            return await asyncio.wait_for(self.inbox.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self) -> None:
+        self.events._unsubscribe(self)
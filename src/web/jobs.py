@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from ..utils.file import ensure_dir
+
+JSON_COLUMNS = ("spec", "result", "error_raw", "wait_stats")
+COLUMNS = (
+    "status",
+    "name",
+    "lane",
+    "spec",
+    "result",
+    "error",
+    "error_detail",
+    "error_raw",
+    "queued_ts",
+    "started_ts",
+    "finished_ts",
+    "wait_stats",
+)
+
+
+class JobStore:
+    """Web jobs in SQLite (WAL).
+
+    The job row holds the request spec and final outcome; the frequently written
+    progress record lives in its own small table so polling never loads inputs
+    or tracebacks. Finished jobs older than ``retention_seconds`` are evicted.
+    """
+
+    def __init__(self, path: Path, retention_seconds: float = 7 * 24 * 3600) -> None:
+        ensure_dir(path.parent)
+        self.path = path
+        self.retention_seconds = retention_seconds
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                name TEXT NOT NULL,
+                lane TEXT,
+                spec TEXT NOT NULL,
+                result TEXT,
+                error TEXT,
+                error_detail TEXT,
+                error_raw TEXT,
+                created_ts REAL NOT NULL,
+                queued_ts REAL,
+                started_ts REAL,
+                finished_ts REAL,
+                wait_stats TEXT
+            );
+            CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, queued_ts);
+            CREATE INDEX IF NOT EXISTS jobs_finished ON jobs (finished_ts);
+            CREATE TABLE IF NOT EXISTS progress (
+                job_id TEXT PRIMARY KEY,
+                data TEXT NOT NULL
+            );
+            """
+        )
+        self._conn.commit()
+
+    def create(self, job_id: str, name: str, spec: dict, lane: str, progress: dict) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT INTO jobs (id, status, name, lane, spec, created_ts, queued_ts)
+                VALUES (?, 'queued', ?, ?, ?, ?, ?)
+                """,
+                (job_id, name, lane, json.dumps(spec, ensure_ascii=False), now, now),
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO progress (job_id, data) VALUES (?, ?)",
+                (job_id, json.dumps(progress, ensure_ascii=False)),
+            )
+            self._conn.commit()
+
+    def update(self, job_id: str, **fields) -> None:
+        unknown = set(fields) - set(COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown job fields: {sorted(unknown)}")
+        if not fields:
+            return
+        values = [
+            json.dumps(value, ensure_ascii=False) if key in JSON_COLUMNS and value is not None else value
+            for key, value in fields.items()
+        ]
+        assignments = ", ".join(f"{key} = ?" for key in fields)
+        with self._lock:
+            self._conn.execute(f"UPDATE jobs SET {assignments} WHERE id = ?", (*values, job_id))
+            self._conn.commit()
+
+    def get(self, job_id: str) -> dict | None:
+        with self._lock:
+            cursor = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,))
+            row = cursor.fetchone()
+            names = [column[0] for column in cursor.description]
+        if row is None:
+            return None
+        job = dict(zip(names, row, strict=True))
+        for key in JSON_COLUMNS:
+            if job.get(key):
+                job[key] = json.loads(job[key])
+        return job
+
+    def set_progress(self, job_id: str, progress: dict) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE progress SET data = ? WHERE job_id = ?",
+                (json.dumps(progress, ensure_ascii=False), job_id),
+            )
+            self._conn.commit()
+
+    def merge_progress(self, job_id: str, **updates) -> None:
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM progress WHERE job_id = ?", (job_id,)).fetchone()
+            progress = json.loads(row[0]) if row else {}
+            progress.update(updates)
+            self._conn.execute(
+                "UPDATE progress SET data = ? WHERE job_id = ?",
+                (json.dumps(progress, ensure_ascii=False), job_id),
+            )
+            self._conn.commit()
+
+    def status(self, job_id: str) -> dict | None:
+        """Small view for polling: status, progress and, once finished, the outcome."""
+        with self._lock:
+            row = self._conn.execute(
+                """
+                SELECT jobs.status, jobs.name, jobs.lane, jobs.queued_ts, jobs.started_ts,
+                       jobs.wait_stats, progress.data,
+                       CASE WHEN jobs.status IN ('done', 'error') THEN jobs.result END,
+                       CASE WHEN jobs.status = 'error' THEN jobs.error END,
+                       CASE WHEN jobs.status = 'error' THEN jobs.error_detail END,
+                       CASE WHEN jobs.status = 'error' THEN jobs.error_raw END
+                FROM jobs LEFT JOIN progress ON progress.job_id = jobs.id
+                WHERE jobs.id = ?
+                """,
+                (job_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        status, name, lane, queued_ts, started_ts, wait_stats, progress, result, error, detail, raw = row
+        view = {
+            "status": status,
+            "name": name,
+            "lane": lane,
+            "queued_ts": queued_ts,
+            "started_ts": started_ts,
+            "progress": json.loads(progress) if progress else {},
+        }
+        if wait_stats:
+            view.update(json.loads(wait_stats))
+        if result:
+            view.update(json.loads(result))
+        if status == "error":
+            view.update(error=error, error_detail=detail, error_raw=json.loads(raw) if raw else None)
+        return view
+
+    def unfinished(self) -> list[dict]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id FROM jobs WHERE status IN ('queued', 'running') ORDER BY queued_ts"
+            ).fetchall()
+        return [job for job in (self.get(row[0]) for row in rows) if job]
+
+    def evict(self, now: float | None = None) -> int:
+        cutoff = (now or time.time()) - self.retention_seconds
+        with self._lock:
+            ids = [
+                row[0]
+                for row in self._conn.execute(
+                    "SELECT id FROM jobs WHERE status IN ('done', 'error') AND finished_ts < ?",
+                    (cutoff,),
+                )
+            ]
+            self._conn.executemany("DELETE FROM progress WHERE job_id = ?", [(job_id,) for job_id in ids])
+            self._conn.executemany("DELETE FROM jobs WHERE id = ?", [(job_id,) for job_id in ids])
+            self._conn.commit()
+        return len(ids)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import threading
+from collections import deque
+
+PRIORITY_LANE = "priority"
+NORMAL_LANE = "normal"
+
+
+class JobScheduler:
+    """FIFO job lanes; jobs with at most ``small_job_items`` inputs use the priority lane.
+
+    General workers drain the priority lane first, and priority-only workers never
+    pick up large jobs, so a short job does not wait behind account-wide batches.
+    """
+
+    def __init__(self, small_job_items: int = 5) -> None:
+        self.small_job_items = small_job_items
+        self._lanes: dict[str, deque[str]] = {PRIORITY_LANE: deque(), NORMAL_LANE: deque()}
+        self._cond = threading.Condition()
+
+    def lane_for(self, size: int) -> str:
+        return PRIORITY_LANE if size <= self.small_job_items else NORMAL_LANE
+
+    def put(self, job_id: str, size: int) -> str:
+        lane = self.lane_for(size)
+        with self._cond:
+            self._lanes[lane].append(job_id)
+            self._cond.notify_all()
+        return lane
+
+    def get(self, priority_only: bool = False) -> str:
+        with self._cond:
+            while True:
+                if self._lanes[PRIORITY_LANE]:
+                    return self._lanes[PRIORITY_LANE].popleft()
+                if not priority_only and self._lanes[NORMAL_LANE]:
+                    return self._lanes[NORMAL_LANE].popleft()
+                self._cond.wait()
+
+    def position(self, job_id: str) -> int | None:
+        with self._cond:
+            ahead = 0
+            for lane in (PRIORITY_LANE, NORMAL_LANE):
+                if job_id in self._lanes[lane]:
+                    return ahead + list(self._lanes[lane]).index(job_id)
+                ahead += len(self._lanes[lane])
+        return None
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import uuid
+from pathlib import Path
+from typing import BinaryIO
+
+from ..utils.file import HASH_SIDECAR_SUFFIX, ensure_dir, sanitize_filename, write_hash_sidecar
+
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+
+
+class UploadStore:
+    """Content-addressed uploads under ``<root>/<sha256>/<filename>``.
+
+    The upload is copied in chunks and hashed in the same pass, and the digest
+    is written to a ``.sha256`` sidecar so the pipeline never reads the file
+    again to build its cache key. Content that is already stored is kept once;
+    a new filename for it becomes a hard link.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+
+    def save(self, source: BinaryIO, filename: str) -> Path:
+        name = sanitize_filename(Path(filename).name) or "upload"
+        incoming = self.root / "incoming"
+        ensure_dir(incoming)
+        part_path = incoming / f"{uuid.uuid4().hex}.part"
+        hasher = hashlib.sha256()
+        try:
+            with part_path.open("wb") as f:
+                for chunk in iter(lambda: source.read(UPLOAD_CHUNK_BYTES), b""):
+                    hasher.update(chunk)
+                    f.write(chunk)
+            digest = hasher.hexdigest()
+            folder = self.root / digest
+            target = folder / name
+            if target.exists():
+                print("[upload] known file " + digest[:12] + " " + name)
+                return self._recorded(target, digest)
+            ensure_dir(folder)
+            existing = self._stored(folder)
+            if existing is None:
+                part_path.replace(target)
+            else:
+                print("[upload] known file " + digest[:12] + " stored as " + existing.name)
+                try:
+                    os.link(existing, target)
+                except OSError:
+                    return self._recorded(existing, digest)
+            return self._recorded(target, digest)
+        finally:
+            part_path.unlink(missing_ok=True)
+
+    def _stored(self, folder: Path) -> Path | None:
+        for path in folder.iterdir():
+            if path.is_file() and not path.name.endswith(HASH_SIDECAR_SUFFIX):
+                return path
+        return None
+
+    def _recorded(self, path: Path, digest: str) -> Path:
+        write_hash_sidecar(path, digest)
+        return path
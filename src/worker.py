@@ -0,0 +1,141 @@
+import argparse
+import os
+import socket
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from .broker.base import Broker, BrokerTask, open_broker
+from .config import get_settings
+from .pipeline.manifest import manifest_entry
+from .pipeline.runner import PipelineFactory, PipelineRunner
+
+
+class TaskWorker:
+    """Leases per-item tasks from a broker and runs them through ``PipelineRunner``.
+
+    Tasks of the same job share one ``iter_items`` call; leases are renewed by a
+    heartbeat thread while the batch runs, and tasks left unfinished by an
+    unexpected error go back to the broker for another attempt.
+    """
+
+    def __init__(
+        self,
+        broker: Broker,
+        runner: PipelineRunner,
+        output_root: Path,
+        tmp_root: Path,
+        batch_items: int = 4,
+        lease_seconds: float = 120.0,
+        poll_interval: float = 1.0,
+        worker_id: str | None = None,
+    ) -> None:
+        self.broker = broker
+        self.runner = runner
+        self.output_root = output_root
+        self.tmp_root = tmp_root
+        self.batch_items = max(1, batch_items)
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self._stop = threading.Event()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _heartbeat(self, done: threading.Event) -> None:
+        while not done.wait(self.lease_seconds / 3):
+            try:
+                self.broker.heartbeat(self.worker_id, self.lease_seconds)
+            except self.broker.errors as exc:
+                print("[worker] heartbeat failed: " + str(exc))
+
+    def _run_job_tasks(self, tasks: list[BrokerTask]) -> None:
+        spec = tasks[0].payload
+        by_index = {task.index: task for task in tasks}
+        error = "worker stopped before the item finished"
+        try:
+            for index, result in self.runner.iter_items(
+                [(task.index, task.payload["input"]) for task in tasks],
+                Path(spec["output_dir"]),
+                self.tmp_root,
+                self.output_root / ".cache",
+                enable_summary=spec.get("summary", False),
+                platform_hint=spec.get("platform"),
+            ):
+                task = by_index.pop(index)
+                if not self.broker.complete(task, self.worker_id, manifest_entry(index, task.payload["input"], result)):
+                    print("[worker] lease lost for " + task.id)
+        except Exception as exc:  # noqa: BLE001 - the batch's tasks go back to the broker below
+            traceback.print_exc()
+            error = str(exc)
+        finally:
+            # Whatever stopped the batch, hand unfinished tasks back instead of waiting for lease expiry.
+            for task in by_index.values():
+                self.broker.release(task, self.worker_id, error)
+
+    def run_once(self) -> int:
+        tasks = self.broker.lease(self.worker_id, self.batch_items, self.lease_seconds)
+        if not tasks:
+            return 0
+        groups: dict[str, list[BrokerTask]] = {}
+        for task in tasks:
+            groups.setdefault(task.job_id, []).append(task)
+        print("[worker] leased=" + str(len(tasks)) + " jobs=" + str(len(groups)))
+        done = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(done,), name="worker-heartbeat", daemon=True)
+        heartbeat.start()
+        try:
+            with ThreadPoolExecutor(max_workers=len(groups), thread_name_prefix="worker-job") as pool:
+                list(pool.map(self._run_job_tasks, groups.values()))
+        finally:
+            done.set()
+            heartbeat.join()
+        return len(tasks)
+
+    def run(self, exit_when_idle: bool = False) -> None:
+        print("[worker] started id=" + self.worker_id)
+        while not self._stop.is_set():
+            if self.run_once():
+                continue
+            if exit_when_idle:
+                return
+            self._stop.wait(self.poll_interval)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Pipeline worker: runs items queued by the web app")
+    parser.add_argument("--broker", help="sqlite:///path or redis://host:6379/0 (default: BROKER_URL)")
+    parser.add_argument("--batch", type=int, help="Items leased at once (default: WORKER_BATCH_ITEMS)")
+    parser.add_argument("--lease-seconds", type=float, help="Lease length (default: WORKER_LEASE_SECONDS)")
+    parser.add_argument("--poll", type=float, default=1.0, help="Seconds between polls when idle")
+    parser.add_argument("--exit-when-idle", action="store_true", help="Stop once the queue is empty")
+    parser.add_argument("--output-dir", default="outputs", help="Output root directory (for the cache)")
+    parser.add_argument("--tmp-dir", default="tmp", help="Temporary working directory")
+    args = parser.parse_args()
+
+    settings = get_settings()
+    broker_url = args.broker or settings.broker_url
+    if not broker_url:
+        raise SystemExit("No broker configured. Use --broker or set BROKER_URL.")
+    broker = open_broker(broker_url, max_attempts=settings.worker_max_attempts)
+    worker = TaskWorker(
+        broker,
+        PipelineFactory(settings).create(),
+        output_root=Path(args.output_dir),
+        tmp_root=Path(args.tmp_dir),
+        batch_items=args.batch or settings.worker_batch_items,
+        lease_seconds=args.lease_seconds or settings.worker_lease_seconds,
+        poll_interval=args.poll,
+    )
+    try:
+        worker.run(exit_when_idle=args.exit_when_idle)
+    except KeyboardInterrupt:
+        print("[worker] stopped; leased items return to the queue when their lease expires")
+    finally:
+        broker.close()
+
+
+if __name__ == "__main__":
+    main()
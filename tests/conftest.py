@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from src.config import Settings
+from src.pipeline.models import Transcript, VideoItem
+from src.pipeline.runner import PipelineRunner
+
+
+class FakeResolver:
+    """Inputs look like ``vid:<n>`` with an optional ``#share`` suffix for the same video."""
+
+    def canonical_key(self, value: str, platform_hint: str | None = None) -> str | None:
+        return value.split("#")[0]
+
+    def refresh_source(self, item: VideoItem) -> VideoItem:
+        return item
+
+    def resolve(self, value: str, platform_hint: str | None = None) -> VideoItem:
+        video_id = value.split("#")[0].split(":")[-1]
+        return VideoItem(
+            input_value=value,
+            title="title " + video_id,
+            source_url=None,
+            video_id=video_id,
+            local_video_path=None,
+            local_audio_path=None,
+            platform="bilibili",
+            duration_ms=1000,
+        )
+
+
+class FakeDownloader:
+    def download(self, item: VideoItem, tmp_root: Path, on_progress=None) -> VideoItem:
+        item.local_video_path = tmp_root / "video.mp4"
+        return item
+
+
+class FakeExtractor:
+    def extract(self, item: VideoItem, tmp_root: Path) -> VideoItem:
+        item.local_audio_path = tmp_root / "audio.wav"
+        return item
+
+
+class FakeASR:
+    """Records transcribed video ids; ``delays`` and ``failures`` (how many calls fail) are keyed by id."""
+
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+        self.delays: dict[str, float] = {}
+        self.failures: dict[str, int] = {}
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def describe_route(self, item: VideoItem, settings: Settings, use_source_url: bool) -> tuple[str, str, str]:
+        return "audio-asr", settings.audio_asr_model, "local"
+
+    def transcribe(self, item: VideoItem, settings: Settings, use_source_url: bool) -> Transcript:
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.delays.get(item.video_id, 0))
+        with self._lock:
+            self.active -= 1
+            self.calls.append(item.video_id)
+            failing = self.failures.get(item.video_id, 0) > 0
+            if failing:
+                self.failures[item.video_id] -= 1
+        if failing:
+            raise ValueError("asr failed for " + item.video_id)
+        return Transcript(text="text " + item.video_id, raw={"id": item.video_id})
+
+
+class FakeClock:
+    """Stands in for a module's ``time``; every ``time()`` call advances the clock by ``step``."""
+
+    def __init__(self, now: float = 1000.0, step: float = 0.0) -> None:
+        self.now = now
+        self.step = step
+
+    def time(self) -> float:
+        value = self.now
+        self.now += self.step
+        return value
+
+
+class FakePostProcessor:
+    def process(self, text: str) -> list[str]:
+        return [text] if text else []
+
+
+class FakeSummarizer:
+    def summarize(self, **kwargs) -> str:
+        return ""
+
+
+@pytest.fixture
+def asr() -> FakeASR:
+    return FakeASR()
+
+
+@pytest.fixture
+def make_runner(asr: FakeASR):
+    def _make(**overrides) -> PipelineRunner:
+        fields = dict(item_retries=0, item_retry_delay=0.0)
+        fields.update(overrides)
+        settings = Settings("key", "http://llm", "asr", "llm", "auto", "audio-asr", **fields)
+        return PipelineRunner(
+            settings=settings,
+            platform_resolver=FakeResolver(),
+            asr_router=asr,
+            downloader=FakeDownloader(),
+            audio_extractor=FakeExtractor(),
+            post_processor=FakePostProcessor(),
+            summarizer=FakeSummarizer(),
+        )
+
+    return _make
+
+
+@pytest.fixture
+def fake_clock(monkeypatch):
+    """Replaces ``module.time`` with a :class:`FakeClock` for the duration of a test."""
+
+    def _install(module, step: float = 0.0) -> FakeClock:
+        clock = FakeClock(step=step)
+        monkeypatch.setattr(module, "time", clock)
+        return clock
+
+    return _install
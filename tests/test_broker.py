@@ -0,0 +1,128 @@
+import pytest
+
+from src.broker import redis_broker, sqlite
+from src.broker.base import open_broker
+from src.broker.redis_broker import RedisBroker
+from src.broker.sqlite import SqliteBroker
+
+
+@pytest.fixture
+def clock(fake_clock):
+    clock = fake_clock(sqlite)
+    fake_clock(redis_broker).time = clock.time
+    return clock
+
+
+def _redis_broker(monkeypatch) -> RedisBroker:
+    fakeredis = pytest.importorskip("fakeredis")
+    redis = pytest.importorskip("redis")
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(
+        redis.Redis,
+        "from_url",
+        classmethod(lambda cls, url, **kwargs: fakeredis.FakeRedis(server=server, **kwargs)),
+    )
+    return RedisBroker("redis://test", max_attempts=2)
+
+
+@pytest.fixture(params=["sqlite", "redis"])
+def broker(request, tmp_path, clock, monkeypatch):
+    if request.param == "sqlite":
+        queue = SqliteBroker(tmp_path / "broker.sqlite3", max_attempts=2)
+    else:
+        queue = _redis_broker(monkeypatch)
+    yield queue
+    queue.close()
+
+
+def _enqueue(broker, job_id: str, count: int, priority: int = 0) -> None:
+    broker.enqueue(job_id, [(index, {"input": f"{job_id}-{index}"}) for index in range(1, count + 1)], priority)
+
+
+def test_lease_orders_by_priority_then_index(broker):
+    _enqueue(broker, "a", 2)
+    _enqueue(broker, "b", 2)
+    _enqueue(broker, "urgent", 1, priority=-1)
+    leased = broker.lease("w1", limit=5, lease_seconds=30)
+    assert [task.id for task in leased] == ["urgent:1", "a:1", "b:1", "a:2", "b:2"]
+    assert broker.lease("w2", limit=5, lease_seconds=30) == []
+
+
+def test_enqueue_ignores_known_items(broker):
+    _enqueue(broker, "job", 1)
+    broker.enqueue("job", [(1, {"input": "other"})])
+    [task] = broker.lease("w1", limit=5, lease_seconds=30)
+    assert task.payload == {"input": "job-1"}
+
+
+def test_expired_lease_is_redelivered(broker, clock):
+    _enqueue(broker, "job", 1)
+    [task] = broker.lease("w1", limit=1, lease_seconds=30)
+    clock.now += 10
+    assert broker.heartbeat("w1", lease_seconds=30) == 1
+    clock.now += 25
+    assert broker.lease("w2", limit=1, lease_seconds=30) == []
+
+    clock.now += 10
+    [retry] = broker.lease("w2", limit=1, lease_seconds=30)
+    assert retry.id == task.id and retry.attempts == 2
+    assert not broker.complete(task, "w1", {"status": "done", "index": 1})
+    assert broker.complete(retry, "w2", {"status": "done", "index": 1})
+    assert [(index, entry["status"]) for _, index, entry in broker.results("job")] == [(1, "done")]
+
+
+def test_lease_expiring_after_the_last_attempt_fails_the_task(broker, clock):
+    _enqueue(broker, "job", 1)
+    broker.lease("w1", limit=1, lease_seconds=5)
+    clock.now += 6
+    broker.lease("w2", limit=1, lease_seconds=5)
+    clock.now += 6
+    assert broker.lease("w3", limit=1, lease_seconds=5) == []
+
+    [(seq, index, entry)] = broker.results("job")
+    assert (seq, index, entry["status"]) == (1, 1, "failed")
+    assert "worker lost" in entry["error"]
+    assert broker.counts("job") == {"failed": 1}
+
+
+def test_release_requeues_until_attempts_run_out(broker):
+    _enqueue(broker, "job", 1)
+    [task] = broker.lease("w1", limit=1, lease_seconds=30)
+    broker.release(task, "w1", "flaky")
+    assert broker.counts("job") == {"queued": 1}
+    [task] = broker.lease("w1", limit=1, lease_seconds=30)
+    broker.release(task, "w1", "still flaky")
+    assert broker.results("job")[0][2]["error"] == "still flaky"
+
+
+def test_results_resume_after_sequence_and_purge(broker):
+    _enqueue(broker, "job", 2)
+    first, second = broker.lease("w1", limit=2, lease_seconds=30)
+    broker.complete(second, "w1", {"status": "done", "index": 2})
+    broker.complete(first, "w1", {"status": "done", "index": 1})
+    assert [index for _, index, _ in broker.results("job")] == [2, 1]
+    assert [index for _, index, _ in broker.results("job", after=1)] == [1]
+
+    broker.purge("job")
+    assert broker.counts("job") == {}
+    assert broker.results("job") == []
+
+
+def test_open_broker_accepts_sqlite_urls(tmp_path):
+    broker = open_broker("sqlite:///" + str(tmp_path / "b.sqlite3"))
+    assert isinstance(broker, SqliteBroker)
+    broker.close()
+
+
+def test_redis_purge_drops_the_job_from_worker_sets(clock, monkeypatch):
+    broker = _redis_broker(monkeypatch)
+    _enqueue(broker, "job", 2)
+    _enqueue(broker, "other", 1)
+    broker.lease("w1", limit=3, lease_seconds=30)
+
+    broker.purge("job")
+    assert broker._redis.smembers("vse:worker:w1") == {"other:1"}
+    assert broker.heartbeat("w1", lease_seconds=30) == 1
+    broker.purge("other")
+    assert broker._redis.keys("vse:*") == []
+    broker.close()
@@ -0,0 +1,128 @@
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from src.utils.download import MIN_PART_BYTES, RangedDownloader
+from src.utils.http import HttpClient
+
+DATA = os.urandom(5 * MIN_PART_BYTES + 321)
+PART_STARTS = list(range(0, len(DATA), MIN_PART_BYTES))
+
+
+class RangeServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), RangeHandler)
+        self.ranges: list[str | None] = []
+        self.truncate_responses = 0
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_port}/video.mp4"
+
+
+class RangeHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args) -> None:
+        pass
+
+    def do_HEAD(self) -> None:
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(DATA)))
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("ETag", '"v1"')
+        self.end_headers()
+
+    def do_GET(self) -> None:
+        header = self.headers.get("Range")
+        with self.server.lock:
+            self.server.ranges.append(header)
+            truncate = self.server.truncate_responses > 0
+            if truncate:
+                self.server.truncate_responses -= 1
+        if header:
+            first, last = header.split("=")[1].split("-")
+            start, end = int(first), int(last) if last else len(DATA) - 1
+            body = DATA[start:end + 1]
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{len(DATA)}")
+        else:
+            body = DATA
+            self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if truncate:
+            self.wfile.write(body[: len(body) // 3])
+            self.wfile.flush()
+            self.connection.close()
+            return
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def server():
+    srv = RangeServer()
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+def _downloader(max_retries: int = 3) -> RangedDownloader:
+    return RangedDownloader(HttpClient(), connections=4, split_bytes=MIN_PART_BYTES, max_retries=max_retries)
+
+
+def _range_starts(server: RangeServer) -> list[int]:
+    return sorted(int(header.split("=")[1].split("-")[0]) for header in server.ranges if header)
+
+
+def test_parallel_ranges_reassemble_the_file(server, tmp_path):
+    path = _downloader().fetch(server.url, tmp_path / "video.mp4")
+    assert path.read_bytes() == DATA
+    assert _range_starts(server) == PART_STARTS
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["video.mp4"]
+
+
+def test_resume_continues_from_checkpointed_bytes(server, tmp_path):
+    target = tmp_path / "video.mp4"
+    server.truncate_responses = 10**6
+    with pytest.raises((requests.RequestException, RuntimeError)):
+        _downloader(max_retries=0).fetch(server.url, target)
+
+    state = json.loads((tmp_path / "video.mp4.part.json").read_text())
+    on_disk = (tmp_path / "video.mp4.part").read_bytes()
+    saved = {int(start): count for start, count in state["parts"].items()}
+    assert any(saved.values())
+    for start, count in saved.items():
+        assert on_disk[start:start + count] == DATA[start:start + count]
+
+    server.truncate_responses = 0
+    server.ranges.clear()
+    path = _downloader().fetch(server.url, target)
+    assert path.read_bytes() == DATA
+    part_bytes = state["part_bytes"]
+    assert _range_starts(server) == sorted(
+        start + count for start, count in saved.items() if count < min(part_bytes, len(DATA) - start)
+    )
+
+
+def test_changed_validator_restarts_the_download(server, tmp_path):
+    target = tmp_path / "video.mp4"
+    server.truncate_responses = 10**6
+    with pytest.raises((requests.RequestException, RuntimeError)):
+        _downloader(max_retries=0).fetch(server.url, target)
+    state_path = tmp_path / "video.mp4.part.json"
+    state = json.loads(state_path.read_text())
+    state["validator"] = '"stale"'
+    state_path.write_text(json.dumps(state))
+
+    server.truncate_responses = 0
+    server.ranges.clear()
+    assert _downloader().fetch(server.url, target).read_bytes() == DATA
+    assert _range_starts(server) == PART_STARTS
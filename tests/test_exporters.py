@@ -0,0 +1,69 @@
+from docx import Document
+from openpyxl import load_workbook
+
+from src.exporters.excel_exporter import CELL_LIMIT, HEADERS, OVERFLOW_HEADER, export_excel
+from src.exporters.word_exporter import export_word, export_word_python_docx
+from src.pipeline.models import TaskResult, Transcript, VideoItem
+
+
+def _result(index: int, text: str, summary: str | None = None) -> TaskResult:
+    return TaskResult(
+        item=VideoItem(
+            input_value=f"https://v.douyin.com/test{index}/",
+            title=f"视频 {index}",
+            source_url=None,
+            video_id=str(index),
+            local_video_path=None,
+            local_audio_path=None,
+            publish_timestamp=1700000000,
+            duration_ms=65000,
+        ),
+        transcript=Transcript(text=text, raw={}),
+        summary=summary,
+    )
+
+
+def test_excel_overflow_continues_in_extra_columns(tmp_path):
+    text = "字" * (CELL_LIMIT * 2 + 10)
+    path = export_excel([_result(1, text), _result(2, "short")], tmp_path / "batch.xlsx")
+    workbook = load_workbook(path, read_only=True)
+    rows = list(workbook.worksheets[0].iter_rows(values_only=True))
+    workbook.close()
+
+    assert list(rows[0]) == HEADERS + [OVERFLOW_HEADER]
+    long_row, short_row = rows[1], rows[2]
+    assert long_row[5] == text[:CELL_LIMIT]
+    assert long_row[8] == text[CELL_LIMIT:CELL_LIMIT * 2]
+    assert long_row[9] == text[CELL_LIMIT * 2:]
+    assert short_row[:3] == (2, "视频 2", "https://v.douyin.com/test2/")
+    assert short_row[3].startswith("2023-11-")
+    assert short_row[4:6] == ("01:05", "short")
+    assert not any(short_row[8:])
+
+
+def _paragraphs(path) -> list[tuple[str, str]]:
+    return [(paragraph.style.name, paragraph.text) for paragraph in Document(str(path)).paragraphs]
+
+
+def test_streamed_docx_matches_python_docx(tmp_path):
+    failed = _result(3, "")
+    failed.error = "下载失败 <403>"
+    results = [
+        _result(1, "第一段 <b>&amp;\n第二段\t带制表符", summary="摘要 & 要点"),
+        _result(2, "单段"),
+        failed,
+    ]
+    streamed = export_word(results, tmp_path / "streamed.docx", "客户A")
+    baseline = export_word_python_docx(results, tmp_path / "baseline.docx", "客户A")
+
+    paragraphs = _paragraphs(streamed)
+    assert paragraphs == _paragraphs(baseline)
+    assert [text for style, text in paragraphs if style == "Heading 1"] == ["交付信息"]
+    headings = [text for style, text in paragraphs if style == "Heading 2"]
+    assert headings == ["视频 1: 视频 1", "视频 2: 视频 2", "视频 3: 视频 3"]
+    assert ("Normal", "第二段\t带制表符") in paragraphs
+
+
+def test_streamed_docx_drops_characters_xml_cannot_hold(tmp_path):
+    path = export_word([_result(1, "a\x00b\x0bc")], tmp_path / "streamed.docx", "客户A")
+    assert ("Normal", "abc") in _paragraphs(path)
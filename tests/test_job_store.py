@@ -0,0 +1,78 @@
+import pytest
+
+from src.web.jobs import JobStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    jobs = JobStore(tmp_path / "jobs.sqlite3", retention_seconds=60)
+    yield jobs
+    jobs.close()
+
+
+def _create(store: JobStore, job_id: str) -> None:
+    store.create(
+        job_id,
+        name="batch-" + job_id,
+        spec={"inputs": ["a", "b"]},
+        lane="normal",
+        progress={"step": "queued"},
+    )
+
+
+def test_progress_is_stored_apart_from_the_job(store):
+    _create(store, "j1")
+    store.merge_progress("j1", step="asr", current=1)
+    store.merge_progress("j1", total=2)
+    status = store.status("j1")
+    assert status["status"] == "queued"
+    assert status["progress"] == {"step": "asr", "current": 1, "total": 2}
+    assert "spec" not in status
+
+    store.set_progress("j1", {"step": "done"})
+    assert store.status("j1")["progress"] == {"step": "done"}
+    assert store.get("j1")["spec"] == {"inputs": ["a", "b"]}
+
+
+def test_outcome_appears_in_status_only_once_finished(store):
+    _create(store, "j1")
+    store.update("j1", status="running", result={"exports": ["a.docx"]})
+    assert "exports" not in store.status("j1")
+
+    store.update("j1", status="error", error="boom", error_raw={"code": 1}, finished_ts=1.0)
+    status = store.status("j1")
+    assert status["exports"] == ["a.docx"]
+    assert status["error"] == "boom"
+    assert status["error_raw"] == {"code": 1}
+
+
+def test_update_rejects_unknown_fields(store):
+    _create(store, "j1")
+    with pytest.raises(ValueError):
+        store.update("j1", progress={})
+
+
+def test_unfinished_and_eviction(store):
+    for job_id in ("old", "new", "live"):
+        _create(store, job_id)
+    store.update("old", status="done", finished_ts=1000.0)
+    store.update("new", status="done", finished_ts=1050.0)
+    store.update("live", status="running")
+    assert [job["id"] for job in store.unfinished()] == ["live"]
+
+    assert store.evict(now=1100.0) == 1
+    assert store.get("old") is None
+    assert store.status("old") is None
+    assert store.get("new") is not None
+    assert store.get("live") is not None
+
+
+def test_jobs_survive_reopen(tmp_path):
+    path = tmp_path / "jobs.sqlite3"
+    first = JobStore(path)
+    _create(first, "j1")
+    first.close()
+
+    reopened = JobStore(path)
+    assert [job["id"] for job in reopened.unfinished()] == ["j1"]
+    reopened.close()
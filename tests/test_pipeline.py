@@ -0,0 +1,138 @@
+from src.pipeline.stages import Stage, StagePipeline
+
+
+def _run(runner, tmp_path, inputs, **kwargs):
+    _, results = runner.run(
+        inputs=inputs,
+        batch_name="batch",
+        output_root=tmp_path / "outputs",
+        tmp_root=tmp_path / "tmp",
+        use_cache=False,
+        **kwargs,
+    )
+    return results
+
+
+def _iter(runner, tmp_path, inputs, **kwargs):
+    return list(
+        runner.iter_run(
+            inputs=inputs,
+            batch_name="batch",
+            output_root=tmp_path / "outputs",
+            tmp_root=tmp_path / "tmp",
+            use_cache=False,
+            **kwargs,
+        )
+    )
+
+
+def test_concurrent_mode_matches_serial(make_runner, asr, tmp_path):
+    inputs = ["vid:1", "vid:2", "vid:3", "vid:4"]
+    serial = _run(make_runner(), tmp_path / "serial", inputs, concurrent=False)
+    asr.delays = {"1": 0.2}
+    concurrent = _run(make_runner(), tmp_path / "concurrent", inputs, concurrent=True)
+    assert [result.transcript.text for result in concurrent] == [result.transcript.text for result in serial]
+    assert [result.item.input_value for result in concurrent] == inputs
+
+
+def test_concurrent_asr_workers_overlap_items(make_runner, asr, tmp_path):
+    asr.delays = {str(index): 0.2 for index in range(1, 5)}
+    steps = []
+    _run(
+        make_runner(),
+        tmp_path,
+        ["vid:1", "vid:2", "vid:3", "vid:4"],
+        concurrent=True,
+        stage_workers={"asr": 4},
+        on_progress=lambda **kwargs: steps.append(kwargs["step"]),
+    )
+    assert sorted(asr.calls) == ["1", "2", "3", "4"]
+    assert asr.peak > 1
+    assert "asr" in steps
+
+
+def test_duplicate_inputs_are_transcribed_once(make_runner, asr, tmp_path):
+    results = _run(make_runner(), tmp_path, ["vid:1", "vid:2", "vid:1#share"])
+    assert sorted(asr.calls) == ["1", "2"]
+    assert results[2].transcript.text == results[0].transcript.text == "text 1"
+    assert results[2].item.input_value == "vid:1#share"
+
+
+def test_inputs_resolving_to_the_same_video_are_transcribed_once(make_runner, asr, tmp_path):
+    runner = make_runner()
+    runner.platform_resolver.canonical_key = lambda value, platform_hint=None: None
+    results = _run(runner, tmp_path, ["vid:3", "vid:3#share"])
+    assert asr.calls == ["3"]
+    assert [result.transcript.text for result in results] == ["text 3", "text 3"]
+
+
+def test_failed_item_does_not_stop_the_batch(make_runner, asr, tmp_path):
+    asr.failures = {"2": 99}
+    results = _run(make_runner(), tmp_path, ["vid:1", "vid:2", "vid:3"], concurrent=True)
+    assert "asr failed for 2" in results[1].error
+    assert [results[0].error, results[2].error] == [None, None]
+
+
+def test_transient_failure_is_retried(make_runner, asr, tmp_path):
+    asr.failures = {"1": 1}
+    [result] = _run(make_runner(item_retries=1), tmp_path, ["vid:1"])
+    assert result.error is None
+    assert asr.calls == ["1", "1"]
+
+
+def test_resume_skips_items_finished_in_the_manifest(make_runner, asr, tmp_path):
+    asr.failures = {"2": 99}
+    first = _run(make_runner(), tmp_path, ["vid:1", "vid:2", "vid:3"])
+    assert first[1].error and not first[0].error and not first[2].error
+
+    asr.calls.clear()
+    asr.failures.clear()
+    second = _run(make_runner(), tmp_path, ["vid:1", "vid:2", "vid:3"])
+    assert asr.calls == ["2"]
+    assert [result.transcript.text for result in second] == ["text 1", "text 2", "text 3"]
+    assert all(result.error is None for result in second)
+
+
+def test_resume_ignores_entries_for_changed_inputs(make_runner, asr, tmp_path):
+    _run(make_runner(), tmp_path, ["vid:1", "vid:2"])
+    asr.calls.clear()
+    _run(make_runner(), tmp_path, ["vid:1", "vid:5"])
+    assert asr.calls == ["5"]
+
+
+def test_input_ordering_holds_back_fast_items(make_runner, asr, tmp_path):
+    asr.delays = {"1": 0.3}
+    results = _iter(make_runner(), tmp_path, ["vid:1", "vid:2", "vid:3"], concurrent=True, ordering="input")
+    assert [index for index, _ in results] == [1, 2, 3]
+    assert [result.transcript.text for _, result in results] == ["text 1", "text 2", "text 3"]
+
+
+def test_completion_ordering_yields_fast_items_first(make_runner, asr, tmp_path):
+    asr.delays = {"1": 0.3}
+    results = _iter(make_runner(), tmp_path, ["vid:1", "vid:2", "vid:3"], concurrent=True)
+    assert sorted(index for index, _ in results) == [1, 2, 3]
+    assert results[-1][0] == 1
+
+
+def test_duplicates_are_yielded_with_their_leader(make_runner, asr, tmp_path):
+    asr.delays = {"1": 0.2}
+    results = _iter(make_runner(), tmp_path, ["vid:1", "vid:2", "vid:1#share"], concurrent=True)
+    assert [index for index, _ in results][-2:] in ([1, 3], [3, 1])
+
+
+
+def test_progress_callback_can_take_the_pipeline_lock():
+    acquired = []
+
+    def _progress(**kwargs):
+        got = pipeline._lock.acquire(timeout=2)
+        acquired.append(got)
+        if got:
+            pipeline._lock.release()
+
+    pipeline = StagePipeline(
+        [Stage("first", handler=lambda payload: None, workers=2), Stage("done", handler=lambda payload: None)],
+        on_progress=_progress,
+    )
+    assert sorted(pipeline.iter([1, 2, 3])) == [1, 2, 3]
+    assert acquired == [True] * 6
@@ -0,0 +1,65 @@
+from src.asr import router as router_module
+from src.asr.providers import ProviderLimits
+from src.asr.router import ASRRouter
+from src.config import Settings
+from src.pipeline.models import Transcript, VideoItem
+
+
+class FakeProvider:
+    def __init__(self, limits: ProviderLimits) -> None:
+        self.limits = limits
+        self.calls: list[str] = []
+
+    def transcribe(self, audio_path, model, duration_ms=None) -> Transcript:
+        self.calls.append("single")
+        return Transcript(text="single", raw={})
+
+    def transcribe_split(self, audio_path, model, duration_ms) -> Transcript:
+        self.calls.append("split")
+        return Transcript(text="split", raw={})
+
+
+def _router() -> ASRRouter:
+    return ASRRouter(
+        dashscope_url_asr=FakeProvider(ProviderLimits(max_duration_seconds=60)),
+        qwen_audio_asr=FakeProvider(ProviderLimits(max_file_bytes=100)),
+        openai_asr=FakeProvider(ProviderLimits(max_file_bytes=200)),
+    )
+
+
+def _item(tmp_path, size: int, platform: str = "xiaohongshu") -> VideoItem:
+    audio = tmp_path / "audio.mp3"
+    audio.write_bytes(b"\0" * size)
+    return VideoItem(
+        input_value="x",
+        title="t",
+        source_url=None,
+        video_id="1",
+        local_video_path=None,
+        local_audio_path=audio,
+        platform=platform,
+    )
+
+
+def _settings(asr_mode: str) -> Settings:
+    return Settings("key", "http://llm", "asr", "llm", asr_mode, "audio-asr")
+
+
+def test_limits_for_follows_the_selected_route(tmp_path):
+    router = _router()
+    item = _item(tmp_path, 1, platform="douyin")
+    assert router.limits_for(item, _settings("auto"), True).max_duration_seconds == 60
+    assert router.limits_for(item, _settings("audio-asr"), False).max_file_bytes == 100
+    assert router.limits_for(item, _settings("compatible"), False).max_file_bytes == 200
+
+
+def test_oversized_audio_goes_straight_to_the_split_path(tmp_path, monkeypatch):
+    monkeypatch.setattr(router_module, "probe_duration_ms", lambda path: None)
+    router = _router()
+    settings = _settings("compatible")
+    assert router.transcribe(_item(tmp_path, 150), settings, False).text == "single"
+    assert router.transcribe(_item(tmp_path, 250), settings, False).text == "split"
+    assert router.openai_asr.calls == ["single", "split"]
+
+    assert router.transcribe(_item(tmp_path, 150, platform="bilibili"), settings, False).text == "split"
+    assert router.qwen_audio_asr.calls == ["split"]
@@ -0,0 +1,150 @@
+import asyncio
+from concurrent.futures import Future
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from src.asr import scheduler as scheduler_module
+from src.asr.scheduler import DashScopeTaskScheduler, _PendingTask
+
+
+def _scheduler(handler, **kwargs) -> DashScopeTaskScheduler:
+    scheduler = DashScopeTaskScheduler("key", min_interval=1.0, max_interval=4.0, backoff=2.0, **kwargs)
+    scheduler._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return scheduler
+
+
+def _task(scheduler: DashScopeTaskScheduler, task_id: str = "t1") -> _PendingTask:
+    task = _PendingTask(
+        task_id=task_id,
+        file_urls=["https://media/1.mp4", "https://media/2.mp4"],
+        future=Future(),
+        interval=scheduler.min_interval,
+        next_poll=0.0,
+    )
+    scheduler._pending[task_id] = task
+    return task
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    recorded: list[float] = []
+
+    async def _sleep(seconds: float) -> None:
+        recorded.append(seconds)
+
+    monkeypatch.setattr(scheduler_module.asyncio, "sleep", _sleep)
+    return recorded
+
+
+def test_poll_backs_off_while_the_task_runs():
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json={"output": {"task_status": "RUNNING"}})
+
+    scheduler = _scheduler(handler)
+    task = _task(scheduler)
+    intervals = []
+
+    async def _drive() -> None:
+        for _ in range(4):
+            await scheduler._poll(task)
+            intervals.append(task.interval)
+
+    asyncio.run(_drive())
+    assert intervals == [2.0, 4.0, 4.0, 4.0]
+    assert all(request.url.path.endswith("/tasks/t1") for request in requests)
+    assert requests[0].headers["Authorization"] == "Bearer key"
+    assert not task.future.done()
+    assert "t1" in scheduler._pending
+
+
+def test_terminal_status_fetches_results_and_resolves_the_future():
+    output = {
+        "task_status": "SUCCEEDED",
+        "results": [
+            {"file_url": "https://media/1.mp4", "subtask_status": "SUCCEEDED", "transcription_url": "https://r/1.json"},
+            {"file_url": "https://media/2.mp4", "subtask_status": "FAILED", "transcription_url": "https://r/2.json"},
+        ],
+    }
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/tasks/t1"):
+            return httpx.Response(200, json={"output": output})
+        assert request.url.path == "/1.json"
+        return httpx.Response(200, json={"transcripts": [{"text": "hello"}]})
+
+    scheduler = _scheduler(handler)
+    task = _task(scheduler)
+    asyncio.run(scheduler._poll(task))
+
+    outcome = task.future.result(timeout=0)
+    assert outcome["output"]["task_status"] == "SUCCEEDED"
+    assert outcome["raws"] == {"https://media/1.mp4": {"transcripts": [{"text": "hello"}]}}
+    assert "t1" not in scheduler._pending
+
+
+def test_repeated_poll_failures_fail_the_future():
+    scheduler = _scheduler(lambda request: httpx.Response(500), max_poll_failures=2)
+    task = _task(scheduler)
+
+    asyncio.run(scheduler._poll(task))
+    assert task.failures == 1 and not task.future.done()
+
+    asyncio.run(scheduler._poll(task))
+    with pytest.raises(httpx.HTTPStatusError):
+        task.future.result(timeout=0)
+    assert "t1" not in scheduler._pending
+
+
+def test_submit_registers_the_task(monkeypatch):
+    calls = []
+
+    def _async_call(**kwargs):
+        calls.append(kwargs)
+        return SimpleNamespace(output={"task_id": "t9"})
+
+    monkeypatch.setattr(scheduler_module.dashscope.audio.asr.Transcription, "async_call", _async_call)
+    scheduler = _scheduler(lambda request: httpx.Response(500))
+    future: Future = Future()
+
+    async def _drive() -> None:
+        scheduler._wakeup = asyncio.Event()
+        await scheduler._submit(["https://media/1.mp4"], "paraformer-v2", future)
+
+    asyncio.run(_drive())
+    assert calls[0]["file_urls"] == ["https://media/1.mp4"]
+    assert scheduler._pending["t9"].interval == scheduler.min_interval
+    assert not future.done()
+
+
+def test_submit_failure_sets_the_exception(monkeypatch, sleeps):
+    def _async_call(**kwargs):
+        raise ConnectionError("offline")
+
+    monkeypatch.setattr(scheduler_module.dashscope.audio.asr.Transcription, "async_call", _async_call)
+    scheduler = _scheduler(lambda request: httpx.Response(500))
+    future: Future = Future()
+    asyncio.run(scheduler._submit(["https://media/1.mp4"], "paraformer-v2", future))
+
+    with pytest.raises(ConnectionError):
+        future.result(timeout=0)
+    assert sleeps == [1, 2]
+    assert not scheduler._pending
+
+
+def test_fetch_json_does_not_sleep_after_the_last_attempt(sleeps):
+    attempts = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        attempts.append(request)
+        return httpx.Response(503)
+
+    scheduler = _scheduler(handler)
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(scheduler._fetch_json("https://r/1.json"))
+    assert len(attempts) == scheduler_module.REQUEST_ATTEMPTS
+    assert sleeps == [1, 2]
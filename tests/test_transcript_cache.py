@@ -0,0 +1,86 @@
+import pytest
+
+from src.cache import transcripts
+from src.cache.transcripts import CacheKey, TranscriptCache
+from src.pipeline.models import Transcript
+
+
+@pytest.fixture(autouse=True)
+def clock(fake_clock):
+    return fake_clock(transcripts, step=1.0)
+
+
+def _key(subject: str, model: str = "paraformer") -> CacheKey:
+    return CacheKey(platform="douyin", subject=subject, route="url", model=model)
+
+
+def _transcript(subject: str) -> Transcript:
+    return Transcript(text=subject * 100, raw={"subject": subject})
+
+
+def _entry_bytes(tmp_path) -> int:
+    probe = TranscriptCache(tmp_path / "probe")
+    probe.put(_key("a"), _transcript("a"))
+    size = probe.total_bytes
+    probe.close()
+    return size
+
+
+def test_round_trip_is_keyed_by_model(tmp_path):
+    cache = TranscriptCache(tmp_path / "cache")
+    cache.put(_key("a"), _transcript("a"))
+    assert cache.get(_key("a")).raw == {"subject": "a"}
+    assert cache.get(_key("a", model="other")) is None
+    cache.close()
+
+
+def test_eviction_drops_least_recently_used(tmp_path):
+    size = _entry_bytes(tmp_path)
+    cache = TranscriptCache(tmp_path / "cache", max_bytes=size * 2)
+    cache.put(_key("a"), _transcript("a"))
+    cache.put(_key("b"), _transcript("b"))
+    assert cache.get(_key("a")) is not None
+
+    cache.put(_key("c"), _transcript("c"))
+    assert cache.get(_key("b")) is None
+    assert cache.get(_key("a")) is not None
+    assert cache.get(_key("c")) is not None
+    assert cache.total_bytes <= size * 2
+    assert not cache._object_path(_key("b").digest).exists()
+    cache.close()
+
+
+def test_total_bytes_survive_reopen(tmp_path):
+    cache = TranscriptCache(tmp_path / "cache")
+    cache.put(_key("a"), _transcript("a"))
+    cache.put(_key("a"), _transcript("a"))
+    total = cache.total_bytes
+    cache.close()
+
+    reopened = TranscriptCache(tmp_path / "cache")
+    assert reopened.total_bytes == total
+    reopened.close()
+
+
+def test_missing_object_file_is_a_miss(tmp_path):
+    cache = TranscriptCache(tmp_path / "cache")
+    cache.put(_key("a"), _transcript("a"))
+    cache._object_path(_key("a").digest).unlink()
+    assert cache.get(_key("a")) is None
+    assert cache.total_bytes == 0
+    cache.close()
+
+
+def test_budget_is_shared_by_instances_on_the_same_directory(tmp_path):
+    size = _entry_bytes(tmp_path)
+    first = TranscriptCache(tmp_path / "cache", max_bytes=size * 2)
+    second = TranscriptCache(tmp_path / "cache", max_bytes=size * 2)
+    first.put(_key("a"), _transcript("a"))
+    second.put(_key("b"), _transcript("b"))
+    first.put(_key("c"), _transcript("c"))
+    second.put(_key("d"), _transcript("d"))
+
+    assert first.total_bytes == second.total_bytes <= size * 2
+    assert [first.get(_key(subject)) is not None for subject in "abcd"] == [False, False, True, True]
+    first.close()
+    second.close()
@@ -0,0 +1,120 @@
+import wave
+from itertools import pairwise
+
+import numpy as np
+import pytest
+
+from src.asr import providers
+from src.asr.providers import QwenAudioASR
+from src.pipeline.models import Transcript
+from src.utils.vad import AudioSegment, segment_audio
+
+RATE = 16000
+
+
+def _tone(seconds: float) -> np.ndarray:
+    t = np.arange(int(RATE * seconds)) / RATE
+    return (np.sin(2 * np.pi * 440 * t) * 8000).astype("<i2")
+
+
+def _silence(seconds: float) -> np.ndarray:
+    return np.zeros(int(RATE * seconds), dtype="<i2")
+
+
+def _wav(path, *pieces: np.ndarray):
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(RATE)
+        wav.writeframes(np.concatenate(pieces).tobytes())
+    return path
+
+
+def _spans(segments) -> list[tuple[int, int]]:
+    return [(segment.offset_ms, segment.offset_ms + segment.duration_ms) for segment in segments]
+
+
+def test_cuts_inside_the_silence_nearest_the_target(tmp_path):
+    audio = _wav(tmp_path / "a.wav", _tone(5), _silence(2), _tone(5))
+    segments = segment_audio(audio, tmp_path / "parts", target_seconds=6, max_seconds=8)
+    (first_start, first_end), (second_start, second_end) = _spans(segments)
+    assert first_start == 0 and second_end == 12000
+    assert 5000 <= first_end <= 5300
+    assert 6700 <= second_start <= 7000
+    assert all(segment.path.exists() for segment in segments)
+
+
+def test_keeping_silence_cuts_at_the_middle_of_the_pause(tmp_path):
+    audio = _wav(tmp_path / "a.wav", _tone(5), _silence(2), _tone(5))
+    segments = segment_audio(audio, tmp_path / "parts", target_seconds=6, max_seconds=8, drop_silence=False)
+    (_, first_end), (second_start, second_end) = _spans(segments)
+    assert first_end == second_start
+    assert 5500 <= first_end <= 6500
+    assert second_end == 12000
+
+
+def test_segments_never_exceed_max_seconds(tmp_path):
+    audio = _wav(tmp_path / "a.wav", _tone(30))
+    segments = segment_audio(audio, tmp_path / "parts", target_seconds=6, max_seconds=8)
+    spans = _spans(segments)
+    assert all(end - start <= 8000 for start, end in spans)
+    assert spans[0][0] == 0 and spans[-1][1] == 30000
+    assert all(previous[1] == current[0] for previous, current in pairwise(spans))
+
+
+def test_leading_and_trailing_silence_is_trimmed(tmp_path):
+    audio = _wav(tmp_path / "a.wav", _silence(1), _tone(3), _silence(1))
+    [segment] = segment_audio(audio, tmp_path / "parts", target_seconds=60, max_seconds=120)
+    assert 800 <= segment.offset_ms <= 1000
+    assert 3000 <= segment.duration_ms <= 3400
+
+
+def test_all_silence_yields_no_segments(tmp_path):
+    audio = _wav(tmp_path / "a.wav", _silence(3))
+    assert segment_audio(audio, tmp_path / "parts", target_seconds=6, max_seconds=8) == []
+
+
+def test_rejects_non_wav_input(tmp_path):
+    path = tmp_path / "a.mp3"
+    path.write_bytes(b"ID3" + b"\0" * 64)
+    with pytest.raises(ValueError):
+        segment_audio(path, tmp_path / "parts", target_seconds=6, max_seconds=8)
+
+
+def test_interior_pauses_are_cut_out_and_mapped_back(tmp_path):
+    audio = _wav(tmp_path / "a.wav", _tone(2), _silence(3), _tone(2))
+    [segment] = segment_audio(audio, tmp_path / "parts", target_seconds=60, max_seconds=120)
+    [(at_ms, removed_ms)] = segment.gaps
+    assert 2000 <= at_ms <= 2300
+    assert 2400 <= removed_ms <= 2800
+    assert segment.duration_ms == pytest.approx(7000 - removed_ms, abs=40)
+    with wave.open(str(segment.path), "rb") as wav:
+        assert wav.getnframes() * 1000 // RATE == segment.duration_ms
+
+    assert segment.source_ms(1000) == 1000
+    later = segment.duration_ms - 1000
+    assert segment.source_ms(later) == later + removed_ms
+    assert segment.source_ms(segment.duration_ms) == pytest.approx(7000, abs=40)
+
+
+def test_source_ms_adds_only_the_gaps_before_the_position():
+    segment = AudioSegment(path=None, offset_ms=10000, duration_ms=5000, gaps=[(1000, 500), (3000, 2000)])
+    assert segment.source_ms(0) == 10000
+    assert segment.source_ms(1000) == 11000
+    assert segment.source_ms(2000) == 12500
+    assert segment.source_ms(4000) == 16500
+
+
+def test_non_wav_input_falls_back_to_fixed_length_split(tmp_path, monkeypatch):
+    parts = [_wav(tmp_path / f"part_{index}.wav", _tone(seconds)) for index, seconds in enumerate([2, 1])]
+    audio = tmp_path / "a.mp3"
+    audio.write_bytes(b"ID3" + b"\0" * 64)
+    monkeypatch.setattr(providers, "split_audio", lambda path, output_dir, segment_seconds: parts)
+    asr = QwenAudioASR("key")
+    monkeypatch.setattr(asr, "_transcribe_single", lambda path, model: Transcript(text=path.stem, raw={}))
+
+    transcript = asr.transcribe_split(audio, "qwen", duration_ms=3000)
+    assert transcript.text.split() == ["part_0", "part_1"]
+    assert transcript.raw["offsets_ms"] == [0, 2000]
+    sentences = transcript.raw["transcripts"][0]["sentences"]
+    assert [(s["begin_time"], s["end_time"]) for s in sentences] == [(0, 2000), (2000, 3000)]
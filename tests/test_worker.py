@@ -0,0 +1,43 @@
+import pytest
+
+from src.broker.sqlite import SqliteBroker
+from src.pipeline.models import TaskResult, Transcript, VideoItem
+from src.worker import TaskWorker
+
+
+class StoppingRunner:
+    """Yields the first item, then raises ``exc`` (or just stops when it is ``None``)."""
+
+    def __init__(self, exc: BaseException | None) -> None:
+        self.exc = exc
+
+    def iter_items(self, items, *args, **kwargs):
+        index, value = items[0]
+        item = VideoItem(value, "title", None, "1", None, None)
+        yield index, TaskResult(item=item, transcript=Transcript(text="text", raw={}), summary=None)
+        if self.exc is not None:
+            raise self.exc
+
+
+def _worker(tmp_path, exc: BaseException | None) -> tuple[TaskWorker, SqliteBroker]:
+    broker = SqliteBroker(tmp_path / "broker.sqlite3", max_attempts=3)
+    payloads = [(index, {"input": f"vid:{index}", "output_dir": str(tmp_path / "out")}) for index in (1, 2, 3)]
+    broker.enqueue("job", payloads)
+    worker = TaskWorker(broker, StoppingRunner(exc), tmp_path, tmp_path / "tmp", batch_items=3, worker_id="w1")
+    return worker, broker
+
+
+@pytest.mark.parametrize("exc", [RuntimeError("boom"), None])
+def test_unfinished_tasks_are_released(tmp_path, exc):
+    worker, broker = _worker(tmp_path, exc)
+    assert worker.run_once() == 3
+    assert broker.counts("job") == {"done": 1, "queued": 2}
+    broker.close()
+
+
+def test_unfinished_tasks_are_released_on_interrupt(tmp_path):
+    worker, broker = _worker(tmp_path, KeyboardInterrupt())
+    with pytest.raises(KeyboardInterrupt):
+        worker._run_job_tasks(broker.lease("w1", limit=3, lease_seconds=30))
+    assert broker.counts("job") == {"done": 1, "queued": 2}
+    broker.close()